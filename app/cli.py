@@ -0,0 +1,180 @@
+""" cli.py
+    機能：コマンドラインでのログ変換（画面を使わない一括変換）
+        python -m app.cli ログ.html [ログ2.html フォルダ ...] [-o 出力フォルダ] [--config config.json] [--character character.json] [--workers 4] [--stages]
+        ※tkinter、PILを読み込まないため、画面の無い環境でも動作する
+"""
+import argparse
+import os
+import sys
+
+from app.logic import globals
+from app.logic.batch import BatchJob, iter_convert_logs
+from app.logic.cache import clear_parse_cache
+from app.logic.fileio import get_executable_path
+from app.logic.observer import format_metrics_table, get_metrics_rows
+from app.logic.processor import (check_valid_color_code,
+                                 load_character_config, load_convert_config,
+                                 load_resources)
+from app.model.settings import CHARACTER_CONFIG, ConfigKey
+from app.model.uitexts import TextKey
+from system.ja import TEXTS
+from system.resources import OUTPUT_DIR_NAME, ResourcesKey
+
+"""
+定数定義
+"""
+# 変換対象のログの拡張子
+INPUT_EXTENSION = ".html"
+# 変換後ログの拡張子
+OUTPUT_EXTENSION = ".txt"
+# 終了コード
+EXIT_SUCCESS        = 0
+EXIT_FAILED         = 1
+EXIT_INVALID_CONFIG = 2
+
+
+
+def collect_input_paths(paths: list[str]) -> list[str]:
+    """ collect_input_paths
+        機能：指定されたファイル、フォルダから変換対象のログを集める（フォルダ内は.htmlのみ）
+
+    Args:
+        paths (list[str]): ファイルまたはフォルダのパス
+
+    Returns:
+        list[str]: 変換対象のログのパス
+    """
+    input_paths = []
+    for path in paths:
+        if os.path.isdir(path):
+            for name in sorted(os.listdir(path)):
+                if name.lower().endswith(INPUT_EXTENSION):
+                    input_paths.append(os.path.join(path, name))
+        else:
+            input_paths.append(path)
+    return input_paths
+
+
+def get_output_path(input_path: str, output_dir: str) -> str:
+    """ get_output_path
+        機能：ログのファイル名から出力ファイルのパスを作成する
+
+    Args:
+        input_path (str): ココフォリアのログのパス
+        output_dir (str): 出力フォルダ
+
+    Returns:
+        str: 出力ファイルのパス
+    """
+    name = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.join(output_dir, name + OUTPUT_EXTENSION)
+
+
+def load_cli_character_config(path: str | None) -> list[dict]:
+    """ load_cli_character_config
+        機能：キャラ設定を読み込み、キャラ設定画面と同じ形式にする（デフォルト行を先頭、未入力の項目は初期値）
+
+    Args:
+        path (str | None): 設定ファイルのパス
+
+    Returns:
+        list[dict]: キャラ設定の設定値
+    """
+    default_cfg, character_cfg = load_character_config(path)
+
+    result = []
+    for cfg in [default_cfg] + character_cfg:
+        item = {setting.key: cfg.get(setting.key, setting.default) for setting in CHARACTER_CONFIG}
+        # キャラクターの記入がない場合はスキップ
+        if str(item.get(ConfigKey.CHARACTER, "")).strip():
+            result.append(item)
+
+    # デフォルト行は着色を有効にする
+    result[0][ConfigKey.ENABLE_PAINT] = True
+    return result
+
+
+def main(argv: list[str] | None = None) -> int:
+    """ main
+        機能：コマンドライン引数のログを全て変換する
+
+    Args:
+        argv (list[str] | None, optional): コマンドライン引数. Defaults to None（sys.argv）.
+
+    Returns:
+        int: 終了コード（1件でも失敗した場合は0以外）
+    """
+    arg_parser = argparse.ArgumentParser(prog="python -m app.cli", description=TEXTS[TextKey.APP_TITLE])
+    arg_parser.add_argument("inputs", nargs="*", help="ココフォリアのログ（.html）またはフォルダ")
+    arg_parser.add_argument("-o", "--output-dir", default=None, help="出力フォルダ（初期値：output）")
+    arg_parser.add_argument("--config", default=None, help="変換設定ファイル（初期値：settings/config.json）")
+    arg_parser.add_argument("--character", default=None, help="キャラ設定ファイル（初期値：settings/character.json）")
+    arg_parser.add_argument("--workers", type=int, default=None, help="同時に変換するプロセス数（0以下でCPUのコア数、初期値：resources.jsonの設定）")
+    arg_parser.add_argument("--stages", action="store_true", help="処理段階ごとの秒数と件数を表示する")
+    arg_parser.add_argument("--clear-cache", action="store_true", help="解析結果のキャッシュを削除する")
+    args = arg_parser.parse_args(argv)
+
+    # リソース設定の読み込み
+    globals.RESOURCES = load_resources()
+
+    if args.clear_cache:
+        clear_parse_cache()
+        if not args.inputs:
+            return EXIT_SUCCESS
+    elif not args.inputs:
+        arg_parser.error("the following arguments are required: inputs")
+
+    # 相対パスは実行した場所を基準にする
+    config_path = os.path.abspath(args.config) if args.config else None
+    character_path = os.path.abspath(args.character) if args.character else None
+    output_dir = os.path.abspath(args.output_dir) if args.output_dir else get_executable_path(OUTPUT_DIR_NAME)
+
+    # 設定の読み込み
+    convert_cfg = load_convert_config(config_path)
+    character_cfg = load_cli_character_config(character_path)
+
+    # カラーコードの有効確認
+    for c_cfg in character_cfg:
+        if not check_valid_color_code(str(c_cfg.get(ConfigKey.COLOR_CODE))):
+            print(f"{TEXTS[TextKey.COLOR_CODE_ERR_MESSAGE]}\n{c_cfg.get(ConfigKey.CHARACTER)}", file=sys.stderr)
+            return EXIT_INVALID_CONFIG
+
+    os.makedirs(output_dir, exist_ok=True)
+    max_len = globals.RESOURCES[ResourcesKey.MAX_LOG_CHARCTER_LENGTH]
+    failed_count = 0
+    input_paths = collect_input_paths(args.inputs)
+    jobs = [BatchJob(input_path, get_output_path(input_path, output_dir)) for input_path in input_paths]
+
+    # 終わったログから結果を表示する
+    for batch_result in iter_convert_logs(jobs, convert_cfg, character_cfg, args.workers, output_metrics=args.stages):
+        input_path, output_path = batch_result.job
+        characters = batch_result.characters
+
+        # 変換失敗
+        if not batch_result.success:
+            e_message, error = batch_result.error
+            print(f"NG  {input_path} ({batch_result.elapsed:.3f}s) {e_message} {TEXTS[TextKey.DETAIL_MESSAGE]}：{error}", file=sys.stderr)
+            failed_count += 1
+            continue
+
+        # 変換成功
+        total_len = batch_result.total_length
+        print(f"OK  {input_path} -> {output_path} ({batch_result.elapsed:.3f}s, {TEXTS[TextKey.CHARACTER_COUNT_LABEL].format(count=total_len)})")
+
+        # 未設定の発言者、最大文字数の通知
+        if convert_cfg.get(ConfigKey.REPORT_UNKNOWN_CHARACTER) and characters.unknown_characters:
+            print(f"    {TEXTS[TextKey.UNKNOWN_CHARACTERS_MESSAGE].format(unknown_characters=characters.unknown_characters)}".replace("\n", " "))
+        if convert_cfg.get(ConfigKey.REPORT_OVER_CHARACTER) and total_len > max_len:
+            print(f"    {TEXTS[TextKey.OVER_CHARACTER_MESSAGE].format(max_character_count=max_len)}")
+
+        # 処理段階ごとの秒数と件数（web用・iframe用の作成時間と文字数は変換プロセスで計測済み）
+        if args.stages:
+            for line in format_metrics_table(get_metrics_rows(batch_result.stage_times, batch_result.counters)):
+                print(f"    {line}")
+
+    print(f"{len(input_paths) - failed_count}/{len(input_paths)}")
+    return EXIT_FAILED if failed_count or not input_paths else EXIT_SUCCESS
+
+
+if __name__ == "__main__":
+    sys.exit(main())
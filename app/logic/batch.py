@@ -0,0 +1,153 @@
+""" batch.py
+    機能：複数ログの一括変換（ファイルごとに別プロセスで並列に変換する）
+"""
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Iterator, NamedTuple, Optional
+
+from app.logic import globals
+from app.logic.fileio import get_root_relative_path
+from app.logic.formatter import CharacterList
+from app.logic.logging import logging_error
+from app.logic.observer import StageRecorder
+from app.logic.processor import convert_log
+from app.model.uitexts import TextKey
+from system.ja import TEXTS
+from system.resources import ResourcesKey
+
+"""
+変数・テーブル定義
+"""
+# 変換プロセスで使う設定値（プロセスの起動時に1回だけ受け取る）
+_worker_convert_config = None
+_worker_character_config = None
+_worker_output_metrics = False
+
+
+
+class BatchJob(NamedTuple):
+    """ BatchJob
+        機能：変換1件分の入出力
+    """
+    input_path:     str     # ココフォリアのログのパス
+    output_path:    str     # 変換後のログを出力するパス
+
+
+class BatchResult(NamedTuple):
+    """ BatchResult
+        機能：変換1件分の結果
+            ※変換プロセスから受け取るため、変換後ログ（発言のリストを含む）は持たず、件数と時間だけにする
+    """
+    job:            BatchJob        # 変換したログ
+    success:        bool            # 変換の成功or失敗
+    total_length:   int             # 変換後ログの文字数（失敗時は0）
+    error:          Optional[tuple] # [ダイアログメッセージ / Exception]（成功時はNone）
+    characters:     CharacterList   # 未設定または着色無効のキャラクターリスト（失敗時は空）
+    elapsed:        float           # 変換にかかった秒数
+    stage_times:    dict            # 処理段階ごとの秒数
+    counters:       dict            # 件数・サイズ
+
+
+
+def init_batch_worker(resources: dict, convert_config: dict, character_config: list, output_metrics: bool = False):
+    """ init_batch_worker
+        機能：変換プロセスの起動時に、リソース設定と変換設定を読み込む
+
+    Args:
+        resources (dict): リソース設定の設定値
+        convert_config (dict): 変換設定の設定値
+        character_config (list): キャラ設定の設定値
+        output_metrics (bool, optional): Trueでweb用・iframe用の作成時間と文字数も計測する. Defaults to False.
+    """
+    global _worker_convert_config, _worker_character_config, _worker_output_metrics
+    # ファイルごとに並列化しているため、ファイル内の並列解析はしない
+    globals.RESOURCES = {**resources, ResourcesKey.PARSE_WORKER_COUNT: 1}
+    _worker_convert_config = convert_config
+    _worker_character_config = character_config
+    _worker_output_metrics = output_metrics
+
+
+def convert_batch_job(job: BatchJob) -> BatchResult:
+    """ convert_batch_job
+        機能：ログ1件を変換する（変換プロセスで実行）
+
+    Args:
+        job (BatchJob): 変換するログ
+
+    Returns:
+        BatchResult: 変換結果
+    """
+    return convert_job(job, _worker_convert_config, _worker_character_config, _worker_output_metrics)
+
+
+def convert_job(job: BatchJob, convert_config: dict, character_config: list, output_metrics: bool = False) -> BatchResult:
+    """ convert_job
+        機能：ログ1件を変換し、かかった時間を処理段階ごとに計測する
+
+    Args:
+        job (BatchJob): 変換するログ
+        convert_config (dict): 変換設定の設定値
+        character_config (list): キャラ設定の設定値
+        output_metrics (bool, optional): Trueでweb用・iframe用を作成し、その時間と文字数も計測する. Defaults to False.
+
+    Returns:
+        BatchResult: 変換結果
+    """
+    recorder = StageRecorder()
+    start = time.perf_counter()
+    success, result, characters = convert_log(
+        input_path=job.input_path,
+        output_path=job.output_path,
+        convert_config=convert_config,
+        character_config=character_config,
+        observer=recorder
+    )
+    elapsed = time.perf_counter() - start
+    if not success:
+        return BatchResult(job, False, 0, result, characters, elapsed, recorder.stage_times, recorder.counters)
+
+    converted_log, total_len = result
+    stage_times = recorder.stage_times
+    counters = recorder.counters
+    if output_metrics:
+        counters = {**counters, **converted_log.get_output_counters()}
+        stage_times = {**stage_times, **converted_log.render_times}
+    return BatchResult(job, True, total_len, None, characters, elapsed, stage_times, counters)
+
+
+def iter_convert_logs(jobs: list[BatchJob], convert_config: dict, character_config: list, worker_count: Optional[int] = None, output_metrics: bool = False) -> Iterator[BatchResult]:
+    """ iter_convert_logs
+        機能：複数のログを並列に変換し、終わったものから結果を返す
+            ※1件が失敗しても、残りのログの変換は続ける
+
+    Args:
+        jobs (list[BatchJob]): 変換するログ
+        convert_config (dict): 変換設定の設定値
+        character_config (list): キャラ設定の設定値
+        worker_count (Optional[int], optional): 変換プロセス数（0以下の場合はCPUのコア数、ログの数を上限とする）. Defaults to None（resources.jsonの設定）.
+        output_metrics (bool, optional): Trueでweb用・iframe用の作成時間と文字数も計測する. Defaults to False.
+
+    Yields:
+        Iterator[BatchResult]: 変換結果（終わった順）
+    """
+    worker_count = globals.get_worker_count(len(jobs), worker_count=worker_count)
+
+    # 1プロセスの場合は、プロセスを起動せずに変換する
+    if worker_count <= 1:
+        for job in jobs:
+            yield convert_job(job, convert_config, character_config, output_metrics)
+        return
+
+    with ProcessPoolExecutor(
+        max_workers=worker_count,
+        initializer=init_batch_worker,
+        initargs=(globals.RESOURCES, convert_config, character_config, output_metrics)
+    ) as executor:
+        futures = {executor.submit(convert_batch_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            try:
+                yield future.result()
+            except Exception as e:
+                # 変換プロセスの異常終了など、convert_logの外で起きたエラー
+                logging_error("一括変換失敗", get_root_relative_path(), e)
+                yield BatchResult(futures[future], False, 0, (TEXTS[TextKey.FAILED_CONVERT_LOG_MESSAGE], e), CharacterList([], []), 0.0, {}, {})
@@ -0,0 +1,232 @@
+""" cache.py
+    機能：解析済みの発言の保持（設定だけ変えて再変換する時にHTMLの解析を省く）
+        ・ParseCache：直前に解析したログをメモリに保持
+        ・*_parse_cache：解析結果をoutput/cacheに保存（アプリを再起動しても使いまわす）
+"""
+import hashlib
+import marshal
+import os
+import struct
+import zlib
+from typing import NamedTuple, Optional
+
+from app.logic import globals
+from app.logic.fileio import get_executable_path
+from app.logic.parser import PARSER_VERSION
+from app.model.chat import RawChat
+from system.resources import (OUTPUT_DIR_NAME, PARSE_CACHE_DIR_NAME,
+                              ResourcesKey)
+
+"""
+定数定義
+"""
+# キャッシュファイルの先頭（形式の確認用）
+PARSE_CACHE_MAGIC = b"CCPC"
+# キャッシュファイルのヘッダー（先頭、解析結果のバージョン、marshalのバージョン）
+PARSE_CACHE_HEADER = struct.Struct("<4sHH")
+# キャッシュファイルの拡張子
+PARSE_CACHE_EXTENSION = ".bin"
+
+
+
+class FileKey(NamedTuple):
+    """ FileKey
+        機能：ファイルが変わっていないか判定するためのキー
+    """
+    path:       str     # ファイルの絶対パス
+    size:       int     # ファイルサイズ
+    mtime_ns:   int     # 更新日時
+
+
+
+def get_file_key(path: str) -> FileKey:
+    """ get_file_key
+        機能：ファイルのサイズと更新日時からキーを作成する
+
+    Args:
+        path (str): ファイルパス
+
+    Returns:
+        FileKey: ファイルのキー
+    """
+    stat = os.stat(path)
+    return FileKey(os.path.abspath(path), stat.st_size, stat.st_mtime_ns)
+
+
+
+class ParseCache:
+    """ ParseCache
+        機能：最後に解析したログの発言を保持する
+            ※ファイルのサイズと更新日時が変わらない間は、解析結果を使いまわす
+    """
+    def __init__(self):
+        self._file_key = None       # 解析したファイルのキー
+        self._raw_chats = None      # 解析結果
+
+
+    def get(self, file_key: FileKey) -> Optional[list[RawChat]]:
+        """ get
+            機能：保持している解析結果を取得する
+
+        Args:
+            file_key (FileKey): 読み込むファイルのキー
+
+        Returns:
+            Optional[list[RawChat]]: 解析結果。ファイルが変わっている場合はNone
+        """
+        if file_key == self._file_key:
+            return self._raw_chats
+        return None
+
+
+    def put(self, file_key: FileKey, raw_chats: list[RawChat]):
+        """ put
+            機能：解析結果を保持する
+
+        Args:
+            file_key (FileKey): 解析したファイルのキー
+            raw_chats (list[RawChat]): 解析結果
+        """
+        self._file_key = file_key
+        self._raw_chats = raw_chats
+
+
+    def clear(self):
+        """ clear
+            機能：保持している解析結果を破棄する
+        """
+        self._file_key = None
+        self._raw_chats = None
+
+
+def get_parse_cache_dir() -> str:
+    """ get_parse_cache_dir
+        機能：解析結果のキャッシュを格納するディレクトリのパスを取得する
+
+    Returns:
+        str: ディレクトリのパス（絶対パス）
+    """
+    return get_executable_path(os.path.join(OUTPUT_DIR_NAME, PARSE_CACHE_DIR_NAME))
+
+
+def is_parse_cache_enabled() -> bool:
+    """ is_parse_cache_enabled
+        機能：解析結果をファイルに保存するかどうか（上限サイズが0以下の場合は保存しない）
+
+    Returns:
+        bool: Trueで保存する
+    """
+    return globals.RESOURCES[ResourcesKey.PARSE_CACHE_MAX_BYTE_SIZE] > 0
+
+
+def get_content_key(html_bytes: bytes) -> str:
+    """ get_content_key
+        機能：ログの内容と解析結果のバージョンからキャッシュのキーを作成する
+
+    Args:
+        html_bytes (bytes): ココフォリアのログ（読み込んだままのバイト列）
+
+    Returns:
+        str: キャッシュのキー
+    """
+    digest = hashlib.blake2b(html_bytes, digest_size=20).hexdigest()
+    return f"{digest}_v{PARSER_VERSION}"
+
+
+def load_parse_cache(content_key: str) -> Optional[list[RawChat]]:
+    """ load_parse_cache
+        機能：保存した解析結果を読み込む。読み込めたファイルは最終使用日時を更新する
+
+    Args:
+        content_key (str): キャッシュのキー
+
+    Returns:
+        Optional[list[RawChat]]: 解析結果。保存されていない、または読み込めない場合はNone
+    """
+    path = os.path.join(get_parse_cache_dir(), content_key + PARSE_CACHE_EXTENSION)
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            data = f.read()
+        magic, parser_version, marshal_version = PARSE_CACHE_HEADER.unpack_from(data)
+        # 形式が違う場合は使わない
+        if (magic, parser_version, marshal_version) != (PARSE_CACHE_MAGIC, PARSER_VERSION, marshal.version):
+            raise ValueError("parse cache format mismatch")
+        records = marshal.loads(zlib.decompress(data[PARSE_CACHE_HEADER.size:]))
+        raw_chats = [RawChat(*record) for record in records]
+
+        # 最近使ったものとして残すため、更新日時を更新する
+        os.utime(path)
+        return raw_chats
+    except Exception:
+        # 壊れているキャッシュは削除する
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        return None
+
+
+def save_parse_cache(content_key: str, raw_chats: list[RawChat]):
+    """ save_parse_cache
+        機能：解析結果をファイルに保存し、上限サイズを超えた分は古いものから削除する
+
+    Args:
+        content_key (str): キャッシュのキー
+        raw_chats (list[RawChat]): 解析結果
+    """
+    cache_dir = get_parse_cache_dir()
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, content_key + PARSE_CACHE_EXTENSION)
+
+    header = PARSE_CACHE_HEADER.pack(PARSE_CACHE_MAGIC, PARSER_VERSION, marshal.version)
+    body = zlib.compress(marshal.dumps([tuple(raw_chat) for raw_chat in raw_chats]), 1)
+
+    # 書き込み途中のファイルを読まないように、一時ファイルに書いてから置き換える（並列変換で重ならないようにプロセスごとに分ける）
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(header)
+        f.write(body)
+    os.replace(tmp_path, path)
+
+    trim_parse_cache(globals.RESOURCES[ResourcesKey.PARSE_CACHE_MAX_BYTE_SIZE])
+
+
+def trim_parse_cache(max_byte_size: int):
+    """ trim_parse_cache
+        機能：キャッシュの合計サイズが上限を超えていたら、最後に使った日時が古いものから削除する
+
+    Args:
+        max_byte_size (int): 上限サイズ
+    """
+    cache_dir = get_parse_cache_dir()
+    if not os.path.isdir(cache_dir):
+        return
+
+    entries = []
+    with os.scandir(cache_dir) as it:
+        for entry in it:
+            if entry.is_file() and entry.name.endswith(PARSE_CACHE_EXTENSION):
+                stat = entry.stat()
+                entries.append((stat.st_mtime_ns, stat.st_size, entry.path))
+
+    total_size = sum(size for _, size, _ in entries)
+    # 古い順に削除
+    for _, size, path in sorted(entries):
+        if total_size <= max_byte_size:
+            break
+        try:
+            os.remove(path)
+            total_size -= size
+        except OSError:
+            pass
+
+
+def clear_parse_cache():
+    """ clear_parse_cache
+        機能：保存した解析結果を全て削除する
+    """
+    trim_parse_cache(0)
+
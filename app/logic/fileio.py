@@ -44,9 +44,9 @@ def get_executable_path(add_path):
     # exeで動いている場合
     if is_executable():
         base_path = os.path.dirname(sys.executable)
-    # .pyで動いている場合
+    # .pyで動いている場合（python -m で起動した場合もmain.pyの場所を基準にする）
     else:
-        base_path = os.path.dirname(os.path.abspath(sys.argv[0]))
+        base_path = APP_ROOT
 
    #パスのバックスラッシュをスラッシュに置換する
     full_path = os.path.join(base_path, add_path).replace("\\", "/")
@@ -72,8 +72,8 @@ def get_resource_path(add_path):
     if is_executable():
         base_path = sys._MEIPASS
     else:
-        # .pyで動いている場合、実行中ファイルからの相対パス
-        base_path = os.path.abspath(os.path.dirname(sys.argv[0]))
+        # .pyで動いている場合、main.pyの場所からの相対パス
+        base_path = APP_ROOT
 
    #パスのバックスラッシュをスラッシュに置換する
     full_path = os.path.join(base_path, add_path).replace("\\", "/")
@@ -134,10 +134,12 @@ def save_json(data: dict, path: str):
     # ディレクトリが無ければ作成する（あったら作成しない）
     os.makedirs(os.path.dirname(full_path), exist_ok=True)
 
-    #JSON形式でファイル書き込み
+    #JSON形式でファイル書き込み（書き込み途中で終了しても壊れないように、一時ファイルに書いてから置き換える）
+    tmp_path = full_path + ".tmp"
     try:
-        with open(full_path, "w", encoding="utf-8") as f:
+        with open(tmp_path, "w", encoding="utf-8") as f:
             json.dump(data, f, indent=2, ensure_ascii=False)
+        os.replace(tmp_path, full_path)
     except Exception as e:
         from app.logic.logging import logging_error
         logging_error("設定ファイル(JSON)の保存失敗", get_root_relative_path(), e)
@@ -2,12 +2,15 @@
     機能：テキストの変換
 """
 import re
-from typing import List, NamedTuple
-
-from bs4 import BeautifulSoup
+import time
+from types import MappingProxyType
+from typing import List, Mapping, NamedTuple, Optional
 
 from app.logic import globals
-from app.model.chat import Chat, ConvertFlags
+from app.logic.observer import ConvertCounter, ConvertStage
+from app.logic.parser import parse_raw_chats
+from app.logic.transform import compile_message_transform
+from app.model.chat import Chat, ConvertFlags, RawChat
 from app.model.settings import ConfigKey, ConvertLogType
 from system.resources import ResourcesKey
 
@@ -26,13 +29,57 @@ HTML_STYLE_CLASS = ".{class_name}{{color:#{color_code}}}"
 
 
 
-class ConvertedLog(NamedTuple):
+class ConvertedLog:
     """ ConvertedLog
         機能：変換処理で出力するログタイプ
+            ※web用・iframe用は初めて参照した時に作成して保持する（通常変換しか使わない場合は作成しない）
     """
-    privatter_log: str     # 通常変換
-    web_log: str           # web用出力
-    iframe_log: list       # iframe用分割
+    def __init__(self, privatter_log: str, chats: Optional[List[Chat]] = None, style_tag_text: str = ""):
+        self.privatter_log = privatter_log      # 通常変換
+        self._chats = chats                     # web用・iframe用を作成する発言（web用変換が無効な場合はNone）
+        self.style_tag_text = style_tag_text    # iframe用ログの最後に追加するstyleタグ（web用ログの着色にも使う）
+        self._web_log = None                    # web用出力（作成前はNone）
+        self._iframe_log = None                 # iframe用分割（作成前はNone）
+        self.render_times = {}                  # web用・iframe用の作成にかかった秒数（作成した分のみ）
+
+
+    @property
+    def web_log(self) -> str:
+        """ web_log
+            機能：web用出力（初回のみ作成する）
+        """
+        if self._web_log is None:
+            start = time.perf_counter()
+            self._web_log = convert_chats_to_web_text(self._chats) if self._chats else ""
+            self.render_times[ConvertStage.RENDER_WEB] = time.perf_counter() - start
+        return self._web_log
+
+
+    @property
+    def iframe_log(self) -> list:
+        """ iframe_log
+            機能：iframe用分割（初回のみ作成する）
+        """
+        if self._iframe_log is None:
+            start = time.perf_counter()
+            self._iframe_log = convert_chats_to_iframe_texts(self._chats, self.style_tag_text) if self._chats is not None else []
+            self.render_times[ConvertStage.RENDER_IFRAME] = time.perf_counter() - start
+        return self._iframe_log
+
+
+    def get_output_counters(self) -> dict:
+        """ get_output_counters
+            機能：出力ごとの文字数とiframeの数を取得する（web用変換が有効な場合は、web用・iframe用を作成してから数える）
+
+        Returns:
+            dict: 件数・サイズ（ConvertCounter）
+        """
+        counters = {ConvertCounter.OUTPUT_LENGTH: len(self.privatter_log)}
+        if self._chats is not None:
+            counters[ConvertCounter.WEB_LENGTH] = len(self.web_log)
+            counters[ConvertCounter.IFRAME_COUNT] = len(self.iframe_log)
+            counters[ConvertCounter.IFRAME_LENGTH] = sum(len(iframe_log) for iframe_log in self.iframe_log)
+        return counters
 
 
 
@@ -45,7 +92,71 @@ class CharacterList(NamedTuple):
 
 
 
-def convert_log_to_chat_list(html_content: str, convert_config: dict, character_config: list) -> tuple[list[Chat], CharacterList]:
+class CharacterStyle(NamedTuple):
+    """ CharacterStyle
+        機能：発言者1人分の着色設定
+    """
+    color_code: str             # カラーコード
+    group: str                  # グループ
+    delete_name: bool           # 名前削除
+    class_name: str             # クラス名
+
+
+
+class CharacterIndex(NamedTuple):
+    """ CharacterIndex
+        機能：キャラ設定の検索テーブル（変換1回につき1度だけ作成する）
+    """
+    default_style: Optional[CharacterStyle]         # デフォルト設定
+    character_styles: Mapping[str, CharacterStyle]  # キャラ名→着色設定（着色有効のみ）
+    class_colors: Mapping[str, str]                 # クラス名→カラーコード
+
+
+
+def create_character_index(character_config: list) -> CharacterIndex:
+    """ create_character_index
+        機能：キャラ設定から検索テーブルを作成する
+            ※同じキャラ名、クラス名が複数ある場合は、先に設定されたものを使う
+
+    Args:
+        character_config (list): キャラ設定の設定値
+
+    Returns:
+        CharacterIndex: キャラ設定の検索テーブル
+    """
+    default_name = globals.RESOURCES[ResourcesKey.CHARACTER_DEFAULT_NAME]
+    default_style = None
+    default_found = False
+    character_styles = {}
+    class_colors = {}
+
+    for character_cfg in character_config:
+        style = CharacterStyle(
+            color_code=character_cfg.get(ConfigKey.COLOR_CODE),
+            group=character_cfg.get(ConfigKey.GROUP),
+            delete_name=character_cfg.get(ConfigKey.DELETE_NAME),
+            class_name=character_cfg.get(ConfigKey.CLASS_NAME)
+        )
+
+        # デフォルト設定（見つからない場合は最後の設定を使う）
+        if not default_found:
+            default_style = style
+            default_found = character_cfg.get(ConfigKey.CHARACTER) == default_name
+
+        # 着色無効の場合は無視する
+        if character_cfg.get(ConfigKey.ENABLE_PAINT):
+            character_styles.setdefault(character_cfg.get(ConfigKey.CHARACTER), style)
+
+        class_colors.setdefault(style.class_name, style.color_code)
+
+    return CharacterIndex(
+        default_style=default_style,
+        character_styles=MappingProxyType(character_styles),
+        class_colors=MappingProxyType(class_colors)
+    )
+
+
+def convert_log_to_chat_list(html_content: str, convert_config: dict, character_config: list, character_index: Optional[CharacterIndex] = None) -> tuple[list[Chat], CharacterList]:
     """ convert_log_to_chat_list
         機能：HTMLのログを解析して、Chat型Listに変換する
 
@@ -53,6 +164,25 @@ def convert_log_to_chat_list(html_content: str, convert_config: dict, character_
         html_content (str): ココフォリアのログテキスト
         convert_config (dict): 変換設定の設定値
         character_config (list): キャラ設定の設定値
+        character_index (Optional[CharacterIndex], optional): キャラ設定の検索テーブル. Defaults to None（character_configから作成）.
+
+    Returns:
+        tuple[list[Chat], CharacterList: リスト化した発言、未設定や使用したキャラのリスト
+    """
+    raw_chats = parse_raw_chats(html_content)
+    return convert_raw_chats_to_chat_list(raw_chats, convert_config, character_config, character_index)
+
+
+def convert_raw_chats_to_chat_list(raw_chats: list[RawChat], convert_config: dict, character_config: list, character_index: Optional[CharacterIndex] = None, counters: Optional[dict] = None) -> tuple[list[Chat], CharacterList]:
+    """ convert_raw_chats_to_chat_list
+        機能：HTMLから取り出した発言に変換設定、キャラ設定を適用して、Chat型Listに変換する
+
+    Args:
+        raw_chats (list[RawChat]): HTMLから取り出した発言
+        convert_config (dict): 変換設定の設定値
+        character_config (list): キャラ設定の設定値
+        character_index (Optional[CharacterIndex], optional): キャラ設定の検索テーブル. Defaults to None（character_configから作成）.
+        counters (Optional[dict], optional): 変換しなかった発言数の記録先（ConvertCounter）. Defaults to None.
 
     Returns:
         tuple[list[Chat], CharacterList: リスト化した発言、未設定や使用したキャラのリスト
@@ -67,51 +197,32 @@ def convert_log_to_chat_list(html_content: str, convert_config: dict, character_
     all_ignore_tabs = convert_config.get(ConfigKey.IGNORE_TABS, "")
     ignore_tabs = [s.strip() for s in all_ignore_tabs.split(",") if s.strip()]
 
-    #デフォルト設定の取り出し
-    for default_cfg in character_config:
-        if default_cfg.get(ConfigKey.CHARACTER) == globals.RESOURCES[ResourcesKey.CHARACTER_DEFAULT_NAME]:
-            break
+    # 発言内容の置換処理
+    transform_message = compile_message_transform(convert_config)
+
+    # キャラ設定の検索テーブル
+    if character_index is None:
+        character_index = create_character_index(character_config)
+    default_style = character_index.default_style
+    character_styles = character_index.character_styles
 
     old_group = None            # 前回の発言のグループ
     old_color_code = None       # 前回の発言色
     unknown_characters = []     # 未設定の発言者リスト※キャラ名
     use_classes = []            # 登場した発言者リスト※クラス名
+    skipped_tab_count = 0       # 変換無視タブで除いた発言数
+    skipped_empty_count = 0     # 空の発言で除いた発言数
 
     ################
-    # pタグ取得
+    # 発言の取得
     ################
-    # HTMLを解析する
-    soup = BeautifulSoup(html_content, "html.parser")
-
-    for p_tag in soup.find_all("p", style=True):
-        # style属性からcolorを抽出する
-        style = p_tag.get("style")
-        # color指定がない場合はスキップ
-        if not style.startswith("color:"):
-            continue
-
-        # カラーコードを抽出
-        color_code = style.split(":")[-1].strip(";").lstrip("#")
-
-        # タブ、キャラ名、発言内容の3項目が無ければスキップ
-        spans = p_tag.find_all("span")
-        if len(spans) < 3:
-            continue
-
-        # spanタグから抽出
-        tab         = spans[0].get_text().strip().strip("[]")
-        character   = spans[1].get_text()
-
-        # 改行タグを置換
-        for html_message in spans[2].find_all("br"):
-            html_message.replace_with(TEXT_NEWLINE)
-        message = spans[2].get_text(strip=False)
-        message = message.strip()
+    for raw_chat in raw_chats:
+        tab, character, color_code, message = raw_chat
 
         # 初期設定
-        group = default_cfg.get(ConfigKey.GROUP)
-        delete_name = default_cfg.get(ConfigKey.DELETE_NAME)
-        class_name = default_cfg.get(ConfigKey.CLASS_NAME)
+        group = default_style.group
+        delete_name = default_style.delete_name
+        class_name = default_style.class_name
 
         tmp_delete_name_flag = False
 
@@ -128,20 +239,16 @@ def convert_log_to_chat_list(html_content: str, convert_config: dict, character_
         ################
         # 変換設定別処理
         ################
-        # キャラ設定を取り出しておく
-        for character_cfg in character_config:
-            # キャラ設定があるキャラクターの場合（ただし、着色無効の場合は無視する）
-            if character_cfg.get(ConfigKey.CHARACTER) == character and character_cfg.get(ConfigKey.ENABLE_PAINT):
-                color_code = character_cfg.get(ConfigKey.COLOR_CODE)
-                group = character_cfg.get(ConfigKey.GROUP)
-                delete_name = character_cfg.get(ConfigKey.DELETE_NAME)
-                class_name = character_cfg.get(ConfigKey.CLASS_NAME)
-                break
+        # キャラ設定を取り出しておく（着色無効の場合は検索テーブルに無い）
+        character_style = character_styles.get(character)
+        # キャラ設定があるキャラクターの場合
+        if character_style is not None:
+            color_code, group, delete_name, class_name = character_style
         # キャラ設定がない場合
         else:
             # 未設定の発言者にデフォルト設定を使用する
             if convert_config.get(ConfigKey.USE_DEFAULT_SETTING):
-                color_code = default_cfg.get(ConfigKey.COLOR_CODE)
+                color_code = default_style.color_code
 
             # 未設定の発言者がいた場合に通知する
             if convert_config.get(ConfigKey.REPORT_UNKNOWN_CHARACTER):
@@ -151,24 +258,17 @@ def convert_log_to_chat_list(html_content: str, convert_config: dict, character_
 
         # 変換無視タブの場合、無視する
         if tab in ignore_tabs:
+            skipped_tab_count += 1
             continue
 
         # 空の発言は変換を無視する
         if convert_config.get(ConfigKey.IGNORE_EMPTY_MESSAGE):
             if message == "":
+                skipped_empty_count += 1
                 continue
 
-        # 【。」】を【」】に変換する
-        if convert_config.get(ConfigKey.CONVERT_QUOTATION):
-            message = message.replace("。」", "」")
-
-        # 【*】を【＊】に変換する
-        if convert_config.get(ConfigKey.CONVERT_ASTERISK):
-            message = message.replace("*", "＊")
-
-        # 【~】を【～】に変換する
-        if convert_config.get(ConfigKey.CONVERT_WAVE):
-            message = message.replace("~", "～")
+        # 置換ルール（【。」】→【」】、【*】→【＊】、【~】→【～】など）を適用する
+        message = transform_message(message)
 
         # system発言の、名前を削除するフラグ
         if tmp_delete_name_flag:
@@ -205,76 +305,98 @@ def convert_log_to_chat_list(html_content: str, convert_config: dict, character_
         old_group = group
         old_color_code = color_code
 
+    if counters is not None:
+        counters[ConvertCounter.SKIPPED_TAB_COUNT] = skipped_tab_count
+        counters[ConvertCounter.SKIPPED_EMPTY_COUNT] = skipped_empty_count
+
     return chats, CharacterList(unknown_characters, use_classes)
 
 
-def convert_chats_to_text(chats: List[Chat], convert_config: dict) -> ConvertedLog:
+class IframeChunker:
+    """ IframeChunker
+        機能：iframe用ログの分割
+            ※行をリストに貯めておき、最大文字数を超える時に1回だけ結合する
+    """
+    def __init__(self, max_length: int):
+        self.max_length = max_length    # iframe1つ分の最大文字数
+        self.chunks = []                # 分割したiframe用ログ
+        self._lines = []                # 作業中の行
+        self._length = 0                # 作業中の行の文字数
+
+
+    def add_line(self, line: str):
+        """ add_line
+            機能：行を追加する。最大文字数を超える場合は、前回の行までを1つのiframe用ログにする
+
+        Args:
+            line (str): iframe用の行
+        """
+        self._length += len(line)      # 今回の発言内容を文字数に加算する
+        # iframeの最大文字数を超えている場合
+        if self._length > self.max_length:
+            self.chunks.append(self.join_lines())   # 前回の読み込み行までをリストに追加
+            self._lines = [line]                    # 今回読み込んだ内容で初期化
+            self._length = len(line)                # 今回の文字数からカウント
+        else:
+            self._lines.append(line)
+
+
+    def close(self) -> list[str]:
+        """ close
+            機能：残っている行を1つのiframe用ログにして、分割したログを全て返す
+
+        Returns:
+            list[str]: iframe用ログのリスト
+        """
+        if self._length:
+            self.chunks.append(self.join_lines())
+            self._lines = []
+            self._length = 0
+        return self.chunks
+
+
+    def join_lines(self) -> str:
+        """ join_lines
+            機能：作業中の行を結合する。最初の閉じタグを削除して、最後に閉じタグを追加する
+
+        Returns:
+            str: iframe用ログ
+        """
+        lines = self._lines
+        # 先頭のspanタグを削除（ほとんどの場合は最初の行にあるため、全体を検索しない）
+        head = lines[0] if lines else ""
+        index = head.find(HTML_SPAN_CLOSE)
+        if index >= 0:
+            lines[0] = head[:index] + head[index + len(HTML_SPAN_CLOSE):]
+            text = "".join(lines)
+        else:
+            text = "".join(lines).replace(HTML_SPAN_CLOSE, "", 1)
+
+        # 最後に閉じタグを追加
+        return text + HTML_SPAN_CLOSE + HTML_SPAN_CLOSE
+
+
+
+def convert_chats_to_text(chats: List[Chat], convert_config: dict, style_tag_text: str = "") -> ConvertedLog:
     """ convert_chats_to_text
         機能：Chat型Listをテキスト表示する
+            ※作成するのは通常変換のみ。web用・iframe用は、web用変換が有効な場合に参照した時に作成する
 
     Args:
         chats (List[Chat]): 発言のリスト
         convert_config (dict): 変換設定の設定値
+        style_tag_text (str, optional): iframe用ログの最後に追加するstyleタグ. Defaults to "".
 
     Returns:
         ConvertedLog: log3種
     """
     privatter_log = ""      # 戻り値
-    web_log = ""
-    iframe_logs = []
-
-    privatter_lines = []    # 作業用リストやテキスト
-    web_lines = []
-    iframe_text = ""
-
-    total_len = 0           # 文字数カウント（iframe log用）
-
-    # web用変換の有効フラグ
-    enable_convert_web_log = convert_config.get(ConfigKey.CONVERT_WEB_LOG)
-    pattern = re.escape(HTML_SPAN_CLOSE)    # 正規表現のためにエスケープ
+    privatter_lines = []    # 作業用リスト
 
     for chat in chats:
-        # 変換フラグの取得
-        flag = chat.convert_flags
-
-        ################
-        # 本文変換
-        ################
-        # 名前削除が有効の場合
-        if flag.delete_name:
-            text = chat.message
-        else:
-            text = f"{chat.character}：{chat.message}"
-
-        line = build_line(chat, text, ConvertLogType.PRIVATTER)
+        line = build_line(chat, get_chat_text(chat), ConvertLogType.PRIVATTER)
         privatter_lines.append(line)
 
-        # web用変換が有効な場合
-        if enable_convert_web_log:
-            #web log作成
-            line = build_line(chat, text, ConvertLogType.WEB)
-            web_lines.append(line)
-            # iframe log作成
-            line = build_line(chat, text, ConvertLogType.IFRAME)
-            total_len += len(line)      # 今回の発言内容を文字数に加算する
-            # iframeの最大文字数を超えている場合
-            if total_len > globals.RESOURCES[ResourcesKey.IFRAME_MAX_CHARCTER]:
-                iframe_text = re.sub(pattern, "", iframe_text, count=1)     # 先頭のspanタグを削除
-                iframe_text += HTML_SPAN_CLOSE                              # 最後に閉じタグを追加
-                iframe_logs.append(iframe_text + HTML_SPAN_CLOSE)           # 前回の読み込み行までをリストに追加
-
-                total_len = len(line)       # 今回の文字数からカウント
-                iframe_text = line          # textを今回読み込んだ内容で初期化
-            else:
-                iframe_text += line
-
-    # web用変換をする場合、chatsの全変換後、iframe_textが残っている時はlogsに追加する
-    if enable_convert_web_log:
-        if iframe_text:
-            iframe_text = re.sub(pattern, "", iframe_text, count=1)     # 先頭のspanタグを削除
-            iframe_text += HTML_SPAN_CLOSE                              # 最後に閉じタグを追加
-            iframe_logs.append(iframe_text + HTML_SPAN_CLOSE)           # 前回の読み込み行までをリストに追加
-
     ################
     # 両端の処理
     ################
@@ -284,13 +406,61 @@ def convert_chats_to_text(chats: List[Chat], convert_config: dict) -> ConvertedL
         privatter_lines[-1] += HTML_SPAN_CLOSE                                # 最後の行に閉じタグを追加
         privatter_log = TEXT_NEWLINE.join(privatter_lines)
 
-        # web用変換をする場合
-        if enable_convert_web_log:
-            web_lines[0] = web_lines[0].replace(HTML_SPAN_CLOSE, "")          # 最初の行の閉じタグを削除
-            web_lines[-1] += HTML_SPAN_CLOSE                                  # 最後の行に閉じタグを追加
-            web_log = (HTML_LINE_BREAK + TEXT_NEWLINE).join(web_lines)
+    # web用変換が有効な場合、web用・iframe用を後で作成するために発言を保持する
+    if convert_config.get(ConfigKey.CONVERT_WEB_LOG):
+        return ConvertedLog(privatter_log, chats, style_tag_text)
+    return ConvertedLog(privatter_log)
+
+
+def convert_chats_to_web_text(chats: List[Chat]) -> str:
+    """ convert_chats_to_web_text
+        機能：Chat型Listをweb用のテキストにする
+
+    Args:
+        chats (List[Chat]): 発言のリスト
+
+    Returns:
+        str: web用出力
+    """
+    web_lines = [build_line(chat, get_chat_text(chat), ConvertLogType.WEB) for chat in chats]
+    if not web_lines:
+        return ""
+
+    web_lines[0] = web_lines[0].replace(HTML_SPAN_CLOSE, "")          # 最初の行の閉じタグを削除
+    web_lines[-1] += HTML_SPAN_CLOSE                                  # 最後の行に閉じタグを追加
+    return (HTML_LINE_BREAK + TEXT_NEWLINE).join(web_lines)
+
 
-    return ConvertedLog(privatter_log, web_log, iframe_logs)
+def convert_chats_to_iframe_texts(chats: List[Chat], style_tag_text: str = "") -> list[str]:
+    """ convert_chats_to_iframe_texts
+        機能：Chat型Listをiframe1つ分の最大文字数ごとに分割したテキストにする
+
+    Args:
+        chats (List[Chat]): 発言のリスト
+        style_tag_text (str, optional): 各iframe用ログの最後に追加するstyleタグ. Defaults to "".
+
+    Returns:
+        list[str]: iframe用分割
+    """
+    iframe_chunker = IframeChunker(globals.RESOURCES[ResourcesKey.IFRAME_MAX_CHARCTER])
+    for chat in chats:
+        iframe_chunker.add_line(build_line(chat, get_chat_text(chat), ConvertLogType.IFRAME))
+    return [iframe_log + style_tag_text for iframe_log in iframe_chunker.close()]
+
+
+def get_chat_text(chat: Chat) -> str:
+    """ get_chat_text
+        機能：発言者と発言内容から本文を作成する（名前削除が有効の場合は発言内容のみ）
+
+    Args:
+        chat (Chat): 発言設定
+
+    Returns:
+        str: 本文
+    """
+    if chat.convert_flags.delete_name:
+        return chat.message
+    return f"{chat.character}：{chat.message}"
 
 
 def build_line(chat: Chat, text: str, mode: ConvertLogType) -> str:
@@ -347,27 +517,31 @@ def build_line(chat: Chat, text: str, mode: ConvertLogType) -> str:
     return line
 
 
-def  create_style_tag_text(character_config: list, use_classes: list) -> str:
+def  create_style_tag_text(character_config: list, use_classes: list, character_index: Optional[CharacterIndex] = None) -> str:
     """ create_style_tag_text
         機能：styleタグの中身を作成する
 
     Args:
         character_config (list): キャラ設定の設定値
         use_characters (list): 使用クラスのリスト
+        character_index (Optional[CharacterIndex], optional): キャラ設定の検索テーブル. Defaults to None（character_configから作成）.
 
     Returns:
         str: styleタグのテキスト
     """
     style_tag_text = HTML_STYLE + globals.RESOURCES[ResourcesKey.WEB_STYLE_BASE]
 
+    # キャラ設定の検索テーブル
+    if character_index is None:
+        character_index = create_character_index(character_config)
+    class_colors = character_index.class_colors
+
     # 使用したクラスを、キャラ設定から抽出してカラーコードと紐づける
     for chara_class in use_classes:
-        for character_cfg in character_config:
-            if chara_class == character_cfg.get(ConfigKey.CLASS_NAME):
-                style_tag_text += HTML_STYLE_CLASS.format(
-                    class_name=chara_class,
-                    color_code=character_cfg.get(ConfigKey.COLOR_CODE)
-                )
-                break
+        if chara_class in class_colors:
+            style_tag_text += HTML_STYLE_CLASS.format(
+                class_name=chara_class,
+                color_code=class_colors[chara_class]
+            )
 
     return style_tag_text
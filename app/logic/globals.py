@@ -1,7 +1,11 @@
 """ global.py
     機能：全体で使用する設定や関数
 """
+import os
 import sys
+from typing import Optional
+
+from system.resources import ResourcesKey
 
 """
 変数・テーブル定義
@@ -55,3 +59,22 @@ def get_bool(value, default: bool) -> bool:
         return False
     else:
         return default
+
+
+def get_worker_count(job_count: int, resource_key: str = ResourcesKey.BATCH_WORKER_COUNT, worker_count: Optional[int] = None) -> int:
+    """ get_worker_count
+        機能：並列処理のプロセス数を取得する（resources.jsonの設定。0以下の場合はCPUのコア数）
+
+    Args:
+        job_count (int): 並列に処理できる数
+        resource_key (str, optional): プロセス数の設定キー. Defaults to ResourcesKey.BATCH_WORKER_COUNT（一括変換）.
+        worker_count (Optional[int], optional): 設定の代わりに使うプロセス数（コマンドライン引数など）. Defaults to None（設定を使う）.
+
+    Returns:
+        int: プロセス数（処理できる数を上限とする）
+    """
+    if worker_count is None:
+        worker_count = RESOURCES[resource_key]
+    if worker_count <= 0:
+        worker_count = os.cpu_count() or 1
+    return max(1, min(worker_count, job_count))
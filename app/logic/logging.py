@@ -9,35 +9,74 @@ from app.logic import globals
 from app.logic.fileio import get_executable_path
 from system.resources import ERROR_LOG_NAME, OUTPUT_DIR_NAME, ResourcesKey
 
+"""
+定数定義
+"""
+# 古いログファイルの拡張子（error.log.1）
+OLD_LOG_SUFFIX = ".1"
+# 上限を超えるログを切り詰めた時に最後に付ける文字列
+TRUNCATED_LOG_FOOTER = f"{os.linesep}...（省略）{os.linesep}{'-'*40}{os.linesep}"
+
 
-def check_log_size():
+
+def check_log_size(full_path: str, add_size: int):
     """ check_log_size
-        機能：ログファイルが上限を超えていたらリセットする
-    """
-    full_path = get_executable_path(os.path.join(OUTPUT_DIR_NAME, ERROR_LOG_NAME))
+        機能：ログを追加すると上限を超える場合、今のログファイルを古いログファイルにして、新しいログファイルに書き始める
+            ※ログファイルと古いログファイルをそれぞれ上限の半分までにするため、合計は上限を超えない
+              （追加するログは、logging_errorで上限の半分までに切り詰めておく）
+            ※ファイルサイズしか確認しないため、ログの量に関わらずすぐに終わる
 
+    Args:
+        full_path (str): ログファイルのパス
+        add_size (int): 追加するログのバイト数
+    """
     # ログファイルが無ければチェック不要
-    if not os.path.exists(full_path):
-            return
+    try:
+        size = os.path.getsize(full_path)
+    except OSError:
+        return
+
+    if size + add_size <= get_log_segment_size():
+        return
+
+    # 古いログファイルを上書きする（一番古いログから消える）
+    try:
+        os.replace(full_path, full_path + OLD_LOG_SUFFIX)
+    except OSError:
+        # 他のプロセスが入れ替え済みなど
+        pass
+
 
-    max_size = globals.RESOURCES[ResourcesKey.MAX_LOG_BYTE_SIZE]
-    # 現在のログを格納
-    with open(full_path, "r", encoding="utf-8") as f:
-        lines: list = f.readlines()
+def get_log_segment_size() -> int:
+    """ get_log_segment_size
+        機能：ログファイル1つ分の上限（ログファイルと古いログファイルの合計の上限の半分）を取得する
 
-    while True:
-        text = "".join(lines)
-        if len(text.encode("utf-8")) <= max_size:
-            break
-        if lines:
-            # 古い行から削除
-            lines.pop(0)
-        else:
-            break
+    Returns:
+        int: ログファイル1つ分の上限（バイト）
+    """
+    return globals.RESOURCES[ResourcesKey.MAX_LOG_BYTE_SIZE] // 2
+
+
+def truncate_log(log_text: str, max_size: int) -> str:
+    """ truncate_log
+        機能：ログが上限を超える場合、上限に収まるように後ろを切り詰める
+
+    Args:
+        log_text (str): 追加するログ
+        max_size (int): 上限（バイト）
 
-    # ログの書き戻し
-    with open(full_path, "w", encoding="utf-8") as f:
-        f.writelines(lines)
+    Returns:
+        str: 上限に収まるログ
+    """
+    log_bytes = log_text.encode("utf-8")
+    if len(log_bytes) <= max_size:
+        return log_text
+
+    footer_size = len(TRUNCATED_LOG_FOOTER.encode("utf-8"))
+    if max_size < footer_size:
+        return log_bytes[:max_size].decode("utf-8", errors="ignore")
+    # 文字の途中で切れた場合は、その文字ごと除く
+    return log_bytes[:max_size - footer_size].decode("utf-8", errors="ignore") + TRUNCATED_LOG_FOOTER
 
 
 def logging_error(error_title: str, path: str, exc: Exception):
@@ -51,9 +90,6 @@ def logging_error(error_title: str, path: str, exc: Exception):
     """
     full_apth = get_executable_path(os.path.join(OUTPUT_DIR_NAME, ERROR_LOG_NAME))
 
-    # ログの最大サイズチェック
-    check_log_size()
-
     timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
     error_message = str(exc) or "不明なエラー"
 
@@ -72,7 +108,14 @@ def logging_error(error_title: str, path: str, exc: Exception):
         f"\n{'-'*40}\n"
     )
 
+    # 1件で上限の半分を超える場合は切り詰める
+    # （改行はOSの改行文字にしてから数え、書き込みでは変換しない。数えたバイト数と書き込むバイト数を同じにするため）
+    error_log = truncate_log(error_log.replace("\n", os.linesep), get_log_segment_size())
+
+    # ログの最大サイズチェック（超える場合は新しいログファイルにする）
+    check_log_size(full_apth, len(error_log.encode("utf-8")))
+
     # エラー内容をロギング
     os.makedirs(os.path.dirname(full_apth), exist_ok=True)
-    with open(full_apth, "a", encoding="utf-8") as f:
+    with open(full_apth, "a", encoding="utf-8", newline="") as f:
         f.write(error_log)
@@ -0,0 +1,248 @@
+""" observer.py
+    機能：ログ変換の経過の通知（処理段階の開始・終了、進捗、件数）
+        ・ConvertObserver：通知を受け取る側の基底クラス（必要なメソッドだけ上書きする）
+        ・ConvertNotifier：convert_log内で通知を送る（通知先が無い場合はほぼ何もしない）
+"""
+import time
+from contextlib import contextmanager, nullcontext
+from typing import Iterator, Optional
+
+"""
+定数定義
+"""
+# 進捗を通知する最短の間隔（秒）：これより短い間隔の進捗は間引く
+MIN_PROGRESS_INTERVAL = 0.05
+
+
+
+class ConvertStage:
+    """ ConvertStage
+        機能：ログ変換の処理段階
+    """
+    READ            = "read"            # ログの読み込み
+    PARSE           = "parse"           # HTMLの解析
+    APPLY_CONFIG    = "apply_config"    # 設定の適用
+    RENDER          = "render"          # テキストの作成
+    WRITE           = "write"           # 出力ファイルの保存
+    RENDER_WEB      = "render_web"      # web用ログの作成（変換後、初めて参照した時）
+    RENDER_IFRAME   = "render_iframe"   # iframe用ログの作成（変換後、初めて参照した時）
+
+
+class ConvertCounter:
+    """ ConvertCounter
+        機能：ログ変換の件数・サイズの種類
+    """
+    INPUT_BYTES         = "input_bytes"         # 読み込んだログのバイト数
+    CACHE_HIT           = "cache_hit"           # 解析結果を使いまわした場合1（0：解析した）
+    RAW_CHAT_COUNT      = "raw_chat_count"      # 解析した発言数
+    CHAT_COUNT          = "chat_count"          # 変換した発言数（無視したタブ・空の発言を除く）
+    SKIPPED_TAB_COUNT   = "skipped_tab_count"   # 変換無視タブで除いた発言数
+    SKIPPED_EMPTY_COUNT = "skipped_empty_count" # 空の発言で除いた発言数
+    OUTPUT_LENGTH       = "output_length"       # 変換後ログの文字数
+    WEB_LENGTH          = "web_length"          # web用ログの文字数（作成した場合のみ）
+    IFRAME_COUNT        = "iframe_count"        # iframeの数（作成した場合のみ）
+    IFRAME_LENGTH       = "iframe_length"       # iframe用ログの合計文字数（作成した場合のみ）
+
+
+
+class ConvertObserver:
+    """ ConvertObserver
+        機能：ログ変換の経過を受け取る（何もしない。必要なメソッドを上書きして使う）
+            ※変換を実行しているスレッド・プロセスから呼ばれる
+    """
+    def on_stage_start(self, stage: str):
+        """ on_stage_start
+            機能：処理段階の開始
+
+        Args:
+            stage (str): 処理段階（ConvertStage）
+        """
+
+
+    def on_stage_end(self, stage: str, elapsed: float):
+        """ on_stage_end
+            機能：処理段階の終了（エラーで終了した場合も呼ばれる）
+
+        Args:
+            stage (str): 処理段階（ConvertStage）
+            elapsed (float): かかった秒数
+        """
+
+
+    def on_progress(self, stage: str, chat_count: int, done_length: int, total_length: int):
+        """ on_progress
+            機能：処理段階の進捗（MIN_PROGRESS_INTERVALより短い間隔の通知は間引かれる。最後の通知は必ず届く）
+
+        Args:
+            stage (str): 処理段階（ConvertStage）
+            chat_count (int): 処理した発言数
+            done_length (int): 処理した文字数
+            total_length (int): 全体の文字数
+        """
+
+
+    def on_counter(self, name: str, value: int):
+        """ on_counter
+            機能：件数・サイズの通知
+
+        Args:
+            name (str): 種類（ConvertCounter）
+            value (int): 値
+        """
+
+
+
+class CompositeObserver(ConvertObserver):
+    """ CompositeObserver
+        機能：複数の通知先にまとめて通知する
+    """
+    def __init__(self, observers: list[ConvertObserver]):
+        self._observers = observers
+
+
+    def on_stage_start(self, stage: str):
+        for observer in self._observers:
+            observer.on_stage_start(stage)
+
+
+    def on_stage_end(self, stage: str, elapsed: float):
+        for observer in self._observers:
+            observer.on_stage_end(stage, elapsed)
+
+
+    def on_progress(self, stage: str, chat_count: int, done_length: int, total_length: int):
+        for observer in self._observers:
+            observer.on_progress(stage, chat_count, done_length, total_length)
+
+
+    def on_counter(self, name: str, value: int):
+        for observer in self._observers:
+            observer.on_counter(name, value)
+
+
+
+class StageRecorder(ConvertObserver):
+    """ StageRecorder
+        機能：処理段階ごとの秒数と件数を記録する（計測・ログ出力用）
+    """
+    def __init__(self):
+        self.stage_times = {}       # 処理段階ごとの秒数
+        self.counters = {}          # 件数・サイズ
+
+
+    def on_stage_end(self, stage: str, elapsed: float):
+        self.stage_times[stage] = self.stage_times.get(stage, 0.0) + elapsed
+
+
+    def on_counter(self, name: str, value: int):
+        self.counters[name] = value
+
+
+
+class ConvertNotifier:
+    """ ConvertNotifier
+        機能：convert_log内で通知先に通知を送る
+            ※通知先が無い場合は何もしないため、通知先の有無で処理を分けなくてよい
+    """
+    def __init__(self, observer: Optional[ConvertObserver] = None):
+        self.observer = observer
+        self._last_progress_time = 0.0      # 最後に進捗を通知した時刻
+
+
+    @contextmanager
+    def _stage(self, stage: str) -> Iterator[None]:
+        """ _stage
+            機能：処理段階の開始と終了を通知する
+        """
+        self.observer.on_stage_start(stage)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observer.on_stage_end(stage, time.perf_counter() - start)
+
+
+    def stage(self, stage: str):
+        """ stage
+            機能：with文の中を1つの処理段階として通知する
+
+        Args:
+            stage (str): 処理段階（ConvertStage）
+
+        Returns:
+            ContextManager: with文で使う
+        """
+        if self.observer is None:
+            return nullcontext()
+        return self._stage(stage)
+
+
+    def progress(self, stage: str, chat_count: int, done_length: int, total_length: int):
+        """ progress
+            機能：進捗を通知する（前回の通知から間隔が短い場合は、最後の通知以外は送らない）
+
+        Args:
+            stage (str): 処理段階（ConvertStage）
+            chat_count (int): 処理した発言数
+            done_length (int): 処理した文字数
+            total_length (int): 全体の文字数
+        """
+        if self.observer is None:
+            return
+        now = time.perf_counter()
+        if done_length < total_length and now - self._last_progress_time < MIN_PROGRESS_INTERVAL:
+            return
+        self._last_progress_time = now
+        self.observer.on_progress(stage, chat_count, done_length, total_length)
+
+
+    def count(self, name: str, value: int):
+        """ count
+            機能：件数・サイズを通知する
+
+        Args:
+            name (str): 種類（ConvertCounter）
+            value (int): 値
+        """
+        if self.observer is not None:
+            self.observer.on_counter(name, value)
+
+
+
+def get_metrics_rows(stage_times: dict, counters: dict) -> list[tuple[str, str]]:
+    """ get_metrics_rows
+        機能：処理段階ごとの秒数と件数を、表示用の行にする（開発者向け画面とコマンドラインで共通）
+
+    Args:
+        stage_times (dict): 処理段階ごとの秒数
+        counters (dict): 件数・サイズ
+
+    Returns:
+        list[tuple[str, str]]: [項目 / 値]
+    """
+    rows = []
+    total = sum(stage_times.values())
+    for stage, seconds in stage_times.items():
+        ratio = seconds / total * 100 if total else 0.0
+        rows.append((stage, f"{seconds * 1000:.1f} ms ({ratio:.0f}%)"))
+    if stage_times:
+        rows.append(("total", f"{total * 1000:.1f} ms"))
+
+    for name, value in counters.items():
+        rows.append((name, f"{value:,}"))
+    return rows
+
+
+def format_metrics_table(rows: list[tuple[str, str]]) -> list[str]:
+    """ format_metrics_table
+        機能：表示用の行を、項目と値の列をそろえたテキストにする
+
+    Args:
+        rows (list[tuple[str, str]]): [項目 / 値]
+
+    Returns:
+        list[str]: 1行ずつのテキスト
+    """
+    name_width = max((len(name) for name, _ in rows), default=0)
+    value_width = max((len(value) for _, value in rows), default=0)
+    return [f"{name:<{name_width}}  {value:>{value_width}}" for name, value in rows]
@@ -0,0 +1,430 @@
+""" parser.py
+    機能：HTML解析処理の切り替え（インストール済みで一番速いものを使う）
+"""
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Callable, Iterator, Optional
+
+from app.logic import globals
+from app.logic.tokenizer import (UnsupportedMarkupError, collapse_whitespace,
+                                 iter_raw_chats)
+from app.model.chat import RawChat
+from system.resources import ResourcesKey
+
+"""
+定数定義
+"""
+# 解析結果の形式のバージョン（解析結果が変わる修正をしたら上げる。キャッシュの判定に使用）
+PARSER_VERSION = 1
+# 解析処理の自動選択
+PARSER_AUTO = "auto"
+# 解析処理の名前
+PARSER_REGEX        = "regex"
+PARSER_SELECTOLAX   = "selectolax"
+PARSER_LXML         = "lxml"
+PARSER_HTML_PARSER  = "html.parser"
+TEXT_NEWLINE = "\n"
+# 発言1件分の終わり（並列解析で分割する位置）
+CHAT_BLOCK_END = "</p>"
+# 進捗を通知する間隔（解析する文字数）
+PROGRESS_PART_LENGTH = 1024*256
+# 並列解析で1プロセスあたりに割り当てる分割数（分割ごとに進捗の通知と中断の確認をする）
+PARALLEL_PARTS_PER_WORKER = 4
+# 改行タグの目印（テキストの改行と区別するため）
+LINE_BREAK_NODE = object()
+
+
+
+@dataclass
+class ParserBackend:
+    """ ParserBackend
+        機能：HTML解析処理
+    """
+    name:       str                                 # 解析処理の名前（resources.jsonで指定する値）
+    module:     Optional[str]                       # 必要なライブラリ：標準ライブラリのみの場合None
+    parse:      Callable[[str], Iterator[RawChat]]  # 解析処理：発言を1件ずつ返す
+
+
+def iter_raw_chats_by_soup(html_content: str) -> Iterator[RawChat]:
+    """ iter_raw_chats_by_soup
+        機能：BeautifulSoup（html.parser）でHTMLを解析して、発言を1件ずつ返す
+
+    Args:
+        html_content (str): ココフォリアのログテキスト
+
+    Yields:
+        Iterator[RawChat]: 発言
+    """
+    from bs4 import BeautifulSoup
+
+    # HTMLを解析する
+    soup = BeautifulSoup(html_content, "html.parser")
+
+    for p_tag in soup.find_all("p", style=True):
+        # style属性からcolorを抽出する
+        style = p_tag.get("style")
+        # color指定がない場合はスキップ
+        if not style.startswith("color:"):
+            continue
+
+        # カラーコードを抽出
+        color_code = style.split(":")[-1].strip(";").lstrip("#")
+
+        # タブ、キャラ名、発言内容の3項目が無ければスキップ
+        spans = p_tag.find_all("span")
+        if len(spans) < 3:
+            continue
+
+        # spanタグから抽出
+        tab         = spans[0].get_text().strip().strip("[]")
+        character   = spans[1].get_text()
+
+        # 改行タグを置換
+        for html_message in spans[2].find_all("br"):
+            html_message.replace_with(TEXT_NEWLINE)
+        message = spans[2].get_text(strip=False)
+        message = message.strip()
+
+        yield RawChat(tab, character, color_code, message)
+
+
+def iter_raw_chats_by_lxml(html_content: str) -> Iterator[RawChat]:
+    """ iter_raw_chats_by_lxml
+        機能：lxmlでHTMLを解析して、発言を1件ずつ返す
+
+    Args:
+        html_content (str): ココフォリアのログテキスト
+
+    Yields:
+        Iterator[RawChat]: 発言
+    """
+    import lxml.html
+
+    def iter_text(element, is_root=True):
+        """ iter_text
+            機能：要素内のテキストを順に返す（タグの区切りはNone）
+        """
+        if element.tag == "br":
+            yield LINE_BREAK_NODE
+        # コメントなどはテキストとして扱わない
+        elif not isinstance(element.tag, str):
+            yield None
+        else:
+            yield element.text
+            for child in element:
+                yield None
+                yield from iter_text(child, is_root=False)
+            yield None
+        if not is_root:
+            yield element.tail
+
+    # HTMLを解析する
+    root = lxml.html.document_fromstring(html_content)
+
+    for p_tag in root.iter("p"):
+        # style属性からcolorを抽出する
+        style = p_tag.get("style")
+        # color指定がない場合はスキップ
+        if style is None or not style.startswith("color:"):
+            continue
+
+        # タブ、キャラ名、発言内容の3項目が無ければスキップ
+        spans = list(p_tag.iter("span"))
+        if len(spans) < 3:
+            continue
+
+        yield RawChat(
+            tab=join_text_nodes(iter_text(spans[0])).strip().strip("[]"),
+            character=join_text_nodes(iter_text(spans[1])),
+            color_code=style.split(":")[-1].strip(";").lstrip("#"),
+            message=join_text_nodes(iter_text(spans[2])).strip()
+        )
+
+
+def iter_raw_chats_by_selectolax(html_content: str) -> Iterator[RawChat]:
+    """ iter_raw_chats_by_selectolax
+        機能：selectolax（lexbor）でHTMLを解析して、発言を1件ずつ返す
+
+    Args:
+        html_content (str): ココフォリアのログテキスト
+
+    Yields:
+        Iterator[RawChat]: 発言
+    """
+    from selectolax.lexbor import LexborHTMLParser
+
+    def iter_text(node):
+        """ iter_text
+            機能：要素内のテキストを順に返す（タグの区切りはNone）
+        """
+        for child in node.traverse(include_text=True):
+            if child.tag == "-text":
+                yield child.text_content
+            elif child.tag == "br":
+                yield LINE_BREAK_NODE
+            else:
+                yield None
+
+    # HTMLを解析する
+    tree = LexborHTMLParser(html_content)
+
+    for p_tag in tree.css("p[style]"):
+        # style属性からcolorを抽出する
+        style = p_tag.attributes.get("style") or ""
+        # color指定がない場合はスキップ
+        if not style.startswith("color:"):
+            continue
+
+        # タブ、キャラ名、発言内容の3項目が無ければスキップ
+        spans = p_tag.css("span")
+        if len(spans) < 3:
+            continue
+
+        yield RawChat(
+            tab=join_text_nodes(iter_text(spans[0])).strip().strip("[]"),
+            character=join_text_nodes(iter_text(spans[1])),
+            color_code=style.split(":")[-1].strip(";").lstrip("#"),
+            message=join_text_nodes(iter_text(spans[2])).strip()
+        )
+
+
+def join_text_nodes(pieces: Iterator[object]) -> str:
+    """ join_text_nodes
+        機能：タグで区切られたテキストを、BeautifulSoupのget_text()と同じように結合する
+
+    Args:
+        pieces (Iterator[object]): テキスト（Noneはタグの区切り、LINE_BREAK_NODEは改行タグ）
+
+    Returns:
+        str: 結合したテキスト
+    """
+    result = []
+    node = []
+    for piece in pieces:
+        # タグの区切り、改行タグの場合は、それまでのテキストを1つの文字列として確定する
+        if piece is None or piece is LINE_BREAK_NODE:
+            result.append(collapse_whitespace("".join(node)))
+            node.clear()
+            if piece is LINE_BREAK_NODE:
+                result.append(TEXT_NEWLINE)
+        else:
+            node.append(piece)
+    result.append(collapse_whitespace("".join(node)))
+    return "".join(result)
+
+
+# 解析処理の一覧（速い順）
+PARSER_BACKENDS = [
+    ParserBackend(PARSER_REGEX,         None,           iter_raw_chats),
+    ParserBackend(PARSER_SELECTOLAX,    "selectolax",   iter_raw_chats_by_selectolax),
+    ParserBackend(PARSER_LXML,          "lxml",         iter_raw_chats_by_lxml),
+    ParserBackend(PARSER_HTML_PARSER,   "bs4",          iter_raw_chats_by_soup),
+]
+
+
+def is_parser_backend_available(backend: ParserBackend) -> bool:
+    """ is_parser_backend_available
+        機能：解析処理に必要なライブラリがインストールされているか確認する
+
+    Args:
+        backend (ParserBackend): 解析処理
+
+    Returns:
+        bool: Trueで使用可能
+    """
+    return backend.module is None or importlib.util.find_spec(backend.module) is not None
+
+
+def get_available_parser_backends() -> list[ParserBackend]:
+    """ get_available_parser_backends
+        機能：使用可能な解析処理を速い順に取得する
+
+    Returns:
+        list[ParserBackend]: 使用可能な解析処理
+    """
+    return [backend for backend in PARSER_BACKENDS if is_parser_backend_available(backend)]
+
+
+def select_parser_backend(name: str = PARSER_AUTO) -> ParserBackend:
+    """ select_parser_backend
+        機能：指定された解析処理を取得する。未指定・未インストールの場合は一番速いものを使う
+
+    Args:
+        name (str, optional): 解析処理の名前. Defaults to "auto".
+
+    Returns:
+        ParserBackend: 解析処理
+    """
+    available_backends = get_available_parser_backends()
+    for backend in available_backends:
+        if backend.name == name:
+            return backend
+    return available_backends[0]
+
+
+def select_fallback_parser_backend() -> ParserBackend:
+    """ select_fallback_parser_backend
+        機能：高速解析で扱えないHTMLを解析する処理を取得する
+            ※高速解析はBeautifulSoup（html.parser）と同じ結果になるように作っているため、常にhtml.parserを使う
+            ※lxml、selectolaxはpタグ内のdiv・ulなど想定外のタグの扱いがhtml.parserと違い、発言が欠けることがある
+
+    Returns:
+        ParserBackend: 解析処理
+    """
+    for backend in get_available_parser_backends():
+        if backend.name == PARSER_HTML_PARSER:
+            return backend
+    raise ModuleNotFoundError("HTMLパーサー（beautifulsoup4）がインストールされていません")
+
+
+def split_html_content(html_content: str, part_count: int) -> list[str]:
+    """ split_html_content
+        機能：HTMLのログを、発言の終わり（</p>）の位置でほぼ同じ長さに分割する
+
+    Args:
+        html_content (str): ココフォリアのログテキスト
+        part_count (int): 分割数
+
+    Returns:
+        list[str]: 分割したログテキスト（発言の終わりが見つからない場合は分割数より少なくなる）
+    """
+    parts = []
+    start = 0
+    length = len(html_content)
+    for i in range(1, part_count):
+        pos = html_content.find(CHAT_BLOCK_END, max(start, length * i // part_count))
+        if pos < 0:
+            break
+        end = pos + len(CHAT_BLOCK_END)
+        parts.append(html_content[start:end])
+        start = end
+    parts.append(html_content[start:])
+    return parts
+
+
+def parse_raw_chat_part(html_part: str) -> list[tuple]:
+    """ parse_raw_chat_part
+        機能：分割したログを高速解析で解析する（解析プロセスで実行）
+
+    Args:
+        html_part (str): 分割したログテキスト
+
+    Returns:
+        list[tuple]: 発言のリスト（プロセス間の受け渡しを軽くするため、RawChatではなくtuple）
+    """
+    return [tuple(raw_chat) for raw_chat in iter_raw_chats(html_part)]
+
+
+def parse_raw_chats_in_parallel(html_content: str, worker_count: int, progress_callback: Optional[Callable[[int, int, int], None]] = None) -> list[RawChat]:
+    """ parse_raw_chats_in_parallel
+        機能：HTMLのログを分割して、別プロセスで並列に高速解析する
+            ・プロセス数より多めに分割し、終わった分割ごとに進捗を通知する
+            ・分割したうち1つでも高速解析で扱えない場合はUnsupportedMarkupErrorを送出する
+            ・progress_callbackで例外を送出すると、まだ始まっていない分割を取り消して解析を中断する
+
+    Args:
+        html_content (str): ココフォリアのログテキスト
+        worker_count (int): 解析プロセス数
+        progress_callback (Optional[Callable[[int, int, int], None]], optional): 進捗の通知先（発言数 / 解析した文字数 / 全体の文字数）. Defaults to None.
+
+    Returns:
+        list[RawChat]: 発言のリスト（ログの順）
+    """
+    parts = split_html_content(html_content, worker_count * PARALLEL_PARTS_PER_WORKER)
+    part_raw_chats = [None] * len(parts)
+    chat_count = 0
+    done_length = 0
+    total_length = len(html_content)
+
+    executor = ProcessPoolExecutor(max_workers=min(worker_count, len(parts)))
+    try:
+        futures = {executor.submit(parse_raw_chat_part, html_part): i for i, html_part in enumerate(parts)}
+        for future in as_completed(futures):
+            i = futures[future]
+            part_raw_chats[i] = future.result()
+            chat_count += len(part_raw_chats[i])
+            done_length += len(parts[i])
+            if progress_callback is not None:
+                progress_callback(chat_count, done_length, total_length)
+    except BaseException:
+        # 中断・解析エラーの場合は、実行中の分割の終了を待たずに戻る
+        executor.shutdown(wait=False, cancel_futures=True)
+        raise
+    executor.shutdown()
+
+    raw_chats = []
+    for raw_chat_tuples in part_raw_chats:
+        raw_chats.extend(map(RawChat._make, raw_chat_tuples))
+    return raw_chats
+
+
+def parse_raw_chats_in_parts(html_content: str, progress_callback: Callable[[int, int, int], None]) -> list[RawChat]:
+    """ parse_raw_chats_in_parts
+        機能：HTMLのログを分割して順に高速解析し、分割ごとに進捗を通知する
+            ※progress_callbackで例外を送出すると、解析を中断する
+
+    Args:
+        html_content (str): ココフォリアのログテキスト
+        progress_callback (Callable[[int, int, int], None]): 進捗の通知先（発言数 / 解析した文字数 / 全体の文字数）
+
+    Returns:
+        list[RawChat]: 発言のリスト
+    """
+    raw_chats = []
+    done_length = 0
+    total_length = len(html_content)
+    for html_part in split_html_content(html_content, total_length // PROGRESS_PART_LENGTH + 1):
+        raw_chats.extend(iter_raw_chats(html_part))
+        done_length += len(html_part)
+        progress_callback(len(raw_chats), done_length, total_length)
+    return raw_chats
+
+
+def parse_raw_chats(html_content: str, backend_name: Optional[str] = None, progress_callback: Optional[Callable[[int, int, int], None]] = None) -> list[RawChat]:
+    """ parse_raw_chats
+        機能：HTMLのログから発言を取り出す
+            ※大きなログは分割して並列に解析する（resources.jsonで指定した文字数以上の場合。プロセス数もresources.jsonの設定）
+            ※高速解析で扱えないHTMLの場合は、HTMLパーサーで解析しなおす
+
+    Args:
+        html_content (str): ココフォリアのログテキスト
+        backend_name (Optional[str], optional): 解析処理の名前. Defaults to None（resources.jsonの設定）.
+        progress_callback (Optional[Callable[[int, int, int], None]], optional): 進捗の通知先（発言数 / 解析した文字数 / 全体の文字数）. Defaults to None.
+
+    Returns:
+        list[RawChat]: 発言のリスト
+    """
+    if backend_name is None:
+        backend_name = globals.RESOURCES[ResourcesKey.PARSER_BACKEND]
+    backend = select_parser_backend(backend_name)
+
+    raw_chats = None
+    if backend.name == PARSER_REGEX:
+        # 大きなログはプロセス数を決める（指定文字数ごとに1プロセス、上限はresources.jsonの設定）
+        worker_count = 1
+        min_length = globals.RESOURCES[ResourcesKey.PARALLEL_PARSE_MIN_LENGTH]
+        if 0 < min_length <= len(html_content):
+            worker_count = globals.get_worker_count(len(html_content) // min_length + 1, ResourcesKey.PARSE_WORKER_COUNT)
+
+        try:
+            if worker_count > 1:
+                try:
+                    raw_chats = parse_raw_chats_in_parallel(html_content, worker_count, progress_callback)
+                except (OSError, BrokenProcessPool):
+                    # プロセスを起動できない場合などは、1プロセスで解析しなおす（中断・解析エラーはそのまま送出する）
+                    pass
+            # 進捗の通知先がある場合は、分割して順に解析する
+            if raw_chats is None and progress_callback is not None:
+                return parse_raw_chats_in_parts(html_content, progress_callback)
+            if raw_chats is None:
+                raw_chats = list(backend.parse(html_content))
+        except UnsupportedMarkupError:
+            backend = select_fallback_parser_backend()
+
+    if raw_chats is None:
+        raw_chats = list(backend.parse(html_content))
+    if progress_callback is not None:
+        progress_callback(len(raw_chats), len(html_content), len(html_content))
+    return raw_chats
@@ -0,0 +1,160 @@
+""" preview.py
+    機能：変換後ログの解析（プレビュー表示用）
+        ・変換後ログを先頭から1回だけ読み、色ごとのテキストに分ける（全体のコピーを作らない）
+        ・Privatter用（style属性）とweb・iframe用（class属性とstyleタグ）のどちらの着色も扱える
+"""
+import html
+import re
+from typing import Iterator, Mapping, Optional
+
+"""
+定数定義
+"""
+# タグ（<span style="...">、</p>、<br>など）
+TAG_PATTERN = re.compile(r'<(/?)([a-zA-Z]+)([^<>]*)>')
+# spanタグのstyle属性・class属性
+STYLE_ATTR_PATTERN = re.compile(r'style="([^"]*)"')
+CLASS_ATTR_PATTERN = re.compile(r'class="([^"]*)"')
+# style属性・styleタグ内の文字色（background-colorなどは除く）
+COLOR_PATTERN = re.compile(r'(?<![\w-])color\s*:\s*(#[0-9a-fA-F]{3,8})\b')
+# styleタグ内のクラスごとの設定（.class_name{color:#xxxxxx}）
+STYLE_CLASS_PATTERN = re.compile(r'\.([\w-]+)\s*\{([^{}]*)\}')
+STYLE_TAG_OPEN = "<style>"
+STYLE_TAG_CLOSE = "</style>"
+# iframe用ログを続けて表示する時の区切り
+IFRAME_SEPARATOR = "<br><br>"
+# タグごとに置き換えるテキスト
+TAG_TEXTS = {
+    "br":   "\n",
+    "/p":   "\n\n",
+}
+# 色ごとのテキスト：[テキスト / 色（色なしの場合はNone）]
+PreviewSegment = tuple[str, Optional[str]]
+
+
+
+def parse_style_table(log_text: str) -> dict[str, str]:
+    """ parse_style_table
+        機能：変換後ログのstyleタグから、クラス名と色の対応表を作成する
+            ※iframe用ログはstyleタグが最後にあるため、解析の前に探す（閉じタグが無い場合は最後まで）
+
+    Args:
+        log_text (str): 変換後ログ
+
+    Returns:
+        dict[str, str]: クラス名→色（#付き）
+    """
+    class_colors = {}
+    start = log_text.find(STYLE_TAG_OPEN)
+    while start >= 0:
+        end = log_text.find(STYLE_TAG_CLOSE, start)
+        if end < 0:
+            end = len(log_text)
+        for match in STYLE_CLASS_PATTERN.finditer(log_text, start, end):
+            color = COLOR_PATTERN.search(match.group(2))
+            if color:
+                class_colors[match.group(1)] = color.group(1)
+        start = log_text.find(STYLE_TAG_OPEN, end)
+    return class_colors
+
+
+def join_iframe_logs(iframe_logs: list[str]) -> str:
+    """ join_iframe_logs
+        機能：iframe用ログを区切りを入れて1つに続ける（プレビュー表示用）
+            ※各iframe用ログは閉じタグの無いstyleタグで終わるため、閉じないと次のiframe用ログがstyleタグの中身として読み飛ばされる
+
+    Args:
+        iframe_logs (list[str]): iframe用ログのリスト
+
+    Returns:
+        str: 続けたiframe用ログ
+    """
+    return IFRAME_SEPARATOR.join(iframe_log + STYLE_TAG_CLOSE for iframe_log in iframe_logs)
+
+
+def iter_preview_segments(log_text: str, class_colors: Optional[Mapping[str, str]] = None) -> Iterator[PreviewSegment]:
+    """ iter_preview_segments
+        機能：変換後ログを先頭から読み、色ごとのテキストを返す
+            ・改行タグは改行、</p>は空行にして、その他のタグは取り除く
+            ・spanタグの色はstyle属性、無ければclass属性とstyleタグの対応表から決める（どちらも無ければ外側の色）
+            ・styleタグの中身は表示しない
+
+    Args:
+        log_text (str): 変換後ログ
+        class_colors (Optional[Mapping[str, str]], optional): クラス名→色. Defaults to None（ログ内のstyleタグから作成）.
+
+    Yields:
+        Iterator[PreviewSegment]: 色ごとのテキスト（文字参照は変換済み）
+    """
+    if class_colors is None:
+        class_colors = parse_style_table(log_text)
+
+    span_colors = {}        # spanタグの属性→色（同じ属性のspanは何度も出てくるため、1回だけ解析する）
+    color_stack = []        # 開いているspanタグの色（spanタグの外はNone）
+    color = None            # 現在の色
+    texts = []              # 同じ色で続いているテキスト
+    pos = 0
+
+    for match in TAG_PATTERN.finditer(log_text):
+        start = match.start()
+        if start < pos:
+            # styleタグの中身として読み飛ばした範囲
+            continue
+        texts.append(log_text[pos:start])
+        pos = match.end()
+        closing, name, attrs = match.groups()
+        name = name.lower()
+
+        # span：色の切り替え（同じ色で続いたテキストを1つにして返す）
+        if name == "span":
+            if texts:
+                text = "".join(texts)
+                texts.clear()
+                if text:
+                    yield html.unescape(text), color
+            if closing:
+                if color_stack:
+                    color_stack.pop()
+            else:
+                if attrs not in span_colors:
+                    span_colors[attrs] = get_span_color(attrs, class_colors)
+                span_color = span_colors[attrs]
+                # 色の指定が無いspanは、外側の色を引き継ぐ
+                color_stack.append(span_color if span_color is not None else color)
+            color = color_stack[-1] if color_stack else None
+        # style：中身は表示しない
+        elif name == "style" and not closing:
+            end = log_text.find(STYLE_TAG_CLOSE, pos)
+            pos = len(log_text) if end < 0 else end + len(STYLE_TAG_CLOSE)
+        else:
+            texts.append(TAG_TEXTS.get(closing + name, ""))
+
+    texts.append(log_text[pos:])
+    text = "".join(texts)
+    if text:
+        yield html.unescape(text), color
+
+
+def get_span_color(attrs: str, class_colors: Mapping[str, str]) -> Optional[str]:
+    """ get_span_color
+        機能：spanタグの属性から色を取得する（style属性の色、無ければclass属性の色）
+
+    Args:
+        attrs (str): spanタグの属性
+        class_colors (Mapping[str, str]): クラス名→色
+
+    Returns:
+        Optional[str]: 色（指定が無い場合はNone）
+    """
+    style = STYLE_ATTR_PATTERN.search(attrs)
+    if style:
+        color = COLOR_PATTERN.search(style.group(1))
+        if color:
+            return color.group(1)
+
+    class_attr = CLASS_ATTR_PATTERN.search(attrs)
+    if class_attr:
+        for class_name in class_attr.group(1).split():
+            if class_name in class_colors:
+                return class_colors[class_name]
+    return None
@@ -3,14 +3,25 @@
 """
 import os
 import re
+import threading
+from typing import Optional
 
 from app.logic import globals
-from app.logic.fileio import get_root_relative_path, load_json, save_json
+from app.logic.cache import (ParseCache, get_content_key, get_file_key,
+                             is_parse_cache_enabled, load_parse_cache,
+                             save_parse_cache)
+from app.logic.fileio import get_root_relative_path
 from app.logic.formatter import (CharacterList, ConvertedLog,
                                  convert_chats_to_text,
-                                 convert_log_to_chat_list,
+                                 convert_raw_chats_to_chat_list,
+                                 create_character_index,
                                  create_style_tag_text)
 from app.logic.logging import logging_error
+from app.logic.observer import (ConvertCounter, ConvertNotifier,
+                                ConvertObserver, ConvertStage)
+from app.logic.parser import parse_raw_chats
+from app.logic.profiler import capture_profile
+from app.logic.store import SETTINGS_STORE
 from app.model.settings import *
 from app.model.settings import CHARACTER_CONFIG, CONVERT_CONFIG
 from app.model.uitexts import TextKey
@@ -20,53 +31,149 @@ from system.resources import (CHARACTER_FILE_NAME, CONFIG_FILE_NAME,
                               SETTINGS_DIR_NAME, ResourcesKey)
 
 
-def convert_log(input_path: str, output_path: str, convert_config: dict, character_config: list) -> tuple[bool, tuple[ConvertedLog, int], list[str]] | tuple[bool, Exception, CharacterList]:
+class ConvertCancelledError(Exception):
+    """ ConvertCancelledError
+        機能：ログ変換が中断された
+    """
+
+
+
+def check_cancelled(cancel_event: Optional[threading.Event]):
+    """ check_cancelled
+        機能：中断が指示されていたら、ConvertCancelledErrorを送出する
+
+    Args:
+        cancel_event (Optional[threading.Event]): 中断の指示
+    """
+    if cancel_event is not None and cancel_event.is_set():
+        raise ConvertCancelledError()
+
+
+def convert_log(input_path: str, output_path: str, convert_config: dict, character_config: list, parse_cache: Optional[ParseCache] = None, observer: Optional[ConvertObserver] = None, cancel_event: Optional[threading.Event] = None) -> tuple[bool, tuple[ConvertedLog, int], list[str]] | tuple[bool, Exception, CharacterList]:
 
     """ convert_log
     機能：ログ変換処理
+        ※プロファイルモードが有効な場合、処理時間とメモリの記録を出力ディレクトリに保存する
 
     Args:
         input_path (str): ココフォリアのログのパス
         output_path (str): 変換後のログを出力するパス
         convert_config (dict): 変換設定の設定値
         character_config (list): キャラ設定の設定値
+        parse_cache (Optional[ParseCache], optional): 解析結果の保持先. Defaults to None（毎回解析する）.
+        observer (Optional[ConvertObserver], optional): 変換の経過の通知先（処理段階、進捗、件数）. Defaults to None.
+        cancel_event (Optional[threading.Event], optional): 中断の指示（出力ファイルの保存前まで確認する）. Defaults to None.
 
     Returns:
         tuple[bool, tuple[str, int] | tuple[str, Exception], list[str]]:
             変換の成功or失敗 / [変換後テキスト / 文字数] または [ダイアログメッセージ / Exception] / 未設定または着色無効のキャラクターリスト
+
+    Raises:
+        ConvertCancelledError: 中断が指示された
+    """
+    with capture_profile():
+        return run_convert_log(input_path, output_path, convert_config, character_config, parse_cache, observer, cancel_event)
+
+
+def run_convert_log(input_path: str, output_path: str, convert_config: dict, character_config: list, parse_cache: Optional[ParseCache] = None, observer: Optional[ConvertObserver] = None, cancel_event: Optional[threading.Event] = None) -> tuple[bool, tuple[ConvertedLog, int], list[str]] | tuple[bool, Exception, CharacterList]:
+    """ run_convert_log
+        機能：ログ変換処理の本体（引数・戻り値はconvert_logと同じ）
     """
     characters = []
+    raw_chats = None
+    notifier = ConvertNotifier(observer)
+
+    def report_progress(chat_count: int, done_length: int, total_length: int):
+        """ report_progress
+            機能：解析の進捗を通知し、中断が指示されていたら解析を中断する
+        """
+        notifier.progress(ConvertStage.PARSE, chat_count, done_length, total_length)
+        check_cancelled(cancel_event)
+
     try:
-        # 指定されたココフォリアのログを読み込む
-        with open(input_path, "r", encoding="utf-8") as f:
-            html_content = f.read()
+        with notifier.stage(ConvertStage.READ):
+            # 前回と同じファイルの場合、解析結果を使いまわす
+            file_key = get_file_key(input_path)
+            notifier.count(ConvertCounter.INPUT_BYTES, file_key.size)
+            if parse_cache is not None:
+                raw_chats = parse_cache.get(file_key)
+
+            # 指定されたココフォリアのログを読み込む
+            if raw_chats is None:
+                with open(input_path, "rb") as f:
+                    html_bytes = f.read()
+
+                # 同じ内容のログを解析したことがあれば、保存した解析結果を使う
+                content_key = None
+                if is_parse_cache_enabled():
+                    content_key = get_content_key(html_bytes)
+                    raw_chats = load_parse_cache(content_key)
+
+                if raw_chats is None:
+                    html_content = decode_log_text(html_bytes)
+                del html_bytes
+        check_cancelled(cancel_event)
+    except ConvertCancelledError:
+        raise
     except Exception as e:
         logging_error("ココフォリアログの読み込み失敗", get_root_relative_path(), e)
         return False, (TEXTS[TextKey.FAILED_READ_LOG_MESSAGE], e), characters
 
     try:
-        # 読み込んだココフォリアのログを変換する
-        chats, characters = convert_log_to_chat_list(html_content, convert_config, character_config)    # Chatリストへの変換
-        logs = convert_chats_to_text(chats, convert_config)
-        privatter_log, web_log, iframe_logs = logs
-        total_len = len(privatter_log)
-
-        # web用ログ変換が有効な場合
-        if convert_config.get(ConfigKey.CONVERT_WEB_LOG):
-            #styleタグのテキストを作る
-            style_tag_text = create_style_tag_text(character_config, characters.use_classes)
-            for i in range(len(iframe_logs)):
-                iframe_logs[i] += style_tag_text
-        converted_text = privatter_log, web_log, iframe_logs
-
+        # 読み込んだココフォリアのログから発言を取り出す（設定に依存しない）
+        notifier.count(ConvertCounter.CACHE_HIT, int(raw_chats is not None))
+        if raw_chats is None:
+            with notifier.stage(ConvertStage.PARSE):
+                raw_chats = parse_raw_chats(html_content, progress_callback=report_progress if observer or cancel_event else None)
+                del html_content
+
+                # 解析結果をファイルに保存する（失敗しても変換は続ける）
+                if content_key is not None:
+                    try:
+                        save_parse_cache(content_key, raw_chats)
+                    except Exception as e:
+                        logging_error("解析結果のキャッシュ保存失敗", get_root_relative_path(), e)
+        notifier.count(ConvertCounter.RAW_CHAT_COUNT, len(raw_chats))
+
+        if parse_cache is not None:
+            parse_cache.put(file_key, raw_chats)
+        check_cancelled(cancel_event)
+
+        # 取り出した発言に設定を適用して変換する
+        with notifier.stage(ConvertStage.APPLY_CONFIG):
+            # キャラ設定の検索テーブルを作成する（変換中は使いまわす）
+            character_index = create_character_index(character_config)
+            skipped_counters = {}
+            chats, characters = convert_raw_chats_to_chat_list(raw_chats, convert_config, character_config, character_index, skipped_counters)    # Chatリストへの変換
+        notifier.count(ConvertCounter.CHAT_COUNT, len(chats))
+        for name, value in skipped_counters.items():
+            notifier.count(name, value)
+        check_cancelled(cancel_event)
+
+        with notifier.stage(ConvertStage.RENDER):
+            # web用ログ変換が有効な場合、iframe用ログに追加するstyleタグのテキストを作る
+            style_tag_text = ""
+            if convert_config.get(ConfigKey.CONVERT_WEB_LOG):
+                style_tag_text = create_style_tag_text(character_config, characters.use_classes, character_index)
+
+            # web用・iframe用ログは、参照された時に作成する
+            converted_text = convert_chats_to_text(chats, convert_config, style_tag_text)
+            privatter_log = converted_text.privatter_log
+            total_len = len(privatter_log)
+        notifier.count(ConvertCounter.OUTPUT_LENGTH, total_len)
+        check_cancelled(cancel_event)
+
+    except ConvertCancelledError:
+        raise
     except Exception as e:
         logging_error("ログ変換失敗", get_root_relative_path(), e)
         return False, (TEXTS[TextKey.FAILED_CONVERT_LOG_MESSAGE], e), characters
 
     try:
         # 変換したテキストを出力する
-        with open(output_path, "w", encoding="utf-8") as f:
-            f.write(privatter_log)
+        with notifier.stage(ConvertStage.WRITE):
+            with open(output_path, "w", encoding="utf-8") as f:
+                f.write(privatter_log)
     except Exception as e:
         logging_error("変換後ファイル保存失敗", get_root_relative_path(), e)
         return False, (TEXTS[TextKey.FAILED_WRITE_LOG_MESSGE], e), characters
@@ -74,6 +181,22 @@ def convert_log(input_path: str, output_path: str, convert_config: dict, charact
     return True, (converted_text, total_len), characters
 
 
+def decode_log_text(html_bytes: bytes) -> str:
+    """ decode_log_text
+        機能：読み込んだログをテキストに変換する（テキストモードで読み込んだ時と同じく、改行は\nに統一する）
+
+    Args:
+        html_bytes (bytes): ココフォリアのログ（読み込んだままのバイト列）
+
+    Returns:
+        str: ココフォリアのログテキスト
+    """
+    html_content = html_bytes.decode("utf-8")
+    if "\r" in html_content:
+        html_content = html_content.replace("\r\n", "\n").replace("\r", "\n")
+    return html_content
+
+
 def load_resources() -> dict:
     """ load_resources
         機能：リソースファイルから設定値読み込み。設定がなければ初期値を設定する
@@ -82,7 +205,7 @@ def load_resources() -> dict:
         dict: 設定値
     """
     # 設定ファイルを読み込む
-    resources_data: dict = load_json(os.path.join(SETTINGS_DIR_NAME, RESOURCES_FILE_NAME))
+    resources_data: dict = SETTINGS_STORE.load(os.path.join(SETTINGS_DIR_NAME, RESOURCES_FILE_NAME))
 
     # 変換設定
     for resource_cfg in RESOURCES_CONFIG:
@@ -111,18 +234,21 @@ def save_resources(resources: dict, *args):
     Args:
         resources (dict): リソース設定の設定値
     """
-    save_json(resources, os.path.join(SETTINGS_DIR_NAME, RESOURCES_FILE_NAME))
+    SETTINGS_STORE.save(os.path.join(SETTINGS_DIR_NAME, RESOURCES_FILE_NAME), dict(resources))
 
 
-def load_convert_config() -> dict:
+def load_convert_config(path: Optional[str] = None) -> dict:
     """ load_convert_config
         機能：設定ファイルから設定値読み込み。設定がなければ初期値を設定する
 
+    Args:
+        path (Optional[str], optional): 設定ファイルのパス. Defaults to None（settings/config.json）.
+
     Returns:
         dict: 設定値
     """
     # 設定ファイルを読み込む
-    config_data: dict = load_json(os.path.join(SETTINGS_DIR_NAME, CONFIG_FILE_NAME))
+    config_data: dict = SETTINGS_STORE.load(path or os.path.join(SETTINGS_DIR_NAME, CONFIG_FILE_NAME))
 
     # 変換設定
     for convert_cfg in CONVERT_CONFIG:
@@ -142,22 +268,23 @@ def load_convert_config() -> dict:
 
 def save_convert_config(convert_config: dict, *args):
     """ save_convert_config
-        機能：ログ変換画面で設定された設定値を保存する
+        機能：ログ変換画面で設定された設定値を保存する（メモリ上で更新し、ファイルへの保存はまとめて行う）
     """
-    current_config = load_convert_config()
-    current_config.update(convert_config)
-    save_json(current_config, os.path.join(SETTINGS_DIR_NAME, CONFIG_FILE_NAME))
+    SETTINGS_STORE.update(os.path.join(SETTINGS_DIR_NAME, CONFIG_FILE_NAME), convert_config)
 
 
-def load_character_config() -> tuple[dict, list[dict]]:
+def load_character_config(path: Optional[str] = None) -> tuple[dict, list[dict]]:
     """ load_character_config
         機能：設定ファイルから設定値読み込み
 
+    Args:
+        path (Optional[str], optional): 設定ファイルのパス. Defaults to None（settings/character.json）.
+
     Returns:
         tuple[dict, list[dict]: 初期値の設定値 / 設定値
     """
     # 設定ファイルを読み込む
-    config_data: list = load_json(os.path.join(SETTINGS_DIR_NAME, CHARACTER_FILE_NAME))
+    config_data: list = SETTINGS_STORE.load(path or os.path.join(SETTINGS_DIR_NAME, CHARACTER_FILE_NAME))
 
     default_cfg = None
     character_cfg = []
@@ -181,9 +308,9 @@ def load_character_config() -> tuple[dict, list[dict]]:
 
 def save_character_config(character_config: list, *args):
     """ save_character_config
-        機能：キャラ設定画面で設定された設定値を保存する
+        機能：キャラ設定画面で設定された設定値を保存する（メモリ上で更新し、ファイルへの保存はまとめて行う）
     """
-    save_json(character_config, os.path.join(SETTINGS_DIR_NAME, CHARACTER_FILE_NAME))
+    SETTINGS_STORE.save(os.path.join(SETTINGS_DIR_NAME, CHARACTER_FILE_NAME), character_config)
 
 
 def check_valid_color_code(color_code: str) -> bool:
@@ -0,0 +1,119 @@
+""" profiler.py
+    機能：ログ変換の処理時間・メモリの記録（プロファイルモード）
+        ・resources.jsonのprofile_modeが有効な場合、変換1回ごとにoutput/に記録を保存する
+        ・profile_*.prof：cProfileの結果（python -m pstats、snakevizなどで開く）
+        ・profile_*_memory.txt：メモリを多く確保した行の一覧（tracemalloc）
+        ※ログの内容は含まないため、遅い場合の調査に受け取ってもよい
+"""
+import cProfile
+import os
+import tracemalloc
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Iterator
+
+from app.logic import globals
+from app.logic.fileio import get_executable_path, get_root_relative_path
+from app.logic.logging import logging_error
+from system.resources import OUTPUT_DIR_NAME, ResourcesKey
+
+"""
+定数定義
+"""
+# 記録ファイル名の先頭・末尾
+PROFILE_FILE_PREFIX = "profile_"
+PROFILE_STATS_EXTENSION = ".prof"
+PROFILE_MEMORY_SUFFIX = "_memory.txt"
+# メモリの確保元として記録する呼び出し元の段数
+TRACEMALLOC_FRAMES = 1
+
+
+
+def is_profile_enabled() -> bool:
+    """ is_profile_enabled
+        機能：プロファイルモードが有効か確認する
+
+    Returns:
+        bool: Trueで変換ごとに記録を保存する
+    """
+    return globals.RESOURCES[ResourcesKey.PROFILE_MODE] == True
+
+
+def get_profile_base_path() -> str:
+    """ get_profile_base_path
+        機能：記録ファイルのパス（拡張子なし）を作成する
+            ※一括変換では複数のプロセスが同時に保存するため、日時にプロセスIDを付ける
+
+    Returns:
+        str: 記録ファイルのパス（絶対パス、拡張子なし）
+    """
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+    return get_executable_path(os.path.join(OUTPUT_DIR_NAME, f"{PROFILE_FILE_PREFIX}{timestamp}_{os.getpid()}"))
+
+
+@contextmanager
+def capture_profile() -> Iterator[None]:
+    """ capture_profile
+        機能：with内の処理時間とメモリの確保を記録し、終了時にファイルに保存する
+            ・プロファイルモードが無効な場合は何もしない
+            ・例外で終了した場合も保存する（保存に失敗してもエラーログに残すだけで、処理は止めない）
+
+    Yields:
+        Iterator[None]: 記録中
+    """
+    if not is_profile_enabled():
+        yield
+        return
+
+    # 他で計測中の場合は、止めずにそのまま使う
+    started_tracemalloc = not tracemalloc.is_tracing()
+    if started_tracemalloc:
+        tracemalloc.start(TRACEMALLOC_FRAMES)
+    tracemalloc.reset_peak()
+    profiler = cProfile.Profile()
+
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        snapshot = tracemalloc.take_snapshot()
+        current_size, peak_size = tracemalloc.get_traced_memory()
+        if started_tracemalloc:
+            tracemalloc.stop()
+
+        try:
+            base_path = get_profile_base_path()
+            os.makedirs(os.path.dirname(base_path), exist_ok=True)
+            profiler.dump_stats(base_path + PROFILE_STATS_EXTENSION)
+            save_memory_snapshot(base_path + PROFILE_MEMORY_SUFFIX, snapshot, current_size, peak_size)
+        except Exception as e:
+            logging_error("プロファイル保存失敗", get_root_relative_path(), e)
+
+
+def save_memory_snapshot(path: str, snapshot: tracemalloc.Snapshot, current_size: int, peak_size: int):
+    """ save_memory_snapshot
+        機能：メモリを多く確保した行の一覧をファイルに保存する
+
+    Args:
+        path (str): 保存先のパス
+        snapshot (tracemalloc.Snapshot): 変換終了時のメモリの確保状況
+        current_size (int): 変換終了時のメモリ使用量（バイト）
+        peak_size (int): 変換中の最大メモリ使用量（バイト）
+    """
+    top_count = globals.RESOURCES[ResourcesKey.PROFILE_TOP_ALLOCATIONS]
+    # tracemalloc自体の確保は除く
+    snapshot = snapshot.filter_traces([tracemalloc.Filter(False, tracemalloc.__file__)])
+    statistics = snapshot.statistics("lineno")
+
+    lines = [
+        f"current: {current_size / 1024:,.1f} KiB",
+        f"peak: {peak_size / 1024:,.1f} KiB",
+        f"top {top_count} allocations (lineno):",
+    ]
+    for i, stat in enumerate(statistics[:top_count], start=1):
+        frame = stat.traceback[0]
+        lines.append(f"{i:>3}. {frame.filename}:{frame.lineno}: {stat.size / 1024:,.1f} KiB ({stat.count} blocks)")
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("\n".join(lines) + "\n")
@@ -0,0 +1,132 @@
+""" store.py
+    機能：設定ファイルの保持（メモリ上で更新し、まとめてファイルに保存する）
+        ・入力のたびにファイルを書き換えないよう、最後の変更から一定時間たってから保存する
+        ・アプリ終了時は、未保存の変更を必ず保存する
+"""
+import atexit
+import copy
+import threading
+from typing import Optional
+
+from app.logic.fileio import load_json, save_json
+
+"""
+定数定義
+"""
+# 最後の変更から保存するまでの待ち時間（秒）
+FLUSH_DELAY_SECONDS = 0.5
+
+
+
+class SettingsStore:
+    """ SettingsStore
+        機能：設定ファイルの内容をメモリ上に保持し、変更があったものだけ遅れて保存する
+            ※保存はタイマーのスレッドから行うため、操作はロックで保護する
+    """
+    def __init__(self, flush_delay: float = FLUSH_DELAY_SECONDS):
+        self._flush_delay = flush_delay     # 最後の変更から保存するまでの待ち時間
+        self._lock = threading.RLock()
+        self._data = {}                     # 設定ファイルのパスごとの内容
+        self._dirty = set()                 # 未保存の設定ファイルのパス
+        self._timer = None                  # 保存待ちのタイマー
+
+
+    def load(self, path: str) -> object:
+        """ load
+            機能：設定ファイルの内容を取得する（初回のみファイルから読み込む）
+
+        Args:
+            path (str): 設定ファイルのパス
+
+        Returns:
+            object: 設定ファイルの内容（コピー。変更しても保持している内容は変わらない）
+        """
+        with self._lock:
+            if path not in self._data:
+                self._data[path] = load_json(path)
+            return copy.deepcopy(self._data[path])
+
+
+    def save(self, path: str, data: object):
+        """ save
+            機能：設定ファイルの内容を置き換え、保存を予約する
+
+        Args:
+            path (str): 設定ファイルのパス
+            data (object): 設定ファイルの内容（保持するため、渡した後は変更しないこと）
+        """
+        with self._lock:
+            # 内容が変わっていない場合は保存しない
+            if path in self._data and self._data[path] == data:
+                return
+            self._data[path] = data
+            self._dirty.add(path)
+            self._schedule_flush()
+
+
+    def update(self, path: str, values: dict):
+        """ update
+            機能：設定ファイルの内容（dict）の一部を更新し、保存を予約する
+
+        Args:
+            path (str): 設定ファイルのパス
+            values (dict): 更新する設定値
+        """
+        with self._lock:
+            if path not in self._data:
+                self._data[path] = load_json(path)
+            # 保存中の内容を書き換えないように、新しいdictにする
+            self.save(path, {**self._data[path], **values})
+
+
+    def is_dirty(self, path: Optional[str] = None) -> bool:
+        """ is_dirty
+            機能：未保存の変更があるか確認する
+
+        Args:
+            path (Optional[str], optional): 設定ファイルのパス. Defaults to None（全ての設定ファイル）.
+
+        Returns:
+            bool: Trueで未保存の変更あり
+        """
+        with self._lock:
+            return bool(self._dirty) if path is None else path in self._dirty
+
+
+    def flush(self):
+        """ flush
+            機能：未保存の変更をファイルに保存する
+        """
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            for path in sorted(self._dirty):
+                save_json(self._data[path], path)
+            self._dirty.clear()
+
+
+    def clear(self):
+        """ clear
+            機能：保持している内容を破棄する（未保存の変更は保存してから破棄する）
+        """
+        with self._lock:
+            self.flush()
+            self._data.clear()
+
+
+    def _schedule_flush(self):
+        """ _schedule_flush
+            機能：保存を予約する（予約済みの場合は、待ち時間を延長する）
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self._flush_delay, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+
+
+# アプリ全体で使う設定の保持先（終了時に未保存の変更を保存する）
+SETTINGS_STORE = SettingsStore()
+atexit.register(SETTINGS_STORE.flush)
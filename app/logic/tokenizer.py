@@ -0,0 +1,195 @@
+""" tokenizer.py
+    機能：ココフォリアログの逐次解析（BeautifulSoupを使わない高速な解析）
+"""
+import re
+from typing import Iterator
+
+from app.model.chat import RawChat
+
+"""
+定数定義
+"""
+# 発言1件分のpタグ（<p style="..."><span>タブ</span><span>キャラ</span><span>発言</span></p>）
+#   ※発言部分は「テキスト（改行タグ テキスト）の繰り返し」の形にして、一致しない場合の後戻りを発言の長さに比例する範囲にする
+CHAT_BLOCK_PATTERN = re.compile(
+    r'<p(?: style="(?P<style>[^"<>&]*)")?>'
+    r'[^<]*<span>(?P<tab>[^<]*)</span>'
+    r'[^<]*<span>(?P<character>[^<]*)</span>'
+    r'[^<]*<span>(?P<message>[^<]*(?:<br\s*/?>[^<]*)*)</span>'
+    r'[^<]*</p>'
+)
+# 発言以外のタグ（html、head、body、metaなど）
+OTHER_TAG_PATTERN = re.compile(
+    r'<(?:!DOCTYPE[^<>]*|/?(?P<name>[a-zA-Z][a-zA-Z0-9]*)(?:\s[^<>]*)?/?)>',
+    re.IGNORECASE
+)
+# 発言内の改行タグ
+LINE_BREAK_PATTERN = re.compile(r'<br\s*/?>')
+# 文字参照（&lt;、&#39;、&#x27;など）
+ENTITY_PATTERN = re.compile(r'&(?:#([0-9]{1,7})|#[xX]([0-9a-fA-F]{1,6})|([a-zA-Z]+));')
+
+# 発言の外にあると解析結果が変わる可能性があるタグ
+UNSUPPORTED_TAGS = {"p", "span", "plaintext"}
+# 中身をテキストとして扱うタグ（中にタグが無ければ読み飛ばせる）
+RAW_TEXT_TAGS = {"script", "style", "textarea", "title", "xmp", "iframe", "noembed", "noframes", "noscript"}
+# 変換できる名前付き文字参照
+NAMED_ENTITIES = {
+    "lt":   "<",
+    "gt":   ">",
+    "amp":  "&",
+    "quot": '"',
+    "apos": "'",
+    "nbsp": "\xa0",
+}
+# BeautifulSoupが空白のみとみなす文字
+ASCII_SPACES = " \n\t\f\r"
+TEXT_NEWLINE = "\n"
+
+
+
+class UnsupportedMarkupError(Exception):
+    """ UnsupportedMarkupError
+        機能：高速解析で扱えないHTMLを見つけた（BeautifulSoupでの解析が必要）
+    """
+
+
+
+def iter_raw_chats(html_content: str) -> Iterator[RawChat]:
+    """ iter_raw_chats
+        機能：ココフォリアのログを先頭から順に読み、発言を1件ずつ返す
+            ※ツリーを作らないため、メモリ使用量は発言1件分で済む
+            ※想定外のタグがあった場合はUnsupportedMarkupErrorを送出する
+
+    Args:
+        html_content (str): ココフォリアのログテキスト
+
+    Yields:
+        Iterator[RawChat]: 発言
+    """
+    find = html_content.find
+    match_block = CHAT_BLOCK_PATTERN.match
+    match_tag = OTHER_TAG_PATTERN.match
+    pos = 0
+
+    while True:
+        pos = find("<", pos)
+        if pos < 0:
+            return
+
+        ################
+        # 発言の抽出
+        ################
+        block = match_block(html_content, pos)
+        if block:
+            pos = block.end()
+            style = block.group("style")
+            # style属性が無い、またはcolor指定が無い場合はスキップ
+            if style is None or not style.startswith("color:"):
+                continue
+
+            # spanタグから抽出（改行タグで区切られたテキストごとに変換する）
+            message = TEXT_NEWLINE.join(
+                text_node(text) for text in LINE_BREAK_PATTERN.split(block.group("message"))
+            )
+            yield RawChat(
+                tab=text_node(block.group("tab")).strip().strip("[]"),
+                character=text_node(block.group("character")),
+                color_code=style.split(":")[-1].strip(";").lstrip("#"),
+                message=message.strip()
+            )
+            continue
+
+        ################
+        # 発言以外のタグ
+        ################
+        tag = match_tag(html_content, pos)
+        if tag is None:
+            raise UnsupportedMarkupError(f"unsupported markup at {pos}")
+        pos = tag.end()
+
+        name = (tag.group("name") or "").lower()
+        if name in UNSUPPORTED_TAGS:
+            raise UnsupportedMarkupError(f"unsupported tag <{name}> at {tag.start()}")
+
+        # テキスト扱いのタグは閉じタグまで読み飛ばす（中にタグがある場合は解析しない）
+        if name in RAW_TEXT_TAGS and not tag.group(0).startswith("</"):
+            close = re.compile(rf'</{name}\s*>', re.IGNORECASE).search(html_content, pos)
+            if close is None or "<" in html_content[pos:close.start()]:
+                raise UnsupportedMarkupError(f"unsupported content in <{name}> at {tag.start()}")
+            pos = close.end()
+
+
+def text_node(text: str) -> str:
+    """ text_node
+        機能：タグに挟まれたテキストを、BeautifulSoupのget_text()と同じ文字列にする
+
+    Args:
+        text (str): タグに挟まれたテキスト
+
+    Returns:
+        str: 変換後のテキスト
+    """
+    return collapse_whitespace(unescape(text))
+
+
+def collapse_whitespace(text: str) -> str:
+    """ collapse_whitespace
+        機能：空白のみのテキストを、改行を含めば改行1つ、含まなければ空白1つにする
+            ※BeautifulSoupの文字列の扱いに合わせるため
+
+    Args:
+        text (str): 文字参照を変換済みのテキスト
+
+    Returns:
+        str: 変換後のテキスト
+    """
+    if text and not text.strip(ASCII_SPACES):
+        return TEXT_NEWLINE if TEXT_NEWLINE in text else " "
+    return text
+
+
+def unescape(text: str) -> str:
+    """ unescape
+        機能：文字参照を文字に戻す
+            ※BeautifulSoupと結果が変わる可能性がある文字参照はUnsupportedMarkupErrorを送出する
+
+    Args:
+        text (str): 変換するテキスト
+
+    Returns:
+        str: 変換後のテキスト
+    """
+    if "&" not in text:
+        return text
+
+    ampersand_count = text.count("&")
+    text, count = ENTITY_PATTERN.subn(replace_entity, text)
+    # 文字参照になっていない&がある場合
+    if count != ampersand_count:
+        raise UnsupportedMarkupError("unsupported bare ampersand")
+    return text
+
+
+def replace_entity(match: re.Match) -> str:
+    """ replace_entity
+        機能：文字参照1件を文字に変換する
+
+    Args:
+        match (re.Match): ENTITY_PATTERNの一致結果
+
+    Returns:
+        str: 変換後の文字
+    """
+    decimal, hexadecimal, name = match.groups()
+
+    # 名前付き文字参照
+    if name is not None:
+        if name not in NAMED_ENTITIES:
+            raise UnsupportedMarkupError(f"unsupported entity &{name};")
+        return NAMED_ENTITIES[name]
+
+    # 数値文字参照（windows-1252として扱われる範囲、サロゲート、範囲外は対象外）
+    code = int(decimal) if decimal is not None else int(hexadecimal, 16)
+    if code == 0 or 0x80 <= code < 0xA0 or 0xD800 <= code < 0xE000 or code > 0x10FFFF:
+        raise UnsupportedMarkupError(f"unsupported character reference {match.group(0)}")
+    return chr(code)
@@ -0,0 +1,74 @@
+""" transform.py
+    機能：発言内容の置換（有効な置換ルールをまとめて1回で適用する）
+"""
+import re
+from typing import Callable
+
+from app.model.settings import MESSAGE_REPLACE_RULES, MessageReplaceRule
+
+
+def compile_message_transform(convert_config: dict, rules: list[MessageReplaceRule] = MESSAGE_REPLACE_RULES) -> Callable[[str], str]:
+    """ compile_message_transform
+        機能：有効な置換ルールから、発言内容を変換する関数を作成する
+            ※1文字の置換はstr.translate、複数文字の置換は1つの正規表現にまとめる
+
+    Args:
+        convert_config (dict): 変換設定の設定値
+        rules (list[MessageReplaceRule], optional): 置換ルール. Defaults to MESSAGE_REPLACE_RULES.
+
+    Returns:
+        Callable[[str], str]: 発言内容を変換する関数
+    """
+    enabled_rules = [rule for rule in rules if rule.old and convert_config.get(rule.key)]
+
+    # 有効なルールが無い場合は何もしない
+    if not enabled_rules:
+        return str
+
+    # 置換結果が他のルールに影響する場合は、ルールの順番どおりに置換する
+    if not is_independent_rules(enabled_rules):
+        def replace_in_order(message: str) -> str:
+            for rule in enabled_rules:
+                message = message.replace(rule.old, rule.new)
+            return message
+        return replace_in_order
+
+    # 1文字の置換
+    translate_table = {ord(rule.old): rule.new for rule in enabled_rules if len(rule.old) == 1}
+    # 複数文字の置換
+    replacements = {rule.old: rule.new for rule in enabled_rules if len(rule.old) > 1}
+
+    if not replacements:
+        return lambda message: message.translate(translate_table)
+
+    # 複数文字の置換が1つだけの場合は正規表現を使わない
+    if len(replacements) == 1:
+        (old, new), = replacements.items()
+        if not translate_table:
+            return lambda message: message.replace(old, new)
+        return lambda message: message.translate(translate_table).replace(old, new)
+
+    pattern = re.compile("|".join(re.escape(old) for old in replacements))
+    replace = lambda match: replacements[match.group(0)]
+    if not translate_table:
+        return lambda message: pattern.sub(replace, message)
+    return lambda message: pattern.sub(replace, message.translate(translate_table))
+
+
+def is_independent_rules(rules: list[MessageReplaceRule]) -> bool:
+    """ is_independent_rules
+        機能：置換ルールの順番を変えても結果が変わらないか確認する
+            ※あるルールの置換前の文字が、他のルールの置換前・置換後に含まれなければ独立している
+
+    Args:
+        rules (list[MessageReplaceRule]): 置換ルール
+
+    Returns:
+        bool: Trueで独立している（まとめて置換できる）
+    """
+    for i, rule in enumerate(rules):
+        old_chars = set(rule.old)
+        for j, other in enumerate(rules):
+            if i != j and old_chars & set(other.old + other.new):
+                return False
+    return True
@@ -0,0 +1,194 @@
+""" character.py
+    機能：キャラ設定画面の行（画面を使わずに、行の並び・表示位置を管理する）
+"""
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from app.model.settings import CHARACTER_CONFIG, ConfigKey
+
+
+@dataclass(eq=False)
+class CharacterRow:
+    """ CharacterRow
+        機能：キャラ設定1行分の設定値
+    """
+    is_default: bool                                # デフォルト行かどうか
+    values: dict = field(default_factory=dict)      # 設定項目ごとの設定値
+
+
+
+class CharacterRowList:
+    """ CharacterRowList
+        機能：キャラ設定の全行と、表示している範囲
+            ※行の移動・削除は並びを変えるだけで、画面は表示している範囲（get_visible_rows）だけ更新する
+    """
+    def __init__(self, visible_count: int):
+        self.rows: List[CharacterRow] = []      # キャラ設定（全行）
+        self.top = 0                            # 表示している先頭の行番号
+        self.visible_count = visible_count      # 表示できる行数
+
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+
+    def __getitem__(self, index: int) -> CharacterRow:
+        return self.rows[index]
+
+
+    def add_row(self, initial_values: Optional[Dict[str, Any]] = None, is_default: bool = False) -> CharacterRow:
+        """ add_row
+            機能：設定行を追加する。空行の追加ができるように引数は自由にしておく
+
+        Args:
+            initial_values (Optional[Dict[str, Any]], optional): キャラ設定. Defaults to None.
+            is_default (bool, optional): デフォルト行かどうか. Defaults to False.
+
+        Returns:
+            CharacterRow: 追加した行
+        """
+        values = {}
+        for setting in CHARACTER_CONFIG:
+            if initial_values is not None:
+                # initial_valuesがあれば、そのキーから値を取得（なければデフォルト）
+                values[setting.key] = initial_values.get(setting.key, setting.default)
+            else:
+                # initial_valuesが無ければ、デフォルトを使う
+                values[setting.key] = setting.default
+
+        # デフォルト行は着色を有効にする
+        if is_default:
+            values[ConfigKey.ENABLE_PAINT] = True
+
+        character_row = CharacterRow(is_default=is_default, values=values)
+        self.rows.append(character_row)
+        return character_row
+
+
+    def remove_row(self, character_row: CharacterRow):
+        """ remove_row
+            機能：行を削除する
+
+        Args:
+            character_row (CharacterRow): 削除する行
+        """
+        self.rows.remove(character_row)
+        self.clamp_top()
+
+
+    def swap_rows(self, index: int, other_index: int):
+        """ swap_rows
+            機能：2つの行を入れ替える
+
+        Args:
+            index (int): 行番号
+            other_index (int): 入れ替える行番号
+        """
+        rows = self.rows
+        rows[index], rows[other_index] = rows[other_index], rows[index]
+
+
+    def move_row_up(self, character_row: CharacterRow) -> bool:
+        """ move_row_up
+            機能：行を上に移動する
+
+        Args:
+            character_row (CharacterRow): 移動対象の行
+
+        Returns:
+            bool: Trueで移動した
+        """
+        index = self.rows.index(character_row)
+        # 最上段（デフォルト行の下）以外の時
+        if index > 0 and not self.rows[index - 1].is_default:
+            self.swap_rows(index, index - 1)
+            return True
+        return False
+
+
+    def move_row_down(self, character_row: CharacterRow) -> bool:
+        """ move_row_down
+            機能：行を下に移動する
+
+        Args:
+            character_row (CharacterRow): 移動対象の行
+
+        Returns:
+            bool: Trueで移動した
+        """
+        index = self.rows.index(character_row)
+        # 最下段以外の時
+        if index < len(self.rows) - 1:
+            self.swap_rows(index, index + 1)
+            return True
+        return False
+
+
+    def clamp_top(self):
+        """ clamp_top
+            機能：最後の行より下が空かないように、表示している先頭の行番号を制限する
+        """
+        self.top = max(0, min(self.top, len(self.rows) - self.visible_count))
+
+
+    def scroll_to(self, top: int) -> bool:
+        """ scroll_to
+            機能：指定した行が先頭になるように、表示している範囲を移動する
+
+        Args:
+            top (int): 先頭に表示する行番号
+
+        Returns:
+            bool: Trueで表示している範囲が変わった
+        """
+        top = max(0, min(top, len(self.rows) - self.visible_count))
+        if top == self.top:
+            return False
+        self.top = top
+        return True
+
+
+    def get_visible_rows(self, slot_count: int) -> List[Optional[CharacterRow]]:
+        """ get_visible_rows
+            機能：行ウィジェットごとに表示する行を取得する
+
+        Args:
+            slot_count (int): 行ウィジェットの数
+
+        Returns:
+            List[Optional[CharacterRow]]: 表示する行（表示しない行ウィジェットはNone）
+        """
+        self.clamp_top()
+        visible_rows = []
+        for i in range(slot_count):
+            index = self.top + i
+            visible_rows.append(self.rows[index] if i < self.visible_count and index < len(self.rows) else None)
+        return visible_rows
+
+
+    def get_scroll_fraction(self) -> tuple[float, float]:
+        """ get_scroll_fraction
+            機能：スクロールバーのつまみの位置と大きさを取得する
+
+        Returns:
+            tuple[float, float]: 表示している範囲の先頭・末尾（全体に対する0～1の割合）
+        """
+        if not self.rows:
+            return 0.0, 1.0
+        return self.top / len(self.rows), min(1.0, (self.top + self.visible_count) / len(self.rows))
+
+
+    def get_character_config(self) -> List[Dict[str, Any]]:
+        """ get_character_config
+            機能：キャラ設定の設定値を取得する
+
+        Returns:
+            List[Dict[str, Any]: 設定値
+        """
+        result = []
+        for character_row in self.rows:
+            # キャラクターの記入がない場合はスキップ
+            if str(character_row.values.get(ConfigKey.CHARACTER, "")).strip():
+                result.append(dict(character_row.values))
+
+        return result
@@ -2,6 +2,7 @@
     機能：chatオブジェクト（ココフォリアのログ構造）
 """
 from dataclasses import dataclass
+from typing import NamedTuple
 
 
 @dataclass
@@ -21,3 +22,14 @@ class Chat:
     color_code:     str             # カラーコード
     message:        str             # 発言内容
     convert_flags:  ConvertFlags    # 変換フラグ
+
+
+
+class RawChat(NamedTuple):
+    """ RawChat
+        機能：HTMLから取り出しただけの発言（変換設定の適用前）
+    """
+    tab:            str             # 発言タブ（[]は除去済み）
+    character:      str             # 発言者
+    color_code:     str             # ココフォリアでの発言色
+    message:        str             # 発言内容（<br>は改行に置換済み）
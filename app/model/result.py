@@ -0,0 +1,84 @@
+""" result.py
+    機能：ログ変換の結果（変換後ログは画面のテキストエリアではなく、ここから取得する）
+"""
+from dataclasses import dataclass, field
+from typing import Protocol
+
+
+
+class ConvertedLogProtocol(Protocol):
+    """ ConvertedLogProtocol
+        機能：変換後ログ（app.logic.formatter.ConvertedLogが満たす。modelからlogicを参照しないための型）
+    """
+    privatter_log:  str         # 通常変換
+    style_tag_text: str         # web用・iframe用のstyleタグ
+    render_times:   dict        # web用・iframe用の作成にかかった秒数
+
+    @property
+    def web_log(self) -> str: ...           # web用出力
+
+    @property
+    def iframe_log(self) -> list: ...       # iframe用分割
+
+    def get_output_counters(self) -> dict: ...
+
+
+@dataclass
+class ConversionResult:
+    """ ConversionResult
+        機能：ログ変換1回分の結果（変換後ログ、発言者、処理時間）
+    """
+    input_path:         str                                     # ココフォリアのログのパス
+    output_path:        str                                     # 変換後のログを出力したパス
+    converted_log:      ConvertedLogProtocol                    # 変換後ログ（web用・iframe用は参照した時に作成する）
+    total_length:       int                                     # 変換後ログの文字数
+    unknown_characters: list = field(default_factory=list)      # 未設定の発言者リスト
+    use_classes:        list = field(default_factory=list)      # 登場した発言者リスト
+    elapsed:            float = 0.0                             # 変換にかかった秒数
+    stage_times:        dict = field(default_factory=dict)      # 処理段階ごとの秒数
+    counters:           dict = field(default_factory=dict)      # 件数・サイズ
+
+
+    @property
+    def privatter_log(self) -> str:
+        """ privatter_log
+            機能：通常変換
+        """
+        return self.converted_log.privatter_log
+
+
+    @property
+    def web_log(self) -> str:
+        """ web_log
+            機能：web用出力（初回のみ作成する）
+        """
+        return self.converted_log.web_log
+
+
+    @property
+    def style_tag_text(self) -> str:
+        """ style_tag_text
+            機能：web用・iframe用のstyleタグ（web用変換が無効な場合は空）
+        """
+        return self.converted_log.style_tag_text
+
+
+    @property
+    def iframe_logs(self) -> list:
+        """ iframe_logs
+            機能：iframe用分割（初回のみ作成する）
+        """
+        return self.converted_log.iframe_log
+
+
+    def get_metrics(self) -> tuple[dict, dict]:
+        """ get_metrics
+            機能：処理段階ごとの秒数と件数を取得する（web用・iframe用の作成と文字数を含む）
+                ※web用変換が有効な場合は、web用・iframe用を作成してから数える
+
+        Returns:
+            tuple[dict, dict]: 処理段階ごとの秒数 / 件数・サイズ
+        """
+        counters = {**self.counters, **self.converted_log.get_output_counters()}
+        stage_times = {**self.stage_times, **self.converted_log.render_times}
+        return stage_times, counters
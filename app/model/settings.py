@@ -18,6 +18,13 @@ class ConfigKey:
     MAX_LOG_BYTE_SIZE           = "max_log_byte_size"
     DEBUG_MODE                  = "debug_mode"
     DEBUG_MAX_TRACE_LINES       = "debug_max_trace_lines"
+    PARSER_BACKEND              = "parser_backend"
+    PARSE_CACHE_MAX_BYTE_SIZE   = "parse_cache_max_byte_size"
+    BATCH_WORKER_COUNT          = "batch_worker_count"
+    PARALLEL_PARSE_MIN_LENGTH   = "parallel_parse_min_length"
+    PARSE_WORKER_COUNT          = "parse_worker_count"
+    PROFILE_MODE                = "profile_mode"
+    PROFILE_TOP_ALLOCATIONS     = "profile_top_allocations"
 
     # ConverterConfig
     USE_DEFAULT_SETTING         = "use_default_setting"
@@ -88,6 +95,23 @@ PREVIEW_CONFIG = [
 CONVERT_CONFIG = GENERAL_CONFIG + PRIVATTERPLUS_CONFIG + DEVELOPER_CONFIG + PREVIEW_CONFIG
 
 
+@dataclass
+class MessageReplaceRule:
+    """ MessageReplaceRule
+        機能：発言内容の置換ルール
+    """
+    key:    str     # ルールを有効にする変換設定のキー
+    old:    str     # 置換前の文字列
+    new:    str     # 置換後の文字列
+
+# 発言内容の置換ルール（上から順に適用する）
+MESSAGE_REPLACE_RULES = [
+    MessageReplaceRule(ConfigKey.CONVERT_QUOTATION, "。」", "」"),
+    MessageReplaceRule(ConfigKey.CONVERT_ASTERISK,  "*",    "＊"),
+    MessageReplaceRule(ConfigKey.CONVERT_WAVE,      "~",    "～"),
+]
+
+
 @dataclass
 class CharacterConfig:
     """ CharacterConfig
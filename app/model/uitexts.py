@@ -20,6 +20,14 @@ class TextKey:
     CONVERT_BUTTON          = "convert_button"
     COPY_TEXT_BUTTON        = "copy_text_button"
     CHARACTER_COUNT_LABEL   = "character_count_label"
+    CANCEL_BUTTON           = "cancel_button"
+    PARSE_PROGRESS_LABEL    = "parse_progress_label"
+    CONVERTING_LABEL        = "converting_label"
+    READING_LABEL           = "reading_label"
+    APPLYING_CONFIG_LABEL   = "applying_config_label"
+    RENDERING_LABEL         = "rendering_label"
+    WRITING_LABEL           = "writing_label"
+    CANCELLED_LABEL         = "cancelled_label"
 
     # 変換設定
     PRIVATTER_PLUS_SETTINGS         = "privatter_plus_settings"
@@ -51,11 +59,16 @@ class TextKey:
     BACKGROUND_COLOR_LABEL  = "background_color_label"
     UPDATE_LOG_BUTTON       = "update_log_button"
     MISSING_LOG_MESSAGE     = "missing_log_message"
+    PREVIEW_OUTPUT_LABEL    = "preview_output_label"
+    PRIVATTER_LOG_LABEL     = "privatter_log_label"
 
     # 開発者向け
     WEB_LOG_LABEL           = "web_log_label"
     IFRAME_LOG_LABEL        = "iframe_log_label"
     COPY_LABEL              = "copy_label"
+    METRICS_LABEL           = "metrics_label"
+    METRICS_NAME_COLUMN     = "metrics_name_column"
+    METRICS_VALUE_COLUMN    = "metrics_value_column"
 
     # ダイアログ
     WARNING_DIALOG_TITLE        = "warning_dialog_title"
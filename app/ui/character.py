@@ -1,28 +1,53 @@
 """ character.py
     機能：キャラ設定画面
+        ※表示している行の分だけウィジェットを作り、スクロールしたら表示する設定を入れ替える（行数が多くても重くならない）
 """
 import tkinter as tk
+from dataclasses import dataclass, field
 from tkinter import messagebox, ttk
 from typing import Any, Dict, List, Optional
 
-from app.logic import globals
 from app.logic.processor import load_character_config, save_character_config
+from app.model.character import CharacterRow, CharacterRowList
 from app.model.settings import CHARACTER_CONFIG, ConfigKey
 from app.model.uitexts import TextKey
 from app.ui.utils.colorselector import create_color_selector
-from app.ui.utils.interface import (bind_canvas_mousewheel, on_mousewheel,
-                                    unbind_canvas_mousewheel,
-                                    update_scrollregion)
 from system.ja import TEXTS
-from system.resources import ResourcesKey
+
+"""
+定数定義
+"""
+HEADER_ROW          = 0     # ヘッダーの行番号（設定行はその下から）
+ROW_HEIGHT          = 30    # 1行の高さの初期値（表示後に実際の高さを測る）
+INITIAL_VISIBLE     = 10    # 画面サイズが決まる前に表示する行数
+WHEEL_SCROLL_ROWS   = 3     # マウスホイール1回でスクロールする行数
+BLANK_ROW_COUNT     = 5     # 読み込んだ設定の後に追加する空行の数
+# 行ウィジェットのキー（設定項目以外）
+UP_BUTTON       = "up_button"
+DOWN_BUTTON     = "down_button"
+DELETE_BUTTON   = "delete_button"
+
+
+
+@dataclass(eq=False)
+class CharacterRowWidgets:
+    """ CharacterRowWidgets
+        機能：画面に表示する1行分のウィジェット（表示する行を入れ替えて使いまわす）
+    """
+    vars: dict = field(default_factory=dict)        # 設定項目ごとのUI用変数
+    widgets: dict = field(default_factory=dict)     # 設定項目・ボタンごとのウィジェット
+    row: Optional[CharacterRow] = None              # 表示している行（表示していない場合はNone）
+
 
 
 class CharacterTab:
     def __init__(self, parent):
         self.parent = parent
-        self._character_config = []
+        self._rows = CharacterRowList(INITIAL_VISIBLE)  # キャラ設定（全行と表示している範囲）
+        self._pool = []                     # 表示用の行ウィジェット
+        self._row_height = ROW_HEIGHT
+        self._binding = False               # 行ウィジェットに設定値を反映中（保存しない）
 
-        # スクロール可能なキャンバスの構成
         parent.grid_rowconfigure(0, weight=1)
         parent.grid_columnconfigure(0, weight=1)
 
@@ -34,44 +59,25 @@ class CharacterTab:
         outer_frame.grid_rowconfigure(0, weight=1)
         outer_frame.grid_columnconfigure(0, weight=1)
 
-        self.canvas = tk.Canvas(
-            outer_frame,
-            height=50,              # ウィジェットが無かった時のために一応設定
-            highlightthickness=0,   # フォーカス枠を非表示
-            bd=0,                   # 枠線を非表示
-            relief="flat"           # 立体感なし
-        )
-        self.canvas.grid(row=0, column=0, sticky="nsew")
+        # frame_character：メインフレーム作成（行数で画面サイズが変わらないように、中身に合わせて伸縮させない）
+        self.frame_character = ttk.Frame(outer_frame, padding=(10, 0))
+        self.frame_character.grid(row=0, column=0, sticky="nsew")
+        self.frame_character.grid_propagate(False)
 
         # スクロールバー（縦）
-        scrollbar = ttk.Scrollbar(outer_frame, orient="vertical", command=self.canvas.yview)
-        scrollbar.grid(row=0, column=1, sticky="ns")
-        self.canvas.configure(yscrollcommand=scrollbar.set)
+        self.scrollbar = ttk.Scrollbar(outer_frame, orient="vertical", command=self.on_scrollbar)
+        self.scrollbar.grid(row=0, column=1, sticky="ns")
 
-        # ホイール操作を有効にする
-        self.canvas.bind("<Enter>", lambda e: self.canvas.focus_set())
-        self.canvas.bind_all("<MouseWheel>", lambda e: on_mousewheel(self.canvas, e))
+        # 行追加ボタン（表の下に固定）
+        self.add_btn = ttk.Button(outer_frame, text=TEXTS[TextKey.ADD_ROW_LABEL], command=self.click_add_row)
+        self.add_btn.grid(row=1, column=0, padx=14, pady=10, ipadx=4, ipady=10, sticky="w")
 
-        self.canvas.bind("<Enter>", lambda e: bind_canvas_mousewheel(self.canvas))
-        self.canvas.bind("<Leave>", lambda e: unbind_canvas_mousewheel(self.canvas))
-
-        # frame_character：メインフレーム作成
-        self.frame_character = ttk.Frame(self.canvas, padding=(10, 0))
-
-        #for i in range(2):  # ↑と↓ボタンの列
-        #    self.frame_character.grid_columnconfigure(i, weight=0, minsize=1)
-
-        # キャンバス上に描画
-        self.canvas.create_window(
-            (0, 0),
-            window=self.frame_character,
-            anchor="nw",
-            tags="frame_window"
-        )
+        # ホイール操作を有効にする
+        outer_frame.bind("<Enter>", lambda e: outer_frame.bind_all("<MouseWheel>", self.on_mousewheel))
+        outer_frame.bind("<Leave>", lambda e: outer_frame.unbind_all("<MouseWheel>"))
 
-        # サイズ変更やレイアウト変更時に再配置する
-        self.canvas.bind("<Configure>", lambda e: self.canvas.itemconfig("frame_window", width=e.width))
-        self.frame_character.bind("<Configure>", lambda e: update_scrollregion(self.canvas, self.frame_character, e))
+        # サイズ変更時に表示する行数を更新する
+        self.frame_character.bind("<Configure>", self.on_resize)
 
         # ヘッダーの描画
         self.build_header()
@@ -79,9 +85,6 @@ class CharacterTab:
         # 設定値読み込み
         load_default_cfg_data, load_character_cfg_data = load_character_config()
 
-        # ウィジェットの削除
-        self.clear_all()
-
         # デフォルト行の追加
         self.add_row(initial_values=load_default_cfg_data, is_default=True)
 
@@ -90,11 +93,11 @@ class CharacterTab:
             self.add_row(initial_values=character_config)
 
         # 読み込んだデータから5行追加
-        for _ in range(5):
+        for _ in range(BLANK_ROW_COUNT):
             self.add_row()
 
-        # 行追加ボタンを追加
-        self.update_add_row_button()
+        # 表示する行のウィジェットを作成
+        self.refresh_rows()
 
 
     def build_header(self):
@@ -104,244 +107,269 @@ class CharacterTab:
         col_num = 0
 
         # 列移動ラベル（列0〜1をまたぐ）
-        ttk.Label(self.frame_character, text=TEXTS[TextKey.SWAP_ROW_LABEL], padding=4, anchor="center").grid(row=0, column=col_num, columnspan=2, sticky="we")
+        self.header_label = ttk.Label(self.frame_character, text=TEXTS[TextKey.SWAP_ROW_LABEL], padding=4, anchor="center")
+        self.header_label.grid(row=HEADER_ROW, column=col_num, columnspan=2, sticky="we")
         col_num += 2
 
         for character_config in CHARACTER_CONFIG:
             # フレームにラベル追加
-            ttk.Label(self.frame_character, text=TEXTS[character_config.label], padding=4).grid(row=0, column=col_num, sticky="")
+            ttk.Label(self.frame_character, text=TEXTS[character_config.label], padding=4).grid(row=HEADER_ROW, column=col_num, sticky="")
             col_num += 1
 
         # 削除ラベルの追加
-        ttk.Label(self.frame_character, text=TEXTS[TextKey.DELETE_ROW_LABEL]).grid(row=0, column=col_num, sticky="")
+        ttk.Label(self.frame_character, text=TEXTS[TextKey.DELETE_ROW_LABEL]).grid(row=HEADER_ROW, column=col_num, sticky="")
 
 
-    def add_row(self, initial_values: Optional[Dict[str, Any]] = None, is_default: bool = False):
+    def add_row(self, initial_values: Optional[Dict[str, Any]] = None, is_default: bool = False) -> CharacterRow:
         """ add_row
             機能：設定行を追加する。空行の追加ができるように引数は自由にしておく
+                ※画面は更新しないため、追加し終わったらrefresh_rowsを呼ぶ
 
         Args:
             initial_values (Optional[Dict[str, Any]], optional): キャラ設定. Defaults to None.
             is_default (bool, optional): デフォルト行かどうか. Defaults to False.
+
+        Returns:
+            CharacterRow: 追加した行
         """
-        # 追加されている設定項目の数から行番号を取得
-        row = len(self._character_config) + 1
-        row_vars = {}
-        widgets = []
-        index = len(self._character_config)
-        col_num = 0
+        return self._rows.add_row(initial_values, is_default)
 
-        # 行移動ボタンの追加
-        if not is_default:
-            # ↑ボタン
-            up_btn = ttk.Button(self.frame_character, text="↑", width=2, command=lambda idx=index: self.move_row_up(idx))
-            up_btn.grid(row=row, column=col_num, padx=1)
-            col_num += 1
 
-            # ↓ボタン
-            down_btn = ttk.Button(self.frame_character, text="↓", width=2, command=lambda idx=index: self.move_row_down(idx))
-            down_btn.grid(row=row, column=col_num, padx=1)
-            col_num += 1
+    def create_row_widgets(self) -> CharacterRowWidgets:
+        """ create_row_widgets
+            機能：表示用の行ウィジェットを1行分作成する
+
+        Returns:
+            CharacterRowWidgets: 作成した行ウィジェット
+        """
+        row = len(self._pool) + HEADER_ROW + 1
+        row_widgets = CharacterRowWidgets()
+        widgets = row_widgets.widgets
+        col_num = 0
+
+        # 行移動ボタンの追加（押した時に表示している行を移動する）
+        widgets[UP_BUTTON] = ttk.Button(self.frame_character, text="↑", width=2, command=lambda: self.move_row_up(row_widgets.row))
+        widgets[UP_BUTTON].grid(row=row, column=col_num, padx=1)
+        col_num += 1
 
-            widgets.extend([up_btn, down_btn])
-        else:
-            col_num += 2    # デフォルト行の場合は場所を空ける
+        widgets[DOWN_BUTTON] = ttk.Button(self.frame_character, text="↓", width=2, command=lambda: self.move_row_down(row_widgets.row))
+        widgets[DOWN_BUTTON].grid(row=row, column=col_num, padx=1)
+        col_num += 1
 
         # 列にウィジェットを追加
         for setting in CHARACTER_CONFIG:
-            if initial_values is not None:
-                # initial_valuesがあれば、そのキーから値を取得（なければデフォルト）
-                value = initial_values.get(setting.key, setting.default)
-            else:
-                # initial_valuesが無ければ、デフォルトを使う
-                value = setting.default
-
             # 文字列項目の場合
             if setting.config_type == "str":
-                var = tk.StringVar(value=value)
+                var = tk.StringVar(value=setting.default)
                 if setting.key == ConfigKey.COLOR_CODE:
                     # カラーコードのみカラーピッカーを含めたウィジェットを追加する
                     create_color_selector(self.frame_character, row, col_num, var)
-                    widgets.append(self.frame_character.grid_slaves(row=row, column=col_num)[0])
+                    widgets[setting.key] = self.frame_character.grid_slaves(row=row, column=col_num)[0]
                 else:
-                    entry = ttk.Entry(self.frame_character, textvariable=var, width=12, takefocus=False)
-                    entry.grid(row=row, column=col_num, padx=2, pady=2, sticky="nsew")
-
-                    # Default行の場合入力を受け付けない
-                    if is_default and setting.key == ConfigKey.CHARACTER:
-                        entry.configure(state="readonly")
-                    widgets.append(entry)
+                    widgets[setting.key] = ttk.Entry(self.frame_character, textvariable=var, width=12, takefocus=False)
+                    widgets[setting.key].grid(row=row, column=col_num, padx=2, pady=2, sticky="nsew")
             # チェックボックス項目の場合
             elif setting.config_type == "bool":
-                var = tk.BooleanVar(value=value)
-                check = ttk.Checkbutton(
+                var = tk.BooleanVar(value=setting.default)
+                widgets[setting.key] = ttk.Checkbutton(
                     self.frame_character,
                     variable=var,
                     text="",             # 明示的にtextを空にしておく
                     takefocus=False      # フォーカス枠を抑制
                 )
-                # デフォルト行は着色を有効にする
-                if is_default and setting.key == ConfigKey.ENABLE_PAINT:
-                    var.set(True)
-                    check.configure(state="disabled")
-
-                check.grid(row=row, column=col_num, sticky="", padx=2)
-                widgets.append(check)
+                widgets[setting.key].grid(row=row, column=col_num, sticky="", padx=2)
             else:
                 continue
 
-            def change_character_config_var(*_):
+            def change_character_config_var(*_, key=setting.key, var=var):
                 """ change_character_config_var
-                    機能：設定が変更されたら設定ファイルに保存する
+                    機能：設定が変更されたら、表示している行の設定値を更新して設定ファイルに保存する
                 """
+                if self._binding or row_widgets.row is None:
+                    return
+                row_widgets.row.values[key] = var.get()
                 save_character_config(self.get_character_config_from_vars())
 
             var.trace_add("write", change_character_config_var)
-            row_vars[setting.key] = var
+            row_widgets.vars[setting.key] = var
 
             col_num += 1    # 列番号の加算
 
-        # デフォルト行以外は削除ボタンを追加する
-        if not is_default:
-            index = len(self._character_config)
-            delete_btn = ttk.Button(
-                self.frame_character,
-                text="🗑️",
-                width=3,
-                command=lambda idx=index: self.click_remove_row(idx)
-            )
-            delete_btn.grid(row=row, column=col_num, padx=4)
-            widgets.append(delete_btn)
-            col_num += 1
+        # 削除ボタンを追加する
+        widgets[DELETE_BUTTON] = ttk.Button(
+            self.frame_character,
+            text="🗑️",
+            width=3,
+            command=lambda: self.click_remove_row(row_widgets.row)
+        )
+        widgets[DELETE_BUTTON].grid(row=row, column=col_num, padx=4)
 
-        self._character_config.append({"values": row_vars, "widgets": widgets})
+        self._pool.append(row_widgets)
+        return row_widgets
 
-        # 行追加ボタンを更新する
-        self.update_add_row_button()
 
+    def bind_row_widgets(self, row_widgets: CharacterRowWidgets, character_row: Optional[CharacterRow]):
+        """ bind_row_widgets
+            機能：行ウィジェットに表示する行を設定する
 
-    def click_remove_row(self, index: int):
-        """ confirm_and_remove
-            クリック：行を削除する
+        Args:
+            row_widgets (CharacterRowWidgets): 行ウィジェット
+            character_row (Optional[CharacterRow]): 表示する行（Noneの場合はウィジェットを隠す）
         """
-        if messagebox.askyesno(TEXTS[TextKey.CHECK_DIALOG_TITLE], TEXTS[TextKey.REMOVE_ROW_MESSAGE]):
-            self.remove_row(index)
+        row_widgets.row = character_row
+        widgets = row_widgets.widgets
+
+        # 表示する行が無い場合は隠す
+        if character_row is None:
+            for widget in widgets.values():
+                widget.grid_remove()
+            return
+
+        for widget in widgets.values():
+            widget.grid()
+
+        # 設定値をUI用変数に反映する（反映中は保存しない）
+        self._binding = True
+        try:
+            for key, var in row_widgets.vars.items():
+                var.set(character_row.values[key])
+        finally:
+            self._binding = False
+
+        # デフォルト行は移動・削除できず、キャラクター名と着色は変更できない
+        is_default = character_row.is_default
+        if is_default:
+            for key in (UP_BUTTON, DOWN_BUTTON, DELETE_BUTTON):
+                widgets[key].grid_remove()
+        widgets[ConfigKey.CHARACTER].configure(state="readonly" if is_default else "normal")
+        widgets[ConfigKey.ENABLE_PAINT].configure(state="disabled" if is_default else "normal")
+
+
+    def refresh_rows(self):
+        """ refresh_rows
+            機能：表示している位置の行を、行ウィジェットに反映する
+        """
+        # 表示できる行数分の行ウィジェットを用意する
+        while len(self._pool) < self._rows.visible_count:
+            self.create_row_widgets()
 
+        for row_widgets, character_row in zip(self._pool, self._rows.get_visible_rows(len(self._pool))):
+            self.bind_row_widgets(row_widgets, character_row)
 
-    def remove_row(self, index):
-        """ remove_row
-            機能：行を削除する
+        # スクロールバーのつまみの位置と大きさ
+        self.scrollbar.set(*self._rows.get_scroll_fraction())
+
+
+    def scroll_to(self, top: int):
+        """ scroll_to
+            機能：指定した行が先頭になるようにスクロールする
 
         Args:
-            index (int): 削除する行番号
+            top (int): 先頭に表示する行番号
         """
-        for widget in self._character_config[index]["widgets"]:
-            widget.destroy()
-        del self._character_config[index]
-        # 画面を再構築する
-        self.rebuild_all_rows()
+        if self._rows.scroll_to(top):
+            self.refresh_rows()
 
-        # 削除後のキャラ設定で設定ファイルを更新
-        save_character_config(self.get_character_config_from_vars())
 
+    def on_scrollbar(self, action: str, value: str, unit: Optional[str] = None):
+        """ on_scrollbar
+            操作：スクロールバーの操作
 
-    def rebuild_all_rows(self):
-        """ rebuild_all_rows
-            機能：キャラ設定項目の再構築
+        Args:
+            action (str): "moveto"（つまみのドラッグ）または "scroll"（矢印・余白のクリック）
+            value (str): 移動先の位置（0～1）またはスクロール量
+            unit (Optional[str], optional): スクロールの単位（"units" または "pages"）. Defaults to None.
         """
-        default_row_flag = 0
-        data: list = self.get_character_config_from_vars()
-        # 画面削除
-        self.clear_all()
-        # 行追加（デフォルト行と追加処理を分ける）
-        for i, item in enumerate(data):
-            if item.get("character") == globals.RESOURCES[ResourcesKey.CHARACTER_DEFAULT_NAME] and default_row_flag == 0:
-                self.add_row(initial_values=item, is_default=True)
-                default_row_flag = 1        # 一応デフォルト行設定は1行のみになるようにしておくか…
-            else:
-                self.add_row(initial_values=item)
+        if action == "moveto":
+            self.scroll_to(round(float(value) * len(self._rows)))
+        elif action == "scroll":
+            step = self._rows.visible_count if unit == "pages" else 1
+            self.scroll_to(self._rows.top + int(value) * step)
 
-        # 読み込んだデータから5行追加
-        for _ in range(5):
-            self.add_row()
 
-        # 行追加ボタンを追加
-        self.update_add_row_button()
+    def on_mousewheel(self, event):
+        """ on_mousewheel
+            ホイール：マウスホイール動作
+        """
+        self.scroll_to(self._rows.top - int(event.delta / 120) * WHEEL_SCROLL_ROWS)
 
-        # 並び順を含めて保存する
-        save_character_config(self.get_character_config_from_vars())
 
+    def on_resize(self, event):
+        """ on_resize
+            機能：画面の高さから表示できる行数を計算し、表示を更新する
+        """
+        # 表示済みの行から1行の高さを測る
+        bbox = self.frame_character.grid_bbox(0, HEADER_ROW + 1)
+        if bbox and bbox[3] > 1:
+            self._row_height = bbox[3]
+
+        header_height = self.header_label.winfo_reqheight()
+        visible_count = max(1, (event.height - header_height) // self._row_height)
+        if visible_count != self._rows.visible_count:
+            self._rows.visible_count = visible_count
+            self.refresh_rows()
 
-    def update_add_row_button(self):
-        """ update_add_row_button
-            機能：行追加ボタンの更新
+
+    def click_add_row(self):
+        """ click_add_row
+            クリック：空行を追加して、最後の行までスクロールする
+        """
+        self.add_row()
+        self._rows.top = len(self._rows)
+        self.refresh_rows()
+
+
+    def click_remove_row(self, character_row: CharacterRow):
+        """ confirm_and_remove
+            クリック：行を削除する
         """
-        # すでに存在している場合は破棄して再配置
-        if hasattr(self, "add_btn") and self.add_btn.winfo_exists():
-            self.add_btn.destroy()
+        if messagebox.askyesno(TEXTS[TextKey.CHECK_DIALOG_TITLE], TEXTS[TextKey.REMOVE_ROW_MESSAGE]):
+            self.remove_row(character_row)
 
-        self.add_btn = ttk.Button(self.frame_character, text=TEXTS[TextKey.ADD_ROW_LABEL], command=self.add_row)
-        # ヘッダーが row=0のため
-        row = len(self._character_config) + 1
-        self.add_btn.grid(row=row, column=0, columnspan=3, padx=4, pady=10, ipadx=4, ipady=10, sticky="w")
 
+    def remove_row(self, character_row: CharacterRow):
+        """ remove_row
+            機能：行を削除する（表示している行だけ更新する）
 
-    def clear_all(self):
-        """ clear_all
-            機能：フレーム内のウィジェットを削除する
+        Args:
+            character_row (CharacterRow): 削除する行
         """
-        for widget in self.frame_character.winfo_children():
-            widget.destroy()
-        self._character_config.clear()
-        # ヘッダーは描画する
-        self.build_header()
+        self._rows.remove_row(character_row)
+        self.refresh_rows()
+
+        # 削除後のキャラ設定で設定ファイルを更新
+        save_character_config(self.get_character_config_from_vars())
 
 
     def get_character_config_from_vars(self) -> List[Dict[str, Any]]:
         """ get_character_config_from_vars
-            機能：UI用変数から設定値を取得する
+            機能：キャラ設定の設定値を取得する
 
         Returns:
             List[Dict[str, Any]: 設定値
         """
-        result = []
-        for character_config in self._character_config:
-            item = {}
-            for key, var in character_config["values"].items():
-                item[key] = var.get()
-
-            # キャラクターの記入がない場合はスキップ
-            if item.get(ConfigKey.CHARACTER, "").strip():
-                result.append(item)
+        return self._rows.get_character_config()
 
-        return result
 
-
-    def move_row_up(self, index: int):
+    def move_row_up(self, character_row: CharacterRow):
         """ move_row_up
-            機能：行を上に移動する
+            機能：行を上に移動する（表示している行だけ更新し、並び順を含めて保存する）
 
         Args:
-            index (int): 移動対象の行番号
+            character_row (CharacterRow): 移動対象の行
         """
-        # 最上段以外の時
-        if index > 0:
-            # スワップ
-            self._character_config[index], self._character_config[index - 1] = \
-                self._character_config[index - 1], self._character_config[index]
-            self.rebuild_all_rows()
+        if self._rows.move_row_up(character_row):
+            self.refresh_rows()
+            save_character_config(self.get_character_config_from_vars())
 
 
-    def move_row_down(self, index: int):
-        """ move_row_up
-            機能：行を下に移動する
+    def move_row_down(self, character_row: CharacterRow):
+        """ move_row_down
+            機能：行を下に移動する（表示している行だけ更新し、並び順を含めて保存する）
 
         Args:
-            index (int): 移動対象の行番号
+            character_row (CharacterRow): 移動対象の行
         """
-        # 最下段以外の時
-        if index < len(self._character_config) - 1:
-            # スワップ
-            self._character_config[index], self._character_config[index + 1] = \
-                self._character_config[index + 1], self._character_config[index]
-            self.rebuild_all_rows()
+        if self._rows.move_row_down(character_row):
+            self.refresh_rows()
+            save_character_config(self.get_character_config_from_vars())
@@ -3,21 +3,29 @@
 """
 import tkinter as tk
 from tkinter import ttk
-from typing import Callable
+from typing import Callable, Optional
 
+from app.logic.observer import get_metrics_rows
+from app.model.result import ConversionResult
 from app.model.uitexts import TextKey
-from app.ui.utils.interface import (bind_canvas_mousewheel,
-                                    copy_text_to_clipboard, on_mousewheel,
-                                    unbind_canvas_mousewheel,
+from app.ui.utils.interface import (bind_canvas_mousewheel, copy_to_clipboard,
+                                    on_mousewheel, unbind_canvas_mousewheel,
                                     update_canvas_width, update_scrollregion)
 from system.ja import TEXTS
 
+"""
+定数定義
+"""
+METRICS_TABLE_HEIGHT = 16      # 処理時間・件数の表の行数
+
+
 
 class DeveloperTab:
-    def __init__(self, parent, get_web_log_callback: Callable[[], str], get_iframe_logs_callback: Callable[[], list[str]]):
+    def __init__(self, parent, get_result_callback: Callable[[], Optional[ConversionResult]]):
         self.parent = parent
-        self.get_web_log_callback = get_web_log_callback
-        self.get_iframe_logs_callback = get_iframe_logs_callback
+        self.get_result_callback = get_result_callback
+        self._web_log = ""          # 表示しているwebログ（コピーはテキストエリアではなくここから）
+        self._iframe_logs = []      # 表示しているiframeログ
 
         # スクロール可能なキャンバスの構成
         parent.grid_rowconfigure(0, weight=1)
@@ -115,23 +123,45 @@ class DeveloperTab:
         # 初期状態で1行分だけ追加
         self.add_iframe_logs_row(count=1)
 
+        # 処理時間・件数フレーム
+        metrics_frame = ttk.LabelFrame(self.frame_developer, text=TEXTS[TextKey.METRICS_LABEL], padding=(10, 5, 10, 10))
+        metrics_frame.grid(row=3, column=0, sticky="ew", pady=(10, 10))
+        metrics_frame.grid_columnconfigure(0, weight=1)
+
+        # 処理段階ごとの秒数と件数の表
+        self.metrics_table = ttk.Treeview(
+            metrics_frame,
+            columns=("name", "value"),
+            show="headings",
+            height=METRICS_TABLE_HEIGHT,
+            selectmode="none"
+        )
+        self.metrics_table.heading("name", text=TEXTS[TextKey.METRICS_NAME_COLUMN], anchor="w")
+        self.metrics_table.heading("value", text=TEXTS[TextKey.METRICS_VALUE_COLUMN], anchor="e")
+        self.metrics_table.column("name", anchor="w")
+        self.metrics_table.column("value", anchor="e")
+        self.metrics_table.grid(row=0, column=0, sticky="ew", padx=(5, 0), pady=5)
+
 
     def update_text(self):
         """ update_text
             機能：webログ、iframeログを取得して画面に反映する
         """
-        web_log = self.get_web_log_callback()
-        iframe_logs = self.get_iframe_logs_callback()
+        result = self.get_result_callback()
+        web_log = result.web_log if result else ""
+        iframe_logs = result.iframe_logs if result else []
 
-        # 中身が空の場合、メッセージを表示
+        # 中身が空の場合、メッセージを表示（変換結果は書き換えない）
         if not web_log:
             web_log = TEXTS[TextKey.MISSING_LOG_MESSAGE]
-            iframe_logs.append(TEXTS[TextKey.MISSING_LOG_MESSAGE])
+            iframe_logs = iframe_logs + [TEXTS[TextKey.MISSING_LOG_MESSAGE]]
+        self._web_log = web_log.strip()
+        self._iframe_logs = [iframe_log.strip() for iframe_log in iframe_logs]
 
         # Webログ更新
         self.web_log_text_area.config(state="normal")
         self.web_log_text_area.delete("1.0", tk.END)
-        self.web_log_text_area.insert(tk.END, web_log.strip())
+        self.web_log_text_area.insert(tk.END, self._web_log)
         self.web_log_text_area.config(state="disabled")
 
         # iframeログ更新
@@ -142,9 +172,16 @@ class DeveloperTab:
             if i < len(iframe_logs):
                 text_widget.config(state="normal")
                 text_widget.delete("1.0", tk.END)
-                text_widget.insert(tk.END, iframe_logs[i].strip())
+                text_widget.insert(tk.END, self._iframe_logs[i])
                 text_widget.config(state="disabled")
 
+        # 処理時間・件数の更新（web用・iframe用の作成時間と文字数を含む）
+        self.metrics_table.delete(*self.metrics_table.get_children())
+        if result:
+            stage_times, counters = result.get_metrics()
+            for row in get_metrics_rows(stage_times, counters):
+                self.metrics_table.insert("", tk.END, values=row)
+
 
     def clear_iframe_logs(self):
         """ clear_iframe_logs
@@ -177,7 +214,7 @@ class DeveloperTab:
                 self.iframe_logs_container,
                 text=TEXTS[TextKey.COPY_LABEL],
                 takefocus=False,
-                command=lambda t=text: self.copy_text(t)
+                command=lambda i=i: self.copy_iframe_log(i)
             )
             button.grid(row=i, column=1, sticky="e", padx=(5, 10))
             self.iframe_log_widgets.append((text, button))
@@ -187,11 +224,15 @@ class DeveloperTab:
         """ copy_web_log
             機能：webログのコピー
         """
-        self.copy_text(self.web_log_text_area)
+        copy_to_clipboard(self.parent, self._web_log)
 
 
-    def copy_text(self, text_widget):
-        """ copy_text
-            機能：クリップボードへのコピー
+    def copy_iframe_log(self, index: int):
+        """ copy_iframe_log
+            機能：iframeログのコピー
+
+        Args:
+            index (int): iframeログの番号
         """
-        copy_text_to_clipboard(self.parent, text_widget)
+        if index < len(self._iframe_logs):
+            copy_to_clipboard(self.parent, self._iframe_logs[index])
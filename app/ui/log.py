@@ -2,16 +2,25 @@
     機能：ログ変換画面
 """
 import os
+import queue
+import threading
+import time
 import tkinter as tk
 import tkinter.messagebox as messagebox
 from tkinter import filedialog, ttk
 
 from app.logic import globals
+from app.logic.cache import ParseCache
 from app.logic.fileio import get_executable_path, open_file
-from app.logic.processor import check_valid_color_code, convert_log
+from app.logic.observer import (CompositeObserver, ConvertObserver,
+                                ConvertStage, StageRecorder)
+from app.logic.processor import (ConvertCancelledError,
+                                 check_valid_color_code, convert_log)
+from app.model.result import ConversionResult
 from app.model.settings import ConfigKey
 from app.model.uitexts import TextKey
-from app.ui.utils.interface import copy_text_to_clipboard
+from app.ui.utils.interface import copy_to_clipboard
+from app.ui.utils.textloader import TextLoader, iter_text_chunks
 from system.ja import TEXTS
 from system.resources import OUTPUT_DIR_NAME, OUTPUT_FILE_NAME, ResourcesKey
 
@@ -23,6 +32,39 @@ ENTRY_WIDTH         = 60
 FRAME_PADDING       = 10
 BUTTON_WIDTH        = 20
 BUTTON_HEIGHT       = 10
+PROGRESS_MAXIMUM    = 1000      # 進捗バーの最大値
+POLL_INTERVAL_MS    = 50        # 変換の進捗を確認する間隔（ミリ秒）
+# 変換スレッドからの通知の種類
+JOB_STAGE       = "stage"
+JOB_PROGRESS    = "progress"
+JOB_DONE        = "done"
+JOB_CANCELLED   = "cancelled"
+# 処理段階の開始時の進捗バーの位置（解析は0～0.8の間で進む）と表示
+STAGE_PROGRESS = {
+    ConvertStage.READ:          (0.0,   TextKey.READING_LABEL),
+    ConvertStage.PARSE:         (0.0,   TextKey.PARSE_PROGRESS_LABEL),
+    ConvertStage.APPLY_CONFIG:  (0.8,   TextKey.APPLYING_CONFIG_LABEL),
+    ConvertStage.RENDER:        (0.9,   TextKey.RENDERING_LABEL),
+    ConvertStage.WRITE:         (0.95,  TextKey.WRITING_LABEL),
+}
+PARSE_PROGRESS_RATE = 0.8
+
+
+
+class QueueObserver(ConvertObserver):
+    """ QueueObserver
+        機能：変換スレッドから画面に変換の経過を渡す（画面はafter()で受け取る）
+    """
+    def __init__(self, job_queue: queue.Queue):
+        self._job_queue = job_queue
+
+
+    def on_stage_start(self, stage: str):
+        self._job_queue.put((JOB_STAGE, stage))
+
+
+    def on_progress(self, stage: str, chat_count: int, done_length: int, total_length: int):
+        self._job_queue.put((JOB_PROGRESS, (chat_count, done_length, total_length)))
 
 
 
@@ -34,6 +76,11 @@ class LogTab:
         self.parent = parent
         self.config_tab = config_tab
         self.character_tab = character_tab
+        self._parse_cache = ParseCache()    # 解析結果（入力ファイルが変わらない間は再解析しない）
+        self._job_thread = None             # 変換中のスレッド（変換中でなければNone）
+        self._job_queue = None              # 変換スレッドからの通知
+        self._cancel_event = None           # 変換の中断の指示
+        self._result = None                 # 最後に成功した変換の結果（テキストエリアは書き込み途中の場合がある）
         parent.grid_rowconfigure(0, weight=1)
         parent.grid_columnconfigure(0, weight=1)
 
@@ -120,6 +167,25 @@ class LogTab:
         )
         self.copy_button.grid(row=0, column=1, padx=5, pady=10, ipady=BUTTON_HEIGHT)
 
+        # 中断ボタン（変換中のみ有効）
+        self.cancel_button = ttk.Button(
+            f_button_center,
+            text=TEXTS[TextKey.CANCEL_BUTTON],
+            command=self.click_cancel_convert,
+            state="disabled",
+            takefocus=False
+        )
+        self.cancel_button.grid(row=0, column=2, padx=5, pady=10, ipady=BUTTON_HEIGHT)
+
+        # 進捗バー
+        f_progress = ttk.Frame(frame_button)
+        f_progress.pack(fill="x")
+        f_progress.columnconfigure(0, weight=1)
+        self.progress_bar = ttk.Progressbar(f_progress, mode="determinate", maximum=PROGRESS_MAXIMUM)
+        self.progress_bar.grid(row=0, column=0, sticky="ew")
+        self.progress_label = ttk.Label(f_progress, text="", width=LABEL_WIDTH)
+        self.progress_label.grid(row=0, column=1, sticky="w", padx=(5, 0))
+
         # frame_text：表示エリア
         frame_text = ttk.Frame(outer_frame, padding=FRAME_PADDING)
         frame_text.grid(row=3, column=0, sticky="nsew")
@@ -140,6 +206,7 @@ class LogTab:
             state="disabled"
         )
         self.text_area.grid(row=0, column=0, sticky="nsew")
+        self._text_loader = TextLoader(self.text_area)
 
         # スクロールバーとテキストエリアを接続
         scrollbar.config(command=self.text_area.yview)
@@ -189,8 +256,12 @@ class LogTab:
 
     def click_convert_log(self):
         """click_convert_log
-            クリック：ログ変換
+            クリック：ログ変換（変換は別スレッドで行い、画面を固まらせない）
         """
+        # 変換中の場合は何もしない
+        if self._job_thread is not None:
+            return
+
         convert_cfg = self.config_tab.get_convert_config_from_vars()
         character_cfg = self.character_tab.get_character_config_from_vars()
 
@@ -206,13 +277,149 @@ class LogTab:
                 )
                 return
 
-        # ログ変換処理を実行
-        success, result, characters = convert_log(
-            input_path=self.input_file.get(),
-            output_path=self.output_file.get(),
-            convert_config=convert_cfg,
-            character_config=character_cfg
+        # 前回の変換後ログを書き込み中なら中断する
+        self._text_loader.cancel()
+
+        # ログ変換処理を別スレッドで実行
+        output_path = self.output_file.get()
+        self._job_queue = queue.Queue()
+        self._cancel_event = threading.Event()
+        self._job_thread = threading.Thread(
+            target=self.run_convert_job,
+            args=(self.input_file.get(), output_path, convert_cfg, character_cfg, self._job_queue, self._cancel_event),
+            daemon=True
         )
+        self.set_converting(True)
+        self._job_thread.start()
+        self.parent.after(POLL_INTERVAL_MS, self.poll_convert_job, convert_cfg)
+
+
+    def click_cancel_convert(self):
+        """ click_cancel_convert
+            クリック：ログ変換の中断
+        """
+        if self._cancel_event is not None:
+            self._cancel_event.set()
+            self.cancel_button.configure(state="disabled")
+
+
+    def run_convert_job(self, input_path: str, output_path: str, convert_cfg: dict, character_cfg: list, job_queue: queue.Queue, cancel_event: threading.Event):
+        """ run_convert_job
+            機能：ログ変換を実行し、進捗と結果を通知する（変換スレッドで実行。画面は操作しない）
+
+        Args:
+            input_path (str): ココフォリアのログのパス
+            output_path (str): 変換後のログを出力するパス
+            convert_cfg (dict): 変換設定の設定値
+            character_cfg (list): キャラ設定の設定値
+            job_queue (queue.Queue): 画面への通知
+            cancel_event (threading.Event): 中断の指示
+        """
+        recorder = StageRecorder()
+        try:
+            start = time.perf_counter()
+            success, result, characters = convert_log(
+                input_path=input_path,
+                output_path=output_path,
+                convert_config=convert_cfg,
+                character_config=character_cfg,
+                parse_cache=self._parse_cache,
+                observer=CompositeObserver([QueueObserver(job_queue), recorder]),
+                cancel_event=cancel_event
+            )
+            # 変換成功：変換後ログと処理時間を結果にまとめる
+            if success:
+                converted_log, total_len = result
+                result = ConversionResult(
+                    input_path=input_path,
+                    output_path=output_path,
+                    converted_log=converted_log,
+                    total_length=total_len,
+                    unknown_characters=characters.unknown_characters,
+                    use_classes=characters.use_classes,
+                    elapsed=time.perf_counter() - start,
+                    stage_times=recorder.stage_times,
+                    counters=recorder.counters
+                )
+            job_queue.put((JOB_DONE, (success, result)))
+        except ConvertCancelledError:
+            job_queue.put((JOB_CANCELLED, None))
+        except Exception as e:
+            job_queue.put((JOB_DONE, (False, (TEXTS[TextKey.FAILED_CONVERT_LOG_MESSAGE], e))))
+
+
+    def poll_convert_job(self, convert_cfg: dict):
+        """ poll_convert_job
+            機能：変換スレッドからの通知を確認し、進捗の表示、結果の表示をする
+
+        Args:
+            convert_cfg (dict): 変換設定の設定値
+        """
+        progress = None
+        while True:
+            try:
+                kind, value = self._job_queue.get_nowait()
+            except queue.Empty:
+                break
+
+            # 処理段階の開始
+            if kind == JOB_STAGE:
+                position, text_key = STAGE_PROGRESS.get(value, (None, TextKey.CONVERTING_LABEL))
+                if position is not None:
+                    self.progress_bar.configure(value=int(PROGRESS_MAXIMUM * position))
+                self.progress_label.configure(text=TEXTS[text_key].format(count=0, percent=0))
+                progress = None
+                continue
+
+            if kind == JOB_PROGRESS:
+                progress = value
+                continue
+
+            # 変換終了
+            self._job_thread = None
+            self.set_converting(False)
+            if kind == JOB_CANCELLED:
+                self.progress_bar.configure(value=0)
+                self.progress_label.configure(text=TEXTS[TextKey.CANCELLED_LABEL])
+            else:
+                self.progress_bar.configure(value=PROGRESS_MAXIMUM)
+                self.progress_label.configure(text="")
+                self.show_convert_result(value, convert_cfg)
+            return
+
+        # 解析の進捗は最新のもののみ表示する
+        if progress is not None:
+            chat_count, done_length, total_length = progress
+            ratio = done_length / total_length if total_length else 1
+            self.progress_bar.configure(value=int(PROGRESS_MAXIMUM * PARSE_PROGRESS_RATE * ratio))
+            self.progress_label.configure(text=TEXTS[TextKey.PARSE_PROGRESS_LABEL].format(count=chat_count, percent=int(100 * ratio)))
+
+        self.parent.after(POLL_INTERVAL_MS, self.poll_convert_job, convert_cfg)
+
+
+    def set_converting(self, converting: bool):
+        """ set_converting
+            機能：変換中の画面表示を切り替える（変換中は変換ボタンを無効、中断ボタンを有効にする）
+
+        Args:
+            converting (bool): Trueで変換中
+        """
+        self.convert_button.configure(state="disabled" if converting else "normal")
+        self.cancel_button.configure(state="normal" if converting else "disabled")
+        if converting:
+            self.progress_bar.configure(value=0)
+            self.progress_label.configure(text=TEXTS[TextKey.CONVERTING_LABEL])
+
+
+    def show_convert_result(self, convert_result: tuple, convert_cfg: dict):
+        """ show_convert_result
+            機能：ログ変換の結果を表示する
+
+        Args:
+            convert_result (tuple): [変換の成功or失敗 / ConversionResult または [ダイアログメッセージ / Exception]]
+            convert_cfg (dict): 変換設定の設定値
+        """
+        success, result = convert_result
 
         # 変換失敗
         if not success:
@@ -220,17 +427,13 @@ class LogTab:
             messagebox.showerror(TEXTS[TextKey.ERROR_DIALOG_TITLE], f'{e_message}\n\n{TEXTS[TextKey.DETAIL_MESSAGE]}：\n{error}', parent=self.parent)
             return
 
-        # 変換成功
-        text, total_len = result
-        privatter_log, web_log, iframe_logs = text
-        unknown_characters, use_classes = characters
-        self.text_area.configure(state="normal")        # 書き込みのために一時的に有効化
-        self.text_area.delete("1.0", tk.END)
-        self.text_area.insert(tk.END, privatter_log)
-        self.text_area.configure(state="disabled")     # 再び無効化
+        # 変換成功（他の画面・コピーは、テキストエリアではなく変換結果から取得する）
+        self._result = result
+        total_len = result.total_length
+        unknown_characters = result.unknown_characters
 
-        self._web_log = web_log
-        self._iframe_logs = iframe_logs
+        # 長いログでも画面が固まらないように、少しずつ書き込む
+        self._text_loader.load(iter_text_chunks(result.privatter_log))
 
         # 文字数カウントしてラベルに表示
         self.char_count_label.config(text=TEXTS[TextKey.CHARACTER_COUNT_LABEL].format(count=total_len))
@@ -263,29 +466,20 @@ class LogTab:
             )
             # 出力ファイルを開く場合、エディタを開く
             if True == ret:
-                open_file(self.output_file.get())
+                open_file(result.output_path)
 
 
     def copy_text(self):
         """ copy_text
-            機能：クリップボードに変換後ログをコピーする
-        """
-        copy_text_to_clipboard(self.parent, self.text_area)
-
-
-    def get_web_log(self) -> str:
-        """ 変換したwebログの取得
-
-        Returns:
-            str: webログ
+            機能：クリップボードに変換後ログをコピーする（書き込み途中でも全文をコピーする）
         """
-        return getattr(self, "_web_log", "")
+        copy_to_clipboard(self.parent, self._result.privatter_log if self._result else "")
 
 
-    def get_iframe_logs(self) -> list[str]:
-        """ get_iframe_logs
+    def get_result(self) -> ConversionResult | None:
+        """ get_result
 
         Returns:
-            list[str]: iframeのログ リスト
+            ConversionResult | None: 最後に成功した変換の結果（変換前はNone）
         """
-        return getattr(self, "_iframe_logs", [])
+        return self._result
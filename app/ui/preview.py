@@ -1,20 +1,38 @@
 """ preview.py
     機能：プレビュー画面
 """
-import re
 import tkinter as tk
 from tkinter import ttk
+from typing import Callable, Iterator, Optional
 
+from app.logic.preview import iter_preview_segments, join_iframe_logs
 from app.logic.processor import load_convert_config, save_convert_config
+from app.model.result import ConversionResult
 from app.model.uitexts import TextKey
 from app.ui.utils.colorselector import create_color_selector
+from app.ui.utils.textloader import TextChunk
+from app.ui.utils.virtualtext import TextLineIndex, VirtualTextView
 from system.ja import TEXTS
 
+"""
+定数定義
+"""
+# 表示するログの種類（選択肢のテキスト）
+PREVIEW_OUTPUTS = [
+    TextKey.PRIVATTER_LOG_LABEL,
+    TextKey.WEB_LOG_LABEL,
+    TextKey.IFRAME_LOG_LABEL,
+]
+# web用ログの改行（改行タグの後の改行文字は表示上の改行ではないため、改行タグだけにする）
+WEB_LINE_BREAK = "<br>\n"
+HTML_LINE_BREAK = "<br>"
+
+
 
 class PreviewTab:
-    def __init__(self, parent, get_html_callback):
+    def __init__(self, parent, get_result_callback: Callable[[], Optional[ConversionResult]]):
         self.parent = parent
-        self.get_html_callback = get_html_callback
+        self.get_result_callback = get_result_callback
 
         # 親フレーム作成
         outer_frame = tk.Frame(parent)
@@ -27,7 +45,7 @@ class PreviewTab:
         # 背景色設定フレーム
         top_frame = ttk.Frame(outer_frame)
         top_frame.grid(row=0, column=0, sticky="ew", padx=10, pady=(10, 0))
-        top_frame.grid_columnconfigure(2, weight=1)
+        top_frame.grid_columnconfigure(4, weight=1)
 
         # 背景色ラベル
         ttk.Label(top_frame, text=TEXTS[TextKey.BACKGROUND_COLOR_LABEL], takefocus=False).grid(row=0, column=0, sticky="nw", padx=(0, 5), pady=(5, 0))
@@ -44,9 +62,23 @@ class PreviewTab:
         # カラーセレクタ作成
         create_color_selector(top_frame, row=0, column=1, color_var=self._bg_color_var)
 
+        # 表示するログの選択（web用・iframe用はweb用変換が有効な場合のみ）
+        ttk.Label(top_frame, text=TEXTS[TextKey.PREVIEW_OUTPUT_LABEL], takefocus=False).grid(row=0, column=2, sticky="nw", padx=(16, 5), pady=(5, 0))
+        self._output_var = tk.StringVar(value=TEXTS[PREVIEW_OUTPUTS[0]])
+        output_select = ttk.Combobox(
+            top_frame,
+            textvariable=self._output_var,
+            values=[TEXTS[key] for key in PREVIEW_OUTPUTS],
+            state="readonly",
+            width=14,
+            takefocus=False
+        )
+        output_select.grid(row=0, column=3, sticky="nw", pady=(5, 0))
+        output_select.bind("<<ComboboxSelected>>", lambda e: self.update_preview())
+
         # 更新ボタンをtop_frame内に配置
         refresh_button = ttk.Button(top_frame, text=TEXTS[TextKey.UPDATE_LOG_BUTTON], takefocus=False, command=self.update_preview)
-        refresh_button.grid(row=0, column=2, sticky="e", padx=16, ipadx=4, ipady=10)
+        refresh_button.grid(row=0, column=4, sticky="e", padx=16, ipadx=4, ipady=10)
 
         # プレビュー表示フレーム作成
         text_frame = ttk.Frame(outer_frame)
@@ -65,9 +97,11 @@ class PreviewTab:
         self.text_area.grid(row=0, column=0, sticky="nsew")
 
         # スクロールバー（縦）
-        scrollbar = ttk.Scrollbar(text_frame, orient="vertical", command=self.text_area.yview)
+        scrollbar = ttk.Scrollbar(text_frame, orient="vertical")
         scrollbar.grid(row=0, column=1, sticky="ns")
-        self.text_area.configure(yscrollcommand=scrollbar.set)
+
+        # 表示位置の前後の行だけをテキストエリアに書き込む（スクロールバーはログ全体の位置を表示する）
+        self._text_view = VirtualTextView(self.text_area, scrollbar)
 
 
     def get_color(self):
@@ -78,30 +112,79 @@ class PreviewTab:
         return f"#{color.lstrip('#')}"
 
 
+    def get_output_key(self) -> str:
+        """ get_output_key
+            機能：選択している表示するログの種類を取得する
+
+        Returns:
+            str: 表示するログの種類（PREVIEW_OUTPUTSのTextKey）
+        """
+        selected = self._output_var.get()
+        for key in PREVIEW_OUTPUTS:
+            if TEXTS[key] == selected:
+                return key
+        return PREVIEW_OUTPUTS[0]
+
+
+    def get_output_html(self, result: Optional[ConversionResult]) -> str:
+        """ get_output_html
+            機能：選択している種類の変換後ログを取得する（web用・iframe用は初めて表示する時に作成される）
+
+        Args:
+            result (Optional[ConversionResult]): 変換結果
+
+        Returns:
+            str: 変換後ログ（iframe用は区切りを入れて全て続ける）
+        """
+        if result is None:
+            return ""
+
+        output_key = self.get_output_key()
+        # web用ログにはstyleタグが無いため、着色用に最後に追加する
+        if output_key == TextKey.WEB_LOG_LABEL:
+            web_log = result.web_log
+            return web_log.replace(WEB_LINE_BREAK, HTML_LINE_BREAK) + result.style_tag_text if web_log else ""
+        if output_key == TextKey.IFRAME_LOG_LABEL:
+            return join_iframe_logs(result.iframe_logs)
+        return result.privatter_log
+
+
     def update_preview(self):
         """ update_preview
-            機能：変換後ログを表示する
+            機能：選択している種類の変換後ログを表示する
+                ※web用・iframe用はclass属性で着色されるため、ログ内のstyleタグから色を決める
         """
-        html = self.get_html_callback()
+        html = self.get_output_html(self.get_result_callback())
 
         # ログが無い場合
         if not html.strip():
             html = "<i>" + TEXTS[TextKey.MISSING_LOG_MESSAGE] + "</i>"
 
-        self.text_area.config(state="normal")
-        self.text_area.delete("1.0", tk.END)
+        # 行ごとの索引を1回だけ作り、表示する行だけ書き込む（長いログでもタグ・メモリが増えない）
         self.text_area.config(bg=self.get_color())
+        self._text_view.set_index(TextLineIndex(self.iter_preview_chunks(self.extract_all_lines(html))))
+
+
+    def iter_preview_chunks(self, lines: list[tuple[str, str | None]]) -> Iterator[TextChunk]:
+        """ iter_preview_chunks
+            機能：色が付いたテキストを、色ごとのタグを付けた書き込み内容にする（タグは初めて使う時に作成する）
 
-        for text, color in self.extract_all_lines(html):
+        Args:
+            lines (list[tuple[str, str | None]]): [テキスト、色 / なし（色なしテキスト）]
+
+        Yields:
+            Iterator[TextChunk]: 書き込む内容
+        """
+        tag_names = set(self.text_area.tag_names())
+        for text, color in lines:
             if color:
                 tag = f"color_{color.lower()}"
-                if tag not in self.text_area.tag_names():
+                if tag not in tag_names:
                     self.text_area.tag_config(tag, foreground=color)
-                self.text_area.insert(tk.END, text + "\n", tag)
+                    tag_names.add(tag)
+                yield text + "\n", tag
             else:
-                self.text_area.insert(tk.END, text + "\n")
-
-        self.text_area.config(state="disabled")
+                yield text + "\n", None
 
 
     def extract_all_lines(self, html: str) -> list[tuple[str, str | None]]:
@@ -111,27 +194,8 @@ class PreviewTab:
         Returns:
             list[tuple[str, str | None]]: [テキスト、色 / なし（色なしテキスト）]
         """
-        html = re.sub(r'<br\s*/?>', '\n', html)
-        html = re.sub(r'</p>', '\n\n', html)
-        html = re.sub(r'<p>', '', html)
-        html = html.replace("&lt;", "<").replace("&gt;", ">").replace("&amp;", "&")
-
-        span_pattern = re.compile(r'<span style="color:\s*(#[0-9a-fA-F]{6})\s*;">(.*?)</span>', re.DOTALL)
-        color_blocks = []
-        last_end = 0
-
-        for match in span_pattern.finditer(html):
-            if match.start() > last_end:
-                color_blocks.append((html[last_end:match.start()], None))
-            color_blocks.append((match.group(2), match.group(1)))
-            last_end = match.end()
-
-        if last_end < len(html):
-            color_blocks.append((html[last_end:], None))
-
         lines: list[tuple[str, str | None]] = []
-        for block_text, color in color_blocks:
-            block_text = re.sub(r'<[^>]+>', '', block_text)
+        for block_text, color in iter_preview_segments(html):
             for line in block_text.splitlines():
                 if line.strip():
                     lines.append((line.strip(), color))
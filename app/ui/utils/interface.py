@@ -33,7 +33,6 @@ def bind_canvas_mousewheel(canvas):
 def unbind_canvas_mousewheel(canvas):
     canvas.unbind_all("<MouseWheel>")
 
-def copy_text_to_clipboard(widget: tk.Widget, text_widget: tk.Text):
-    text = text_widget.get("1.0", "end-1c")
+def copy_to_clipboard(widget: tk.Widget, text: str):
     widget.clipboard_clear()
     widget.clipboard_append(text)
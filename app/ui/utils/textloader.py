@@ -0,0 +1,132 @@
+""" textloader.py
+    機能：テキストエリアへの少しずつの書き込み
+        ・長いログを1回で書き込むと画面が固まるため、after()で時間を区切って書き込む
+        ・最初の画面分はすぐに書き込み、続きは画面の操作の合間に書き込む
+"""
+import time
+import tkinter as tk
+from typing import Callable, Iterable, Iterator, Optional
+
+"""
+定数定義
+"""
+TIME_SLICE_MS   = 15        # 1回の書き込みにかける時間（ミリ秒）：これを超えたら続きは次回
+NEXT_SLICE_MS   = 1         # 次の書き込みまでの待ち時間（ミリ秒）：画面の操作・描画を先に処理させる
+CHUNK_LENGTH    = 8192      # 1回のinsertで書き込む文字数の目安
+# 書き込む内容：[テキスト / タグ（タグなしの場合はNone）]
+TextChunk = tuple[str, Optional[str]]
+
+
+
+def iter_text_chunks(text: str, chunk_length: int = CHUNK_LENGTH) -> Iterator[TextChunk]:
+    """ iter_text_chunks
+        機能：文字列を書き込み用に分割する（途中で改行できる場合は、改行の後で分割する）
+
+    Args:
+        text (str): 書き込む文字列
+        chunk_length (int, optional): 分割する文字数の目安. Defaults to CHUNK_LENGTH.
+
+    Yields:
+        Iterator[TextChunk]: 書き込む内容（タグなし）
+    """
+    start = 0
+    while start < len(text):
+        end = start + chunk_length
+        if end < len(text):
+            newline = text.rfind("\n", start, end)
+            if newline >= 0:
+                end = newline + 1
+        yield text[start:end], None
+        start = end
+
+
+
+class TextLoader:
+    """ TextLoader
+        機能：テキストエリアに、時間を区切って少しずつ書き込む
+            ※新しく書き込みを始めると、書き込み中の内容は中断する
+    """
+    def __init__(self, text_area: tk.Text, time_slice_ms: int = TIME_SLICE_MS):
+        self.text_area = text_area
+        self._time_slice = time_slice_ms / 1000     # 1回の書き込みにかける秒数
+        self._chunks = None                         # 書き込み待ちの内容（書き込み中でなければNone）
+        self._after_id = None                       # 予約している次の書き込み
+        self._on_done = None                        # 書き込みが終わったときに呼ぶ関数
+
+
+    def load(self, chunks: Iterable[TextChunk], on_done: Optional[Callable[[], None]] = None):
+        """ load
+            機能：テキストエリアを空にしてから書き込みを始める（最初の1回分はすぐに書き込む）
+
+        Args:
+            chunks (Iterable[TextChunk]): 書き込む内容
+            on_done (Optional[Callable[[], None]], optional): 書き込みが終わったときに呼ぶ関数. Defaults to None.
+        """
+        self.cancel()
+        self.text_area.configure(state="normal")
+        self.text_area.delete("1.0", tk.END)
+        self.text_area.configure(state="disabled")
+
+        self._chunks = iter(chunks)
+        self._on_done = on_done
+        self._load_next()
+
+
+    def cancel(self):
+        """ cancel
+            機能：書き込みを中断する（書き込み済みの内容はそのまま）
+        """
+        if self._after_id is not None:
+            self.text_area.after_cancel(self._after_id)
+            self._after_id = None
+        self._chunks = None
+        self._on_done = None
+
+
+    def is_loading(self) -> bool:
+        """ is_loading
+            機能：書き込み中か確認する
+
+        Returns:
+            bool: Trueで書き込み中
+        """
+        return self._chunks is not None
+
+
+    def _load_next(self):
+        """ _load_next
+            機能：時間まで書き込み、続きがあれば次の書き込みを予約する
+        """
+        self._after_id = None
+        deadline = time.perf_counter() + self._time_slice
+        finished = False
+
+        self.text_area.configure(state="normal")
+        try:
+            while time.perf_counter() < deadline:
+                # 1回のinsertで、テキストとタグを交互に並べてまとめて書き込む
+                args = []
+                length = 0
+                for text, tag in self._chunks:
+                    args.extend((text, tag or ()))
+                    length += len(text)
+                    if length >= CHUNK_LENGTH:
+                        break
+                else:
+                    finished = True
+                if args:
+                    self.text_area.insert(tk.END, *args)
+                if finished:
+                    break
+        finally:
+            self.text_area.configure(state="disabled")
+
+        if not finished:
+            self._after_id = self.text_area.after(NEXT_SLICE_MS, self._load_next)
+            return
+
+        on_done = self._on_done
+        self._chunks = None
+        self._on_done = None
+        if on_done is not None:
+            on_done()
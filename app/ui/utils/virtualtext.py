@@ -0,0 +1,194 @@
+""" virtualtext.py
+    機能：長いテキストの部分表示
+        ・全体を行ごとの索引にしておき、テキストエリアには表示位置の前後の行だけ書き込む
+        ・スクロールバーは全体の行数に対する位置を表示する
+"""
+import tkinter as tk
+from tkinter import ttk
+from typing import Iterable
+
+from app.ui.utils.textloader import TextChunk
+
+"""
+定数定義
+"""
+WINDOW_LINES    = 400       # テキストエリアに書き込む行数
+EDGE_LINES      = 100       # 書き込んだ範囲の端からこの行数以内を表示したら、表示位置を中心に書き込み直す
+
+
+
+class TextLineIndex:
+    """ TextLineIndex
+        機能：書き込む内容を行ごとに分けた索引（1回だけ作成し、表示のたびに必要な行だけ取り出す）
+    """
+    def __init__(self, chunks: Iterable[TextChunk]):
+        self.lines = []         # 行ごとの書き込む内容（改行は含まない）
+        line = []
+        for text, tag in chunks:
+            parts = text.split("\n")
+            for part in parts[:-1]:
+                if part:
+                    line.append((part, tag))
+                self.lines.append(tuple(line))
+                line = []
+            if parts[-1]:
+                line.append((parts[-1], tag))
+        if line:
+            self.lines.append(tuple(line))
+
+
+    def __len__(self) -> int:
+        return len(self.lines)
+
+
+
+class VirtualTextView:
+    """ VirtualTextView
+        機能：テキストエリアに索引の一部の行だけを書き込んで表示する
+            ※テキストエリア内のスクロール（ホイール・キー操作）はそのまま使い、端に近づいたら書き込む行を移す
+    """
+    def __init__(self, text_area: tk.Text, scrollbar: ttk.Scrollbar):
+        self.text_area = text_area
+        self.scrollbar = scrollbar
+        self._index = TextLineIndex([])
+        self._window_start = 0          # 書き込んでいる最初の行番号
+        self._window_end = 0            # 書き込んでいる最後の行番号+1
+        self._top = 0                   # 表示している先頭の行番号
+        self._recenter_id = None        # 予約している書き込み直し
+
+        text_area.configure(yscrollcommand=self.on_text_scroll)
+        scrollbar.configure(command=self.yview)
+
+
+    def set_index(self, index: TextLineIndex):
+        """ set_index
+            機能：表示する索引を設定し、先頭を表示する
+
+        Args:
+            index (TextLineIndex): 表示する索引
+        """
+        self._index = index
+        self.render_window(0)
+
+
+    def is_whole(self) -> bool:
+        """ is_whole
+            機能：全ての行を書き込んでいるか確認する
+
+        Returns:
+            bool: Trueで全ての行を書き込み済み（スクロールはテキストエリアのまま）
+        """
+        return self._window_start == 0 and self._window_end == len(self._index)
+
+
+    def render_window(self, top: int):
+        """ render_window
+            機能：指定した行を中心に書き込み直し、その行を先頭に表示する
+
+        Args:
+            top (int): 先頭に表示する行番号
+        """
+        lines = self._index.lines
+        top = max(0, min(top, len(lines) - 1))
+        start = max(0, min(top - WINDOW_LINES // 2, len(lines) - WINDOW_LINES))
+        end = min(len(lines), start + WINDOW_LINES)
+
+        # テキストとタグを交互に並べて、1回のinsertで書き込む
+        args = []
+        for i in range(start, end):
+            for text, tag in lines[i]:
+                args.extend((text, tag or ()))
+            if i < end - 1:
+                args.extend(("\n", ()))
+
+        self._window_start = start
+        self._window_end = end
+        self._top = max(0, top)
+        self.text_area.configure(state="normal")
+        self.text_area.delete("1.0", tk.END)
+        if args:
+            self.text_area.insert(tk.END, *args)
+        self.text_area.configure(state="disabled")
+        self.text_area.yview(f"{self._top - start + 1}.0")
+
+
+    def scroll_to(self, top: int):
+        """ scroll_to
+            機能：指定した行が先頭になるようにスクロールする（書き込んでいない行の場合は書き込み直す）
+                ※最後の行より下が空かないように、最後の画面分より下にはスクロールしない
+
+        Args:
+            top (int): 先頭に表示する行番号
+        """
+        top = max(0, min(top, len(self._index) - self.get_visible_count()))
+        near_start = top - self._window_start < EDGE_LINES and self._window_start > 0
+        near_end = self._window_end - top < EDGE_LINES and self._window_end < len(self._index)
+        if top < self._window_start or top >= self._window_end or near_start or near_end:
+            self.render_window(top)
+        else:
+            self.text_area.yview(f"{top - self._window_start + 1}.0")
+
+
+    def yview(self, action: str, value: str, unit: str = None):
+        """ yview
+            操作：スクロールバーの操作（全体の行数に対する位置でスクロールする）
+
+        Args:
+            action (str): "moveto"（つまみのドラッグ）または "scroll"（矢印・余白のクリック）
+            value (str): 移動先の位置（0～1）またはスクロール量
+            unit (str, optional): スクロールの単位（"units" または "pages"）. Defaults to None.
+        """
+        # 全ての行を書き込んでいる場合は、テキストエリアでスクロールする
+        if self.is_whole():
+            self.text_area.yview(action, value, *([unit] if unit else []))
+            return
+
+        if action == "moveto":
+            self.scroll_to(int(float(value) * len(self._index)))
+        elif action == "scroll":
+            step = self.get_visible_count() if unit == "pages" else 1
+            self.scroll_to(self._top + int(value) * step)
+
+
+    def get_visible_count(self) -> int:
+        """ get_visible_count
+            機能：画面に表示している行数を取得する
+
+        Returns:
+            int: 表示している行数（1行以上）
+        """
+        first = int(self.text_area.index("@0,0").split(".")[0])
+        last = int(self.text_area.index(f"@0,{self.text_area.winfo_height()}").split(".")[0])
+        return max(1, last - first + 1)
+
+
+    def on_text_scroll(self, first: str, last: str):
+        """ on_text_scroll
+            機能：テキストエリアがスクロールした時に、スクロールバーの位置を更新する（端に近づいたら書き込み直す）
+
+        Args:
+            first (str): テキストエリア内の表示開始位置（0～1）
+            last (str): テキストエリア内の表示終了位置（0～1）
+        """
+        if self.is_whole():
+            self.scrollbar.set(first, last)
+            return
+
+        total = len(self._index)
+        self._top = self._window_start + int(self.text_area.index("@0,0").split(".")[0]) - 1
+        visible_count = self.get_visible_count()
+        self.scrollbar.set(self._top / total, min(1.0, (self._top + visible_count) / total))
+
+        # 書き込んだ範囲の端に近づいたら、表示位置を中心に書き込み直す（スクロールの処理が終わってから）
+        near_start = self._top - self._window_start < EDGE_LINES and self._window_start > 0
+        near_end = self._window_end - (self._top + visible_count) < EDGE_LINES and self._window_end < total
+        if (near_start or near_end) and self._recenter_id is None:
+            self._recenter_id = self.text_area.after_idle(self.recenter_window)
+
+
+    def recenter_window(self):
+        """ recenter_window
+            機能：表示している行を中心に書き込み直す
+        """
+        self._recenter_id = None
+        self.render_window(self._top)
@@ -0,0 +1,122 @@
+""" character_rows.py
+    機能：キャラ設定画面の行操作（↑↓、削除）の速度計測
+        python -m benchmarks.character_rows [--rows 2000] [--repeat 20] [--max-ms 100]
+        ※画面を表示できる環境で実行する。設定ファイルは読み書きしない
+"""
+import argparse
+import sys
+import time
+import tkinter as tk
+
+from app.logic import globals
+from app.logic.processor import load_resources
+from app.model.settings import CHARACTER_CONFIG, ConfigKey
+from app.ui import character
+from system.resources import ResourcesKey
+
+"""
+定数定義
+"""
+# 計測するキャラ設定の行数
+DEFAULT_ROWS = 2000
+# 操作ごとの計測回数
+DEFAULT_REPEAT = 20
+# 1回の操作にかかってよい時間（ミリ秒）
+DEFAULT_MAX_MS = 100
+
+
+
+def create_character_config(rows: int) -> tuple[dict, list[dict]]:
+    """ create_character_config
+        機能：計測用のキャラ設定を作成する
+
+    Args:
+        rows (int): 行数（デフォルト行を除く）
+
+    Returns:
+        tuple[dict, list[dict]]: 初期値の設定値 / 設定値
+    """
+    default_cfg = {setting.key: setting.default for setting in CHARACTER_CONFIG}
+    default_cfg[ConfigKey.CHARACTER] = globals.RESOURCES[ResourcesKey.CHARACTER_DEFAULT_NAME]
+
+    character_cfg = []
+    for i in range(rows):
+        cfg = {setting.key: setting.default for setting in CHARACTER_CONFIG}
+        cfg[ConfigKey.CHARACTER] = f"キャラ{i}"
+        cfg[ConfigKey.COLOR_CODE] = f"{i * 2654435761 % 0x1000000:06x}"
+        character_cfg.append(cfg)
+    return default_cfg, character_cfg
+
+
+def measure(root: tk.Tk, operation, repeat: int) -> float:
+    """ measure
+        機能：操作を繰り返し、画面の配置まで含めた1回あたりの時間を計測する
+
+    Args:
+        root (tk.Tk): メインウィンドウ
+        operation (Callable[[], None]): 計測する操作
+        repeat (int): 計測回数
+
+    Returns:
+        float: 1回あたりのミリ秒
+    """
+    start = time.perf_counter()
+    for _ in range(repeat):
+        operation()
+        root.update_idletasks()
+    return (time.perf_counter() - start) * 1000 / repeat
+
+
+def main() -> int:
+    """ main
+        機能：行数の多いキャラ設定画面で行操作の時間を計測し、上限を超えたら0以外を返す
+
+    Returns:
+        int: 終了コード
+    """
+    arg_parser = argparse.ArgumentParser(description="キャラ設定画面の行操作の速度計測")
+    arg_parser.add_argument("--rows", type=int, default=DEFAULT_ROWS, help="キャラ設定の行数")
+    arg_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="操作ごとの計測回数")
+    arg_parser.add_argument("--max-ms", type=float, default=DEFAULT_MAX_MS, help="1回の操作にかかってよい時間（ミリ秒）")
+    args = arg_parser.parse_args()
+
+    globals.RESOURCES = load_resources()
+
+    # 設定ファイルの代わりに計測用のキャラ設定を使う
+    config = create_character_config(args.rows)
+    character.load_character_config = lambda: config
+    character.save_character_config = lambda *_: None
+
+    try:
+        root = tk.Tk()
+    except tk.TclError as e:
+        print(f"画面を表示できないため計測できません：{e}", file=sys.stderr)
+        return 2
+    root.withdraw()
+
+    frame = tk.Frame(root)
+    frame.grid(row=0, column=0, sticky="nsew")
+    start = time.perf_counter()
+    tab = character.CharacterTab(frame)
+    root.update_idletasks()
+    print(f"{'build':<10} {(time.perf_counter() - start) * 1000:>9.1f} ms  ({args.rows} rows)")
+
+    rows = tab._rows
+    middle = len(rows) // 2
+    results = {
+        "move_up":      measure(root, lambda: tab.move_row_up(rows[middle]), args.repeat),
+        "move_down":    measure(root, lambda: tab.move_row_down(rows[middle]), args.repeat),
+        "remove":       measure(root, lambda: tab.remove_row(rows[middle]), args.repeat),
+    }
+    root.destroy()
+
+    failed = False
+    for name, elapsed in results.items():
+        result = "ok" if elapsed <= args.max_ms else "SLOW"
+        failed = failed or elapsed > args.max_ms
+        print(f"{name:<10} {elapsed:>9.1f} ms  {result}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
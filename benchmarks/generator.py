@@ -0,0 +1,125 @@
+""" generator.py
+    機能：計測用のココフォリアのログの作成
+        python -m benchmarks.generator 出力ファイル [--messages 10000] [--speakers 20] [--tabs main info 雑談]
+            [--system-rate 0.1] [--br-rate 0.2] [--colors 20] [--seed 0]
+"""
+import argparse
+import random
+
+"""
+定数定義
+"""
+# ココフォリアのログの外枠
+HTML_HEADER = '<!DOCTYPE html>\n<html lang="ja">\n  <head>\n    <meta charset="UTF-8" />\n    <title>ccfolia - logs</title>\n  </head>\n  <body>\n    \n'
+HTML_FOOTER = '  </body>\n</html>'
+# 発言1件分
+HTML_CHAT = '<p style="color:{color};">\n  <span> [{tab}]</span>\n  <span>{character}</span> :\n  <span>\n    {message}\n  </span>\n</p>\n    \n'
+# 初期値
+DEFAULT_MESSAGES    = 10000
+DEFAULT_SPEAKERS    = 20
+DEFAULT_TABS        = ["main", "info", "雑談"]
+DEFAULT_SYSTEM_RATE = 0.1       # system発言の割合
+DEFAULT_BR_RATE     = 0.2       # 改行の多い発言の割合
+DEFAULT_COLORS      = 20        # 発言色の種類
+SYSTEM_CHARACTER    = "system"
+# 発言内容（よくある発言、置換ルールの対象、文字参照を含む発言）
+MESSAGES = [
+    "こんにちは。」",
+    "「それでは始めましょうか。」",
+    "【探索】図書館で調べものをする",
+    "ちょっと待って~*",
+    "&lt;b&gt;強調&lt;/b&gt; &amp; &quot;引用&quot; &#39;",
+    "CCB&lt;=70 【目星】 (1D100&lt;=70) ＞ 45 ＞ 成功",
+    "",
+    "x" * 200,
+]
+# system発言（[ キャラ名 ]で発言者を指定する）
+SYSTEM_MESSAGES = [
+    "[ {character} ] HP : 10 → 8",
+    "[ {character} ] SAN : 60 → 57",
+]
+# 改行の多い発言の行数
+BR_LINES = 8
+
+
+
+def generate_log(messages: int = DEFAULT_MESSAGES, speakers: int = DEFAULT_SPEAKERS, tabs: list[str] = DEFAULT_TABS,
+                 system_rate: float = DEFAULT_SYSTEM_RATE, br_rate: float = DEFAULT_BR_RATE, colors: int = DEFAULT_COLORS, seed: int = 0) -> str:
+    """ generate_log
+        機能：計測用のココフォリアのログを作成する（同じ引数なら同じログになる）
+
+    Args:
+        messages (int, optional): 発言数. Defaults to DEFAULT_MESSAGES.
+        speakers (int, optional): 発言者の数（system以外）. Defaults to DEFAULT_SPEAKERS.
+        tabs (list[str], optional): 発言タブ. Defaults to DEFAULT_TABS.
+        system_rate (float, optional): system発言の割合. Defaults to DEFAULT_SYSTEM_RATE.
+        br_rate (float, optional): 改行の多い発言の割合. Defaults to DEFAULT_BR_RATE.
+        colors (int, optional): 発言色の種類. Defaults to DEFAULT_COLORS.
+        seed (int, optional): 乱数のシード. Defaults to 0.
+
+    Returns:
+        str: ココフォリアのログテキスト
+    """
+    rand = random.Random(seed)
+    characters = get_speaker_names(speakers)
+    palette = [f"#{rand.randrange(0x1000000):06x}" for _ in range(max(1, colors))]
+    # 発言者ごとの発言色（色の種類が発言者より少ない場合は、同じ色の発言者がいる）
+    character_colors = [palette[i % len(palette)] for i in range(len(characters))]
+    system_color = "#888888"
+
+    lines = [HTML_HEADER]
+    for _ in range(messages):
+        tab = rand.choice(tabs)
+        if rand.random() < system_rate:
+            character = SYSTEM_CHARACTER
+            color = system_color
+            message = rand.choice(SYSTEM_MESSAGES).format(character=rand.choice(characters))
+        else:
+            index = rand.randrange(len(characters))
+            character = characters[index]
+            color = character_colors[index]
+            if rand.random() < br_rate:
+                message = "<br>".join(rand.choice(MESSAGES) or "　" for _ in range(BR_LINES))
+            else:
+                message = rand.choice(MESSAGES)
+
+        lines.append(HTML_CHAT.format(color=color, tab=tab, character=character, message=message))
+    lines.append(HTML_FOOTER)
+    return "".join(lines)
+
+
+def get_speaker_names(speakers: int) -> list[str]:
+    """ get_speaker_names
+        機能：発言者の名前を作成する
+
+    Args:
+        speakers (int): 発言者の数
+
+    Returns:
+        list[str]: 発言者の名前
+    """
+    return [f"キャラ{i}" for i in range(max(1, speakers))]
+
+
+def main():
+    """ main
+        機能：指定した条件でココフォリアのログを作成し、ファイルに保存する
+    """
+    arg_parser = argparse.ArgumentParser(description="計測用のココフォリアのログの作成")
+    arg_parser.add_argument("output", help="出力ファイル（.html）")
+    arg_parser.add_argument("--messages", type=int, default=DEFAULT_MESSAGES, help="発言数")
+    arg_parser.add_argument("--speakers", type=int, default=DEFAULT_SPEAKERS, help="発言者の数（system以外）")
+    arg_parser.add_argument("--tabs", nargs="+", default=DEFAULT_TABS, help="発言タブ")
+    arg_parser.add_argument("--system-rate", type=float, default=DEFAULT_SYSTEM_RATE, help="system発言の割合")
+    arg_parser.add_argument("--br-rate", type=float, default=DEFAULT_BR_RATE, help="改行の多い発言の割合")
+    arg_parser.add_argument("--colors", type=int, default=DEFAULT_COLORS, help="発言色の種類")
+    arg_parser.add_argument("--seed", type=int, default=0, help="乱数のシード")
+    args = arg_parser.parse_args()
+
+    html_content = generate_log(args.messages, args.speakers, args.tabs, args.system_rate, args.br_rate, args.colors, args.seed)
+    with open(args.output, "w", encoding="utf-8") as f:
+        f.write(html_content)
+
+
+if __name__ == "__main__":
+    main()
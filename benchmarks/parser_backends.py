@@ -0,0 +1,58 @@
+""" parser_backends.py
+    機能：HTML解析処理の速度比較
+        python -m benchmarks.parser_backends [--sizes 10000 100000 1000000] [--backends regex lxml]
+"""
+import argparse
+import time
+
+from app.logic.parser import PARSER_BACKENDS, is_parser_backend_available
+from app.logic.tokenizer import UnsupportedMarkupError
+from benchmarks.generator import generate_log
+
+"""
+定数定義
+"""
+# 計測する発言数
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+
+
+def main():
+    """ main
+        機能：発言数ごとに各解析処理の時間を計測して表示する
+    """
+    arg_parser = argparse.ArgumentParser(description="HTML解析処理の速度比較")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="発言数")
+    arg_parser.add_argument("--backends", nargs="+", default=None, help="計測する解析処理の名前")
+    args = arg_parser.parse_args()
+
+    backends = [
+        backend for backend in PARSER_BACKENDS
+        if is_parser_backend_available(backend) and (args.backends is None or backend.name in args.backends)
+    ]
+
+    print(f"{'messages':>10} {'backend':<12} {'seconds':>9} {'messages/s':>12}  result")
+    for size in args.sizes:
+        html_content = generate_log(size)
+        expected = None
+
+        for backend in backends:
+            start = time.perf_counter()
+            try:
+                raw_chats = list(backend.parse(html_content))
+            except UnsupportedMarkupError:
+                print(f"{size:>10} {backend.name:<12} {'-':>9} {'-':>12}  unsupported")
+                continue
+            elapsed = time.perf_counter() - start
+
+            # 全ての解析処理で同じ発言が取り出せているか確認する
+            if expected is None:
+                expected = raw_chats
+            result = "ok" if raw_chats == expected else "MISMATCH"
+
+            print(f"{size:>10} {backend.name:<12} {elapsed:>9.3f} {size / elapsed:>12,.0f}  {result}")
+            del raw_chats
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,251 @@
+""" pipeline.py
+    機能：変換処理の段階ごとの速度・メモリ計測（結果はJSONで出力する）
+        python -m benchmarks.pipeline [--sizes 1000 10000 100000 1000000] [--output result.json] [--no-memory]
+        ※設定ファイル・解析結果のキャッシュは読み書きしない
+"""
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from typing import Callable
+
+from app.logic import globals
+from app.logic.formatter import (convert_chats_to_text,
+                                 convert_log_to_chat_list,
+                                 create_character_index, create_style_tag_text)
+from app.logic.processor import convert_log
+from app.model.settings import CHARACTER_CONFIG, CONVERT_CONFIG, ConfigKey
+from benchmarks.generator import generate_log, get_speaker_names
+from system.resources import RESOURCES_CONFIG, ResourcesKey
+
+"""
+定数定義
+"""
+# 計測する発言数
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+# 計測する発言者の数
+DEFAULT_SPEAKERS = 20
+# 計測する処理の名前
+BENCH_CONVERT_LOG_TO_CHAT_LIST  = "convert_log_to_chat_list"
+BENCH_CREATE_STYLE_TAG_TEXT     = "create_style_tag_text"
+BENCH_CONVERT_CHATS_TO_TEXT     = "convert_chats_to_text"
+BENCH_CONVERT_LOG               = "convert_log"
+# 出力するJSONの形式の版
+RESULT_VERSION = 1
+
+
+
+def init_resources():
+    """ init_resources
+        機能：リソースの設定値を初期値にする（解析結果のキャッシュは使わない）
+    """
+    resources = {resource_cfg.key: resource_cfg.default for resource_cfg in RESOURCES_CONFIG}
+    resources[ResourcesKey.PARSE_CACHE_MAX_BYTE_SIZE] = 0
+    globals.RESOURCES = resources
+
+
+def create_convert_config() -> dict:
+    """ create_convert_config
+        機能：計測用の変換設定を作成する（初期値に、web用変換を有効にしたもの）
+
+    Returns:
+        dict: 変換設定の設定値
+    """
+    convert_config = {convert_cfg.key: convert_cfg.default for convert_cfg in CONVERT_CONFIG}
+    convert_config[ConfigKey.CONVERT_WEB_LOG] = True
+    return convert_config
+
+
+def create_character_config(speakers: int) -> list[dict]:
+    """ create_character_config
+        機能：計測用のキャラ設定を作成する（デフォルト行を先頭に、半分の発言者だけ設定する）
+
+    Args:
+        speakers (int): 発言者の数（system以外）
+
+    Returns:
+        list[dict]: キャラ設定の設定値
+    """
+    default_cfg = {setting.key: setting.default for setting in CHARACTER_CONFIG}
+    default_cfg[ConfigKey.CHARACTER] = globals.RESOURCES[ResourcesKey.CHARACTER_DEFAULT_NAME]
+    default_cfg[ConfigKey.ENABLE_PAINT] = True
+
+    character_config = [default_cfg]
+    for i, name in enumerate(get_speaker_names(speakers)[::2]):
+        cfg = {setting.key: setting.default for setting in CHARACTER_CONFIG}
+        cfg[ConfigKey.CHARACTER] = name
+        cfg[ConfigKey.COLOR_CODE] = f"{i * 2654435761 % 0x1000000:06x}"
+        cfg[ConfigKey.CLASS_NAME] = f"chara{i}"
+        cfg[ConfigKey.ENABLE_PAINT] = True
+        character_config.append(cfg)
+    return character_config
+
+
+def measure(operation: Callable[[], object], with_memory: bool) -> tuple[float, int | None]:
+    """ measure
+        機能：処理の時間を計測する（メモリの計測は時間に影響するため、別に1回実行する）
+
+    Args:
+        operation (Callable[[], object]): 計測する処理
+        with_memory (bool): Trueでメモリの最大使用量も計測する
+
+    Returns:
+        tuple[float, int | None]: 秒数 / メモリの最大使用量（バイト、計測しない場合はNone）
+    """
+    start = time.perf_counter()
+    result = operation()
+    elapsed = time.perf_counter() - start
+    del result
+
+    peak_bytes = None
+    if with_memory:
+        tracemalloc.start()
+        try:
+            result = operation()
+            peak_bytes = tracemalloc.get_traced_memory()[1]
+            del result
+        finally:
+            tracemalloc.stop()
+    return elapsed, peak_bytes
+
+
+def create_record(function: str, messages: int, elapsed: float, peak_bytes: int | None) -> dict:
+    """ create_record
+        機能：計測結果1件分を作成する
+
+    Args:
+        function (str): 計測した処理の名前
+        messages (int): 発言数
+        elapsed (float): 秒数
+        peak_bytes (int | None): メモリの最大使用量（バイト）
+
+    Returns:
+        dict: 計測結果
+    """
+    return {
+        "function": function,
+        "messages": messages,
+        "seconds": round(elapsed, 6),
+        "peak_bytes": peak_bytes,
+        "messages_per_second": round(messages / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+def run_size(messages: int, speakers: int, with_memory: bool, work_dir: str) -> list[dict]:
+    """ run_size
+        機能：1つの発言数について、変換処理の各段階を計測する
+
+    Args:
+        messages (int): 発言数
+        speakers (int): 発言者の数（system以外）
+        with_memory (bool): Trueでメモリの最大使用量も計測する
+        work_dir (str): 入出力ファイルを置くフォルダ
+
+    Returns:
+        list[dict]: 計測結果
+    """
+    html_content = generate_log(messages, speakers)
+    convert_config = create_convert_config()
+    character_config = create_character_config(speakers)
+    character_index = create_character_index(character_config)
+    records = []
+
+    # HTMLの解析とChat型Listへの変換
+    elapsed, peak_bytes = measure(lambda: convert_log_to_chat_list(html_content, convert_config, character_config, character_index), with_memory)
+    records.append(create_record(BENCH_CONVERT_LOG_TO_CHAT_LIST, messages, elapsed, peak_bytes))
+    chats, characters = convert_log_to_chat_list(html_content, convert_config, character_config, character_index)
+
+    # styleタグの作成
+    elapsed, peak_bytes = measure(lambda: create_style_tag_text(character_config, characters.use_classes, character_index), with_memory)
+    records.append(create_record(BENCH_CREATE_STYLE_TAG_TEXT, messages, elapsed, peak_bytes))
+    style_tag_text = create_style_tag_text(character_config, characters.use_classes, character_index)
+
+    # テキストへの変換（web用・iframe用も作成する）
+    def convert_text():
+        converted_log = convert_chats_to_text(chats, convert_config, style_tag_text)
+        converted_log.web_log
+        converted_log.iframe_log
+        return converted_log
+    elapsed, peak_bytes = measure(convert_text, with_memory)
+    records.append(create_record(BENCH_CONVERT_CHATS_TO_TEXT, messages, elapsed, peak_bytes))
+    del chats
+
+    # ファイルの読み込みから出力まで
+    input_path = os.path.join(work_dir, f"ccfolia_{messages}.html")
+    output_path = os.path.join(work_dir, f"converted_{messages}.txt")
+    with open(input_path, "w", encoding="utf-8") as f:
+        f.write(html_content)
+    del html_content
+
+    def convert_file():
+        success, result, _ = convert_log(input_path, output_path, convert_config, character_config)
+        if not success:
+            raise RuntimeError(f"{result[0]}: {result[1]}")
+        return result
+    elapsed, peak_bytes = measure(convert_file, with_memory)
+    records.append(create_record(BENCH_CONVERT_LOG, messages, elapsed, peak_bytes))
+
+    os.remove(input_path)
+    os.remove(output_path)
+    return records
+
+
+def get_environment() -> dict:
+    """ get_environment
+        機能：計測した環境の情報を取得する
+
+    Returns:
+        dict: 環境の情報
+    """
+    return {
+        "python": platform.python_version(),
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+    }
+
+
+def main() -> int:
+    """ main
+        機能：発言数ごとに変換処理の各段階の時間・メモリを計測し、JSONで出力する
+
+    Returns:
+        int: 終了コード
+    """
+    arg_parser = argparse.ArgumentParser(description="変換処理の段階ごとの速度・メモリ計測")
+    arg_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES, help="発言数")
+    arg_parser.add_argument("--speakers", type=int, default=DEFAULT_SPEAKERS, help="発言者の数（system以外）")
+    arg_parser.add_argument("--no-memory", action="store_true", help="メモリの最大使用量を計測しない")
+    arg_parser.add_argument("-o", "--output", default=None, help="結果の出力先（省略時は標準出力）")
+    args = arg_parser.parse_args()
+
+    init_resources()
+    records = []
+    with tempfile.TemporaryDirectory() as work_dir:
+        for messages in args.sizes:
+            for record in run_size(messages, args.speakers, not args.no_memory, work_dir):
+                records.append(record)
+                print(f"{record['messages']:>10} {record['function']:<26} {record['seconds']:>9.3f}s", file=sys.stderr)
+
+    result = {
+        "version": RESULT_VERSION,
+        "environment": get_environment(),
+        "speakers": args.speakers,
+        "records": records,
+    }
+    result_text = json.dumps(result, ensure_ascii=False, indent=2)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            f.write(result_text + "\n")
+    else:
+        print(result_text)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
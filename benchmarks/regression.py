@@ -0,0 +1,211 @@
+""" regression.py
+    機能：変換処理の速度・メモリの劣化の確認（保存してある基準値と比較する）
+        python -m benchmarks.regression [--messages 20000] [--repeat 3] [--time-tolerance 0.3] [--memory-tolerance 0.2]
+        python -m benchmarks.regression --update     （基準値を作り直す）
+        ※処理時間は計算量が一定の処理（校正用ループ）の時間で割り、環境による速さの差を除いてから比較する
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import tempfile
+import time
+
+from benchmarks.pipeline import (BENCH_CONVERT_CHATS_TO_TEXT, BENCH_CONVERT_LOG,
+                                 BENCH_CONVERT_LOG_TO_CHAT_LIST,
+                                 DEFAULT_SPEAKERS, get_environment,
+                                 init_resources, run_size)
+
+"""
+定数定義
+"""
+# 基準値のファイル
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+BASELINE_VERSION = 1
+# 計測する発言数・回数（処理時間は最も速かった回を使う）
+DEFAULT_MESSAGES = 20000
+DEFAULT_REPEAT = 3
+# 基準値から劣化してよい割合（0.3で1.3倍まで）
+DEFAULT_TIME_TOLERANCE = 0.3
+DEFAULT_MEMORY_TOLERANCE = 0.2
+# 比較する処理（styleタグの作成は短すぎて誤差が大きいため比較しない）
+GATED_FUNCTIONS = [
+    BENCH_CONVERT_LOG_TO_CHAT_LIST,
+    BENCH_CONVERT_CHATS_TO_TEXT,
+    BENCH_CONVERT_LOG,
+]
+# 校正用ループの繰り返し回数・計測回数
+CALIBRATION_LOOPS = 200000
+CALIBRATION_REPEAT = 5
+CALIBRATION_PATTERN = re.compile(r'<span style="color:#([0-9a-f]{6});">')
+
+
+
+def calibrate() -> float:
+    """ calibrate
+        機能：校正用ループの時間を計測する（変換処理と同じく文字列・辞書・正規表現を使う、計算量が一定の処理）
+
+    Returns:
+        float: 最も速かった回の秒数
+    """
+    best = None
+    for _ in range(CALIBRATION_REPEAT):
+        start = time.perf_counter()
+        colors = {}
+        lines = []
+        for i in range(CALIBRATION_LOOPS):
+            line = f'<span style="color:#{i % 0x1000000:06x};">キャラ{i % 20}</span>'
+            match = CALIBRATION_PATTERN.match(line)
+            colors[match.group(1)] = colors.get(match.group(1), 0) + 1
+            lines.append(line.replace("キャラ", "chara"))
+        "\n".join(lines)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def measure_pipeline(messages: int, repeat: int) -> dict[str, dict]:
+    """ measure_pipeline
+        機能：変換処理の各段階を繰り返し計測する
+
+    Args:
+        messages (int): 発言数
+        repeat (int): 計測回数
+
+    Returns:
+        dict[str, dict]: 処理の名前→計測結果（秒数は最も速かった回、メモリは最初の回）
+    """
+    init_resources()
+    results = {}
+    with tempfile.TemporaryDirectory() as work_dir:
+        for i in range(repeat):
+            # メモリは処理時間と違い計測ごとの差が小さいため、最初の回だけ計測する
+            for record in run_size(messages, DEFAULT_SPEAKERS, i == 0, work_dir):
+                function = record["function"]
+                if function not in results:
+                    results[function] = record
+                elif record["seconds"] < results[function]["seconds"]:
+                    results[function] = {**record, "peak_bytes": results[function]["peak_bytes"]}
+    return results
+
+
+def create_baseline(messages: int, calibration: float, results: dict[str, dict]) -> dict:
+    """ create_baseline
+        機能：計測結果から基準値を作成する
+
+    Args:
+        messages (int): 発言数
+        calibration (float): 校正用ループの秒数
+        results (dict[str, dict]): 処理の名前→計測結果
+
+    Returns:
+        dict: 基準値
+    """
+    return {
+        "version": BASELINE_VERSION,
+        "environment": get_environment(),
+        "messages": messages,
+        "calibration_seconds": round(calibration, 6),
+        "records": {
+            function: {
+                "seconds": record["seconds"],
+                "normalized": round(record["seconds"] / calibration, 4),
+                "peak_bytes": record["peak_bytes"],
+            }
+            for function, record in results.items()
+        },
+    }
+
+
+def compare_baseline(baseline: dict, current: dict, time_tolerance: float, memory_tolerance: float) -> list[str]:
+    """ compare_baseline
+        機能：基準値と今回の計測結果を比較して、結果を表示する
+
+    Args:
+        baseline (dict): 基準値
+        current (dict): 今回の計測結果（基準値と同じ形式）
+        time_tolerance (float): 処理時間が劣化してよい割合
+        memory_tolerance (float): メモリの最大使用量が劣化してよい割合
+
+    Returns:
+        list[str]: 劣化した項目（劣化が無ければ空）
+    """
+    failures = []
+    print(f"{'function':<26} {'baseline':>10} {'current':>10} {'ratio':>7}  {'baseline MB':>11} {'current MB':>10} {'ratio':>7}  result")
+    for function in GATED_FUNCTIONS:
+        base = baseline["records"].get(function)
+        record = current["records"].get(function)
+        if base is None or record is None:
+            failures.append(f"{function}: 基準値がありません")
+            continue
+
+        time_ratio = record["normalized"] / base["normalized"]
+        memory_ratio = None
+        if base["peak_bytes"] and record["peak_bytes"]:
+            memory_ratio = record["peak_bytes"] / base["peak_bytes"]
+
+        results = []
+        if time_ratio > 1 + time_tolerance:
+            failures.append(f"{function}: 処理時間が基準値の{time_ratio:.2f}倍")
+            results.append("SLOWER")
+        if memory_ratio is not None and memory_ratio > 1 + memory_tolerance:
+            failures.append(f"{function}: メモリの最大使用量が基準値の{memory_ratio:.2f}倍")
+            results.append("MEMORY")
+        result = "+".join(results) or "ok"
+
+        print(
+            f"{function:<26} {base['normalized']:>10.3f} {record['normalized']:>10.3f} {time_ratio:>7.2f}"
+            f"  {(base['peak_bytes'] or 0) / 2**20:>11.1f} {(record['peak_bytes'] or 0) / 2**20:>10.1f}"
+            f" {memory_ratio if memory_ratio is not None else 0:>7.2f}  {result}"
+        )
+    return failures
+
+
+def main() -> int:
+    """ main
+        機能：変換処理を計測して基準値と比較し、許容範囲を超えて劣化していたら0以外を返す
+
+    Returns:
+        int: 終了コード
+    """
+    arg_parser = argparse.ArgumentParser(description="変換処理の速度・メモリの劣化の確認")
+    arg_parser.add_argument("--messages", type=int, default=None, help="発言数（省略時は基準値と同じ）")
+    arg_parser.add_argument("--repeat", type=int, default=DEFAULT_REPEAT, help="計測回数")
+    arg_parser.add_argument("--time-tolerance", type=float, default=DEFAULT_TIME_TOLERANCE, help="処理時間が劣化してよい割合")
+    arg_parser.add_argument("--memory-tolerance", type=float, default=DEFAULT_MEMORY_TOLERANCE, help="メモリの最大使用量が劣化してよい割合")
+    arg_parser.add_argument("--baseline", default=BASELINE_PATH, help="基準値のファイル")
+    arg_parser.add_argument("--update", action="store_true", help="今回の計測結果で基準値を作り直す")
+    args = arg_parser.parse_args()
+
+    baseline = None
+    if not args.update:
+        if not os.path.exists(args.baseline):
+            print(f"基準値がありません: {args.baseline}（--updateで作成してください）", file=sys.stderr)
+            return 2
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            baseline = json.load(f)
+
+    messages = args.messages or (baseline["messages"] if baseline else DEFAULT_MESSAGES)
+    calibration = calibrate()
+    current = create_baseline(messages, calibration, measure_pipeline(messages, max(1, args.repeat)))
+    print(f"calibration: {calibration:.3f}s  messages: {messages}")
+
+    if args.update:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            f.write(json.dumps(current, ensure_ascii=False, indent=2) + "\n")
+        print(f"基準値を保存しました: {args.baseline}")
+        return 0
+
+    if baseline.get("version") != BASELINE_VERSION or baseline["messages"] != messages:
+        print("基準値と計測条件が違うため比較できません（--updateで作り直してください）", file=sys.stderr)
+        return 2
+
+    failures = compare_baseline(baseline, current, args.time_tolerance, args.memory_tolerance)
+    for failure in failures:
+        print(failure, file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
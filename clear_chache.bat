@@ -20,5 +20,11 @@ for /r %%i in (*.pyc) do (
     )
 )
 
+REM ログの解析結果のキャッシュを削除
+if exist "output\cache" (
+    echo 削除中: output\cache
+    rmdir /s /q "output\cache"
+)
+
 echo 完了しました。
 pause
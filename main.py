@@ -2,6 +2,7 @@
     機能：メイン関数
 """
 import ctypes
+import multiprocessing
 import tkinter as tk
 from tkinter import ttk
 
@@ -11,6 +12,7 @@ from app.logic import globals
 from app.logic.fileio import check_dir_exist, get_resource_path
 from app.logic.processor import (load_convert_config, load_resources,
                                  save_resources)
+from app.logic.store import SETTINGS_STORE
 from app.model.settings import ConfigKey
 from app.model.uitexts import TextKey
 from app.ui import CharacterTab, ConfigTab, LogTab, PreviewTab
@@ -20,6 +22,9 @@ from system.resources import APP_ICON_PATH, OUTPUT_DIR_NAME, SETTINGS_DIR_NAME
 
 if __name__ == "__main__":
 
+    # exe化した時に、一括変換のプロセスがアプリを再起動しないようにする
+    multiprocessing.freeze_support()
+
     # アプリに必要なフォルダ確認、無ければ生成
     check_dir_exist(OUTPUT_DIR_NAME)
     check_dir_exist(SETTINGS_DIR_NAME)
@@ -74,12 +79,11 @@ if __name__ == "__main__":
         character_tab=character_tab,
     )
     # プレビュー用のコールバック関数を渡す
-    preview_tab = PreviewTab(preview_frame, get_html_callback=lambda: log_tab.text_area.get("1.0", tk.END))
+    preview_tab = PreviewTab(preview_frame, get_result_callback=log_tab.get_result)
     config_tab._log_tab = log_tab   # 相互参照のため後から追加
     developer_tab = DeveloperTab(
         developer_frame,
-        get_web_log_callback=lambda: log_tab.get_web_log(),
-        get_iframe_logs_callback=lambda: log_tab.get_iframe_logs()
+        get_result_callback=log_tab.get_result
     )
 
     # タブを追加
@@ -92,5 +96,13 @@ if __name__ == "__main__":
     if valid_developer_tab_flag:
         notebook.add(developer_frame, text=TEXTS[TextKey.WEB_TAB], sticky="nsew")
 
+    def close_app():
+        """ close_app
+            機能：未保存の設定を保存してから、アプリを終了する
+        """
+        SETTINGS_STORE.flush()
+        root.destroy()
+    root.protocol("WM_DELETE_WINDOW", close_app)
+
     root.mainloop()
 
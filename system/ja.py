@@ -22,6 +22,14 @@ TEXTS = {
     TextKey.CONVERT_BUTTON:         "ログ変換",
     TextKey.COPY_TEXT_BUTTON:       "内容を全てコピー",
     TextKey.CHARACTER_COUNT_LABEL:  "文字数：{count}",
+    TextKey.CANCEL_BUTTON:          "中断",
+    TextKey.PARSE_PROGRESS_LABEL:   "解析中…{count}件（{percent}%）",
+    TextKey.CONVERTING_LABEL:       "変換中…",
+    TextKey.READING_LABEL:          "読み込み中…",
+    TextKey.APPLYING_CONFIG_LABEL:  "設定を適用中…",
+    TextKey.RENDERING_LABEL:        "テキスト作成中…",
+    TextKey.WRITING_LABEL:          "保存中…",
+    TextKey.CANCELLED_LABEL:        "変換を中断しました",
 
     # 変換設定
     TextKey.PRIVATTER_PLUS_SETTINGS:        "Privatter+向け設定",
@@ -53,11 +61,16 @@ TEXTS = {
     TextKey.BACKGROUND_COLOR_LABEL: "背景色",
     TextKey.UPDATE_LOG_BUTTON:      "最新の変換後ログを表示",
     TextKey.MISSING_LOG_MESSAGE:    "（変換結果がありません）",
+    TextKey.PREVIEW_OUTPUT_LABEL:   "表示するログ",
+    TextKey.PRIVATTER_LOG_LABEL:    "Privatterログ",
 
     # 開発者向け
     TextKey.WEB_LOG_LABEL:          "webログ",
     TextKey.IFRAME_LOG_LABEL:       "iframeログ",
     TextKey.COPY_LABEL:             "コピー",
+    TextKey.METRICS_LABEL:          "処理時間・件数",
+    TextKey.METRICS_NAME_COLUMN:    "項目",
+    TextKey.METRICS_VALUE_COLUMN:   "値",
 
     # ダイアログ
     TextKey.WARNING_DIALOG_TITLE:       "注意",
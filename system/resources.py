@@ -24,6 +24,8 @@ CONFIG_FILE_NAME = "config.json"
 CHARACTER_FILE_NAME = "character.json"
 # エラーログのファイル名
 ERROR_LOG_NAME = "error.log"
+# 解析結果のキャッシュを格納するディレクトリ（出力ディレクトリ内）
+PARSE_CACHE_DIR_NAME = "cache"
 
 
 class ResourcesKey:
@@ -37,6 +39,13 @@ class ResourcesKey:
     MAX_LOG_BYTE_SIZE           = "max_log_byte_size"
     DEBUG_MODE                  = "debug_mode"
     DEBUG_MAX_TRACE_LINES       = "debug_max_trace_lines"
+    PARSER_BACKEND              = "parser_backend"
+    PARSE_CACHE_MAX_BYTE_SIZE   = "parse_cache_max_byte_size"
+    BATCH_WORKER_COUNT          = "batch_worker_count"
+    PARALLEL_PARSE_MIN_LENGTH   = "parallel_parse_min_length"
+    PARSE_WORKER_COUNT          = "parse_worker_count"
+    PROFILE_MODE                = "profile_mode"
+    PROFILE_TOP_ALLOCATIONS     = "profile_top_allocations"
 
 
 
@@ -57,4 +66,11 @@ RESOURCES_CONFIG = [
     ResourcesConfig(ResourcesKey.MAX_LOG_BYTE_SIZE,          "int", 1024*20),
     ResourcesConfig(ResourcesKey.DEBUG_MODE,                 "bool", False),
     ResourcesConfig(ResourcesKey.DEBUG_MAX_TRACE_LINES,      "int", 10),
+    ResourcesConfig(ResourcesKey.PARSER_BACKEND,             "str", "auto"),
+    ResourcesConfig(ResourcesKey.PARSE_CACHE_MAX_BYTE_SIZE,  "int", 1024*1024*200),
+    ResourcesConfig(ResourcesKey.BATCH_WORKER_COUNT,         "int", 0),
+    ResourcesConfig(ResourcesKey.PARALLEL_PARSE_MIN_LENGTH,  "int", 1024*1024*8),
+    ResourcesConfig(ResourcesKey.PARSE_WORKER_COUNT,         "int", 0),
+    ResourcesConfig(ResourcesKey.PROFILE_MODE,               "bool", False),
+    ResourcesConfig(ResourcesKey.PROFILE_TOP_ALLOCATIONS,    "int", 30),
 ]
@@ -0,0 +1,19 @@
+""" conftest.py
+    機能：テスト共通の設定
+"""
+import pytest
+
+from app.logic import globals
+from system.resources import RESOURCES_CONFIG, ResourcesKey
+
+
+
+@pytest.fixture(autouse=True)
+def resources(monkeypatch: pytest.MonkeyPatch) -> dict:
+    """ resources
+        機能：リソースの設定値を初期値にする（設定ファイル・解析結果のキャッシュは使わない）
+    """
+    resources = {resource_cfg.key: resource_cfg.default for resource_cfg in RESOURCES_CONFIG}
+    resources[ResourcesKey.PARSE_CACHE_MAX_BYTE_SIZE] = 0
+    monkeypatch.setattr(globals, "RESOURCES", resources)
+    return resources
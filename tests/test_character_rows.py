@@ -0,0 +1,82 @@
+""" test_character_rows.py
+    機能：キャラ設定画面の行（app/model/character.py）のテスト
+"""
+import time
+
+import pytest
+
+from app.model.character import CharacterRowList
+from app.model.settings import ConfigKey
+
+"""
+定数定義
+"""
+# 行数（デフォルト行を除く）・表示できる行数
+ROW_COUNT = 500
+VISIBLE_COUNT = 15
+# 操作ごとの計測回数・1回の操作にかかってよい時間（ミリ秒）
+REPEAT = 50
+MAX_MS = 5
+
+
+
+@pytest.fixture
+def rows() -> CharacterRowList:
+    """ rows
+        機能：デフォルト行と500行のキャラ設定を作成し、真ん中を表示する
+    """
+    rows = CharacterRowList(VISIBLE_COUNT)
+    rows.add_row({ConfigKey.CHARACTER: "Default"}, is_default=True)
+    for i in range(ROW_COUNT):
+        rows.add_row({ConfigKey.CHARACTER: f"キャラ{i}"})
+    rows.scroll_to(ROW_COUNT // 2)
+    return rows
+
+
+def get_names(rows: CharacterRowList) -> list[str]:
+    return [row[ConfigKey.CHARACTER] for row in rows.get_character_config()]
+
+
+def test_move_and_remove(rows: CharacterRowList):
+    """ 移動・削除で並び順が変わり、デフォルト行は動かない """
+    names = get_names(rows)
+    target = rows[10]
+
+    assert rows.move_row_up(target)
+    assert rows[9] is target
+    assert rows.move_row_down(target)
+    assert rows[10] is target
+    assert get_names(rows) == names
+
+    rows.remove_row(target)
+    assert get_names(rows) == names[:10] + names[11:]
+
+    # デフォルト行の下の行は上に移動できず、最後の行は下に移動できない
+    assert not rows.move_row_up(rows[1])
+    assert not rows.move_row_down(rows[len(rows) - 1])
+    assert rows[0].is_default
+
+
+def test_visible_rows(rows: CharacterRowList):
+    """ 表示するのは表示できる行数分だけで、最後の行より下にはスクロールしない """
+    visible_rows = rows.get_visible_rows(VISIBLE_COUNT + 2)
+    assert visible_rows[:VISIBLE_COUNT] == rows.rows[rows.top:rows.top + VISIBLE_COUNT]
+    assert visible_rows[VISIBLE_COUNT:] == [None, None]
+
+    rows.scroll_to(len(rows))
+    assert rows.top == len(rows) - VISIBLE_COUNT
+    for row in list(rows.rows[-VISIBLE_COUNT:]):
+        rows.remove_row(row)
+    assert rows.top == len(rows) - VISIBLE_COUNT
+    assert None not in rows.get_visible_rows(VISIBLE_COUNT)
+
+
+@pytest.mark.parametrize("operation", ["move_row_up", "move_row_down", "remove_row"])
+def test_operation_time(rows: CharacterRowList, operation: str):
+    """ 500行でも、1回の操作（表示する行の取得まで）が上限時間内に終わる """
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        getattr(rows, operation)(rows[ROW_COUNT // 2])
+        rows.get_visible_rows(VISIBLE_COUNT)
+    elapsed_ms = (time.perf_counter() - start) * 1000 / REPEAT
+    assert elapsed_ms < MAX_MS
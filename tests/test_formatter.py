@@ -0,0 +1,84 @@
+""" test_formatter.py
+    機能：ログ変換（formatter.py）のテスト
+"""
+import re
+
+from app.logic.formatter import HTML_SPAN_CLOSE, IframeChunker
+
+"""
+定数定義
+"""
+# iframe1つ分の最大文字数
+MAX_LENGTH = 100
+
+
+
+def create_line(text: str) -> str:
+    """ create_line
+        機能：iframe用の行（build_lineのIFRAMEと同じ形式）を作成する
+    """
+    return f'{HTML_SPAN_CLOSE}<span class="chara">{text}<br>'
+
+
+def baseline_chunks(lines: list[str], max_length: int) -> list[str]:
+    """ baseline_chunks
+        機能：IframeChunker導入前の分割処理（変換結果の比較用）
+    """
+    pattern = re.escape(HTML_SPAN_CLOSE)
+    iframe_logs = []
+    iframe_text = ""
+    total_len = 0
+    for line in lines:
+        total_len += len(line)
+        if total_len > max_length:
+            iframe_text = re.sub(pattern, "", iframe_text, count=1)
+            iframe_logs.append(iframe_text + HTML_SPAN_CLOSE + HTML_SPAN_CLOSE)
+            total_len = len(line)
+            iframe_text = line
+        else:
+            iframe_text += line
+    if iframe_text:
+        iframe_text = re.sub(pattern, "", iframe_text, count=1)
+        iframe_logs.append(iframe_text + HTML_SPAN_CLOSE + HTML_SPAN_CLOSE)
+    return iframe_logs
+
+
+def chunk(lines: list[str], max_length: int = MAX_LENGTH) -> list[str]:
+    """ chunk
+        機能：IframeChunkerで分割する
+    """
+    chunker = IframeChunker(max_length)
+    for line in lines:
+        chunker.add_line(line)
+    return chunker.close()
+
+
+def test_first_line_over_limit():
+    """ 最初の行が最大文字数を超える場合、先頭は閉じタグだけになる（変更前と同じ） """
+    lines = [create_line("x" * MAX_LENGTH), create_line("short")]
+    chunks = chunk(lines)
+    assert chunks == baseline_chunks(lines, MAX_LENGTH)
+    assert chunks[0] == HTML_SPAN_CLOSE + HTML_SPAN_CLOSE
+
+
+def test_line_exactly_at_limit():
+    """ 最大文字数ちょうどの場合は同じiframeに入れ、1文字でも超えたら次のiframeにする """
+    first = create_line("x" * 10)
+    last = create_line("y" * (MAX_LENGTH - len(first) - len(create_line(""))))
+    lines = [first, last, create_line("z")]
+    assert sum(map(len, lines[:-1])) == MAX_LENGTH
+
+    chunks = chunk(lines)
+    assert chunks == baseline_chunks(lines, MAX_LENGTH)
+    assert len(chunks) == 2
+    assert chunks[1] == create_line("z").replace(HTML_SPAN_CLOSE, "", 1) + HTML_SPAN_CLOSE + HTML_SPAN_CLOSE
+
+
+def test_trailing_partial_chunk():
+    """ 最後の最大文字数に満たない行も1つのiframeにする """
+    lines = [create_line(f"line{i}") for i in range(20)]
+    chunks = chunk(lines)
+    assert chunks == baseline_chunks(lines, MAX_LENGTH)
+    assert len(chunks) > 1
+    assert len(chunks[-1]) < MAX_LENGTH
+    assert "".join(chunks).count("line") == len(lines)
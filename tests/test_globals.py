@@ -0,0 +1,37 @@
+""" test_globals.py
+    機能：全体で使用する関数（globals.py）のテスト
+"""
+import pytest
+
+from app.logic import globals
+from system.resources import ResourcesKey
+
+"""
+定数定義
+"""
+# テストで使うCPUのコア数
+CPU_COUNT = 4
+
+
+
+@pytest.fixture(autouse=True)
+def cpu_count(monkeypatch: pytest.MonkeyPatch):
+    """ cpu_count
+        機能：CPUのコア数を固定する
+    """
+    monkeypatch.setattr(globals.os, "cpu_count", lambda: CPU_COUNT)
+
+
+@pytest.mark.parametrize("setting, job_count, expected", [
+    (0, 10, CPU_COUNT),     # 0以下はCPUのコア数
+    (-1, 10, CPU_COUNT),
+    (8, 2, 2),              # 処理できる数を上限とする
+    (2, 10, 2),
+    (8, 0, 1),              # 最低1プロセス
+])
+def test_worker_count(resources: dict, setting: int, job_count: int, expected: int):
+    """ 設定のプロセス数と、設定の代わりに渡したプロセス数は同じように扱う """
+    resources[ResourcesKey.BATCH_WORKER_COUNT] = setting
+    assert globals.get_worker_count(job_count) == expected
+    resources[ResourcesKey.BATCH_WORKER_COUNT] = 1
+    assert globals.get_worker_count(job_count, worker_count=setting) == expected
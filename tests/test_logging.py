@@ -0,0 +1,46 @@
+""" test_logging.py
+    機能：ロギング処理（logging.py）のテスト
+"""
+import os
+
+import pytest
+
+from app.logic import logging
+from app.logic.logging import OLD_LOG_SUFFIX, logging_error
+from system.resources import ResourcesKey
+
+"""
+定数定義
+"""
+# ログファイルと古いログファイルの合計の上限
+MAX_LOG_BYTE_SIZE = 20000
+
+
+
+@pytest.fixture
+def log_path(tmp_path, monkeypatch: pytest.MonkeyPatch, resources: dict) -> str:
+    """ log_path
+        機能：ログファイルの保存先を一時フォルダにする
+    """
+    resources[ResourcesKey.MAX_LOG_BYTE_SIZE] = MAX_LOG_BYTE_SIZE
+    monkeypatch.setattr(logging, "get_executable_path", lambda relative_path: str(tmp_path / relative_path))
+    return str(tmp_path / logging.OUTPUT_DIR_NAME / logging.ERROR_LOG_NAME)
+
+
+def get_total_size(log_path: str) -> int:
+    """ get_total_size
+        機能：ログファイルと古いログファイルの合計のバイト数を取得する
+    """
+    return sum(os.path.getsize(path) for path in [log_path, log_path + OLD_LOG_SUFFIX] if os.path.exists(path))
+
+
+@pytest.mark.parametrize("message_size", [100, 9000, 15000, 100000])
+def test_log_size_within_limit(log_path: str, message_size: int):
+    """ 1件が上限の半分を超えるログを続けて記録しても、合計は上限を超えない """
+    for i in range(3):
+        logging_error(f"エラー{i}", "path", ValueError("あ" * (message_size // 3)))
+        assert get_total_size(log_path) <= MAX_LOG_BYTE_SIZE
+
+    # 最後のログは切り詰めても記録されている
+    with open(log_path, "r", encoding="utf-8") as f:
+        assert "エラー2" in f.read()
@@ -0,0 +1,84 @@
+""" test_parser.py
+    機能：HTML解析処理の切り替えのテスト
+"""
+import pytest
+
+from app.logic.parser import (PARSER_HTML_PARSER, PARSER_REGEX,
+                              iter_raw_chats_by_soup, parse_raw_chats,
+                              select_fallback_parser_backend)
+from app.logic.tokenizer import iter_raw_chats
+from benchmarks.generator import generate_log
+from system.resources import ResourcesKey
+
+pytest.importorskip("bs4")
+
+"""
+定数定義
+"""
+CHAT_HTML = '<p style="color:#112233;"><span>[main]</span><span>キャラ0</span><span>{message}</span></p>'
+# 高速解析で扱えず、lxml・selectolaxではhtml.parserと結果が変わるタグ
+UNSUPPORTED_MESSAGES = [
+    "x<p>y</p>",
+    "x<ul><li>1</li></ul>z",
+    "x<div>y</div>z",
+    "x<b>y</b>",
+]
+# 並列解析のテストで使う発言数・プロセス数
+PARALLEL_MESSAGES = 2000
+PARALLEL_WORKERS = 2
+
+
+
+def test_fallback_is_html_parser():
+    """ 高速解析で扱えない場合はhtml.parserで解析する """
+    assert select_fallback_parser_backend().name == PARSER_HTML_PARSER
+
+
+@pytest.mark.parametrize("message", UNSUPPORTED_MESSAGES)
+def test_fallback_same_as_soup(message: str):
+    """ 高速解析で扱えないログも、BeautifulSoupと同じ結果になる """
+    html_content = CHAT_HTML.format(message=message) + CHAT_HTML.format(message="end")
+    assert parse_raw_chats(html_content, PARSER_REGEX) == list(iter_raw_chats_by_soup(html_content))
+
+
+class CancelledForTest(Exception):
+    """ CancelledForTest
+        機能：進捗の通知先から送出する中断
+    """
+
+
+@pytest.fixture
+def parallel_resources(resources: dict) -> dict:
+    """ parallel_resources
+        機能：小さいログでも並列に解析する設定にする
+    """
+    resources[ResourcesKey.PARALLEL_PARSE_MIN_LENGTH] = 1
+    resources[ResourcesKey.PARSE_WORKER_COUNT] = PARALLEL_WORKERS
+    return resources
+
+
+def test_parallel_reports_progress(parallel_resources: dict):
+    """ 並列解析でも分割ごとに進捗を通知し、結果はログの順になる """
+    html_content = generate_log(PARALLEL_MESSAGES)
+    progress = []
+    raw_chats = parse_raw_chats(html_content, PARSER_REGEX, lambda *args: progress.append(args))
+
+    assert raw_chats == list(iter_raw_chats(html_content))
+    assert len(progress) > PARALLEL_WORKERS
+    done_lengths = [done_length for _, done_length, _ in progress]
+    assert done_lengths == sorted(done_lengths)
+    assert progress[-1] == (len(raw_chats), len(html_content), len(html_content))
+
+
+def test_parallel_cancel(parallel_resources: dict):
+    """ 進捗の通知先で例外を送出すると、残りの分割を待たずに中断する """
+    html_content = generate_log(PARALLEL_MESSAGES)
+    progress = []
+
+    def cancel(*args):
+        progress.append(args)
+        raise CancelledForTest()
+
+    with pytest.raises(CancelledForTest):
+        parse_raw_chats(html_content, PARSER_REGEX, cancel)
+    assert len(progress) == 1
@@ -0,0 +1,48 @@
+""" test_preview.py
+    機能：変換後ログの解析（preview.py）のテスト
+"""
+from typing import Optional
+
+from app.logic.formatter import (convert_chats_to_text,
+                                 convert_log_to_chat_list,
+                                 create_character_index, create_style_tag_text)
+from app.logic.preview import iter_preview_segments, join_iframe_logs
+from benchmarks.generator import generate_log
+from benchmarks.pipeline import create_character_config, create_convert_config
+from system.resources import ResourcesKey
+
+"""
+定数定義
+"""
+# 変換する発言数・発言者の数
+MESSAGES = 500
+SPEAKERS = 6
+# iframe1つ分の最大文字数（複数のiframeに分割されるように小さくする）
+IFRAME_MAX_CHARACTER = 5000
+
+
+
+def extract_lines(log_text: str) -> list[tuple[str, Optional[str]]]:
+    """ extract_lines
+        機能：変換後ログを空行以外の行（テキスト、色）にする（プレビュー画面と同じ分け方）
+    """
+    lines = []
+    for text, color in iter_preview_segments(log_text):
+        for line in text.splitlines():
+            if line.strip():
+                lines.append((line.strip(), color))
+    return lines
+
+
+def test_iframe_preview_same_as_privatter(resources: dict):
+    """ 複数に分割したiframe用ログも全て表示され、Privatter用と同じ行・色になる """
+    resources[ResourcesKey.IFRAME_MAX_CHARCTER] = IFRAME_MAX_CHARACTER
+    convert_config = create_convert_config()
+    character_config = create_character_config(SPEAKERS)
+    character_index = create_character_index(character_config)
+    chats, characters = convert_log_to_chat_list(generate_log(MESSAGES, SPEAKERS), convert_config, character_config, character_index)
+    style_tag_text = create_style_tag_text(character_config, characters.use_classes, character_index)
+    converted_log = convert_chats_to_text(chats, convert_config, style_tag_text)
+
+    assert len(converted_log.iframe_log) > 1
+    assert extract_lines(join_iframe_logs(converted_log.iframe_log)) == extract_lines(converted_log.privatter_log)
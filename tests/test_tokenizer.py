@@ -0,0 +1,45 @@
+""" test_tokenizer.py
+    機能：高速解析（tokenizer.py）のテスト
+"""
+import time
+
+import pytest
+
+from app.logic.parser import iter_raw_chats_by_soup
+from app.logic.tokenizer import UnsupportedMarkupError, iter_raw_chats
+from benchmarks.generator import generate_log
+
+"""
+定数定義
+"""
+# 発言の開始部分（発言のspanタグの中まで）
+CHAT_PREFIX = '<p style="color:#112233;">\n  <span> [main]</span>\n  <span>キャラ0</span> :\n  <span>\n    '
+# 一致しない発言を判定してよい時間（秒）
+MAX_REJECT_SECONDS = 1.0
+
+
+
+def test_same_as_soup():
+    """ 作成したログの解析結果がBeautifulSoupと同じ """
+    pytest.importorskip("bs4")
+    html_content = generate_log(500)
+    assert list(iter_raw_chats(html_content)) == list(iter_raw_chats_by_soup(html_content))
+
+
+@pytest.mark.parametrize("message", [
+    "x" * 30,
+    "x" * 100000,
+    "x<br>" * 20000,
+    "x<br/>y<br />" * 20000,
+])
+@pytest.mark.parametrize("tail", [
+    "<b>強調</b></span></p>",   # 想定外のタグ
+    "",                         # 途中で切れたログ
+])
+def test_reject_in_bounded_time(message: str, tail: str):
+    """ 長い発言の後に想定外のタグ・ログの終わりがあっても、すぐに扱えないと判定する """
+    html_content = CHAT_PREFIX + message + tail
+    start = time.perf_counter()
+    with pytest.raises(UnsupportedMarkupError):
+        list(iter_raw_chats(html_content))
+    assert time.perf_counter() - start < MAX_REJECT_SECONDS